@@ -75,6 +75,21 @@ app_ui = ui.page_navbar(
             calculate_button_label = "Solve Linear System"
         )
     ),
+    ui.nav_panel(
+        "Multiple Linear Systems Solver",
+        page_title(
+            "Multiple Linear Systems Solver"
+        ),
+        matrix_input.matrix_input_ui(
+            "batch_systems_input",
+            input_method_label = "Choose your preferred method for " + \
+                "inputting your linear systems:"
+        ),
+        calculation_output.calculation_output_ui(
+            "batch_systems_output",
+            calculate_button_label = "Solve Linear Systems"
+        )
+    ),
     ui.nav_panel(
         "Determinant Calculator",
         page_title("Determinant Calculator"),
@@ -148,6 +163,25 @@ def server(input: Inputs, outputs: Outputs, session: Session):
         augmented_column_name = "Constant"
     )
 
+    batch_systems_input_tuple = matrix_input.matrix_input_server(
+        "batch_systems_input",
+        column_num_meaning = "columns",
+        row_num_meaning = "equations",
+        column_name_choice = True,
+        column_name_meaning = "column",
+        manual_entry_label = "Enter a column of coefficients for each " + \
+            "equation, followed by a column of constants for each system." + \
+            " Your numbers should either be entered as" + \
+            ' numbers or fractions of the format "a/b".',
+        csv_entry_label = "Upload a CSV file whose first columns hold the" + \
+                " coefficient matrix shared by your systems, one column " + \
+                "for each equation, and whose remaining columns each hold " + \
+                "the constants of one system. The top row must contain a " + \
+                "unique name for each column. The numbers in the file " + \
+                "should be written as integers, decimals, or fractions of " + \
+                'the format "a/b".'
+    )
+
     determinants_input_tuple = matrix_input.matrix_input_server(
         "determinants_input",
         square_matrix = True,
@@ -189,12 +223,14 @@ def server(input: Inputs, outputs: Outputs, session: Session):
         calculation_output.Output_Function(
             "Row Echelon Form",
             True,
-            calculations.row_echelon_form
+            calculations.row_echelon_form,
+            shares_factorization = True
         ),
         calculation_output.Output_Function(
             "Reduced Row Echelon Form",
             True,
-            calculations.reduced_row_echelon_form
+            calculations.reduced_row_echelon_form,
+            shares_factorization = True
         )
     )
 
@@ -205,12 +241,26 @@ def server(input: Inputs, outputs: Outputs, session: Session):
         calculation_output.Output_Function(
             "Solution",
             True,
-            linear_systems.solution_set
+            linear_systems.solution_set,
+            shares_factorization = True
         ),
         calculation_output.Output_Function(
             "Solution in Parametric Vector Form",
             True,
-            linear_systems.parametric_vector_solution_set
+            linear_systems.parametric_vector_solution_set,
+            shares_factorization = True
+        )
+    )
+
+    calculation_output.calculation_output_server(
+        "batch_systems_output",
+        batch_systems_input_tuple[0],
+        batch_systems_input_tuple[1],
+        calculation_output.Output_Function(
+            "Solutions",
+            True,
+            linear_systems.batch_solutions,
+            shares_factorization = True
         )
     )
 
@@ -221,7 +271,8 @@ def server(input: Inputs, outputs: Outputs, session: Session):
         calculation_output.Output_Function(
             "Determinant",
             False,
-            calculations.determinant
+            calculations.determinant,
+            shares_factorization = True
         ),
         square = True
     )
@@ -233,7 +284,8 @@ def server(input: Inputs, outputs: Outputs, session: Session):
         calculation_output.Output_Function(
             "Inverse Matrix",
             True,
-            calculations.inverse
+            calculations.inverse,
+            shares_factorization = True
         ),
         square = True
     )
@@ -245,22 +297,27 @@ def server(input: Inputs, outputs: Outputs, session: Session):
         calculation_output.Output_Function(
             "Basis for Null Space",
             True,
-            subspaces.null_space_basis
+            subspaces.null_space_basis,
+            shares_factorization = True
         ),
         calculation_output.Output_Function(
             "Basis for Column Space", 
             True,
-            subspaces.column_space_basis
+            subspaces.column_space_basis,
+            shares_factorization = True,
+            cacheable = False
         ),
         calculation_output.Output_Function(
             "Basis for Left Null Space",
             True, 
-            subspaces.left_null_space_basis
+            subspaces.left_null_space_basis,
+            shares_factorization = True
         ),
         calculation_output.Output_Function(
             "Basis for Row Space",
             True,
-            subspaces.row_space_basis
+            subspaces.row_space_basis,
+            shares_factorization = True
         )
     )
 
@@ -271,7 +328,8 @@ def server(input: Inputs, outputs: Outputs, session: Session):
         calculation_output.Output_Function(
             "LU Factorized Matrix",
             True,
-            calculations.LU_factorize
+            calculations.LU_factorize,
+            shares_factorization = True
         )
     )
 
@@ -0,0 +1,823 @@
+'''
+This file contains the arithmetic backends the calculations in
+calculations.py can be done with. Each backend does the same calculations on
+a matrix of Fractions with a different kind of arithmetic, and
+select_backend chooses the fastest one for a matrix based on its size, the
+size of its entries, and whether the output should be decimal.
+'''
+
+import numpy as np
+import elimination
+import modular
+import float_engine
+import sparse_engine
+import block_diagonal
+import structure
+
+from fractions import Fraction
+
+# Matrices with at least this many rows and columns are handled by the
+# multi-modular backend.
+MULTI_MODULAR_MIN_DIMENSION = 30
+
+# Matrices whose smaller dimension times the bit length of their largest
+# entry is at least this are also handled by the multi-modular backend,
+# since the entries of fraction-free elimination grow with both.
+MULTI_MODULAR_MIN_MINOR_BITS = 2048
+
+# Matrices with at most this many entries, none longer than
+# FRACTION_BACKEND_MAX_BITS bits, are handled with plain Fractions, since
+# there is too little work for the other backends to make up for converting
+# the matrix.
+FRACTION_BACKEND_MAX_ENTRIES = 9
+FRACTION_BACKEND_MAX_BITS = 32
+
+# Matrices with at least this many entries are split into blocks that share
+# no rows or columns if they have more than one.
+BLOCK_DIAGONAL_MIN_ENTRIES = 100
+
+class Backend:
+    '''
+    This class defines the calculations every backend can do. Every method
+    takes an elimination.ScaledMatrix holding the input matrix and does not
+    modify it.
+    '''
+
+    # This is True for backends whose outputs are already decimal.
+    outputs_decimal = False
+
+    def row_echelon_form(self, scaled_matrix):
+        '''
+        Returns:
+            a tuple whose first item is a 2d numpy object array holding a row
+            echelon form of the matrix and whose second item is the number of
+            row swaps used.
+        '''
+        raise NotImplementedError
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+        '''
+        Returns:
+            an elimination.EliminationResult whose matrix is a 2d numpy object
+            array holding the reduced row echelon form of the matrix.
+        '''
+        raise NotImplementedError
+
+    def determinant(self, scaled_matrix):
+        '''
+        Returns:
+            the determinant of the square matrix.
+        '''
+        raise NotImplementedError
+
+    def inverse(self, scaled_matrix, hybrid = True):
+        '''
+        Args:
+            hybrid: a boolean that is True if the inverse should first be
+            tried by rounding a float64 inverse to fractions and checking it
+            exactly.
+        Returns:
+            a 2d numpy object array holding the inverse of the square matrix,
+            or None if it is not invertible.
+        '''
+        raise NotImplementedError
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+        '''
+        Args:
+            stop_when_singular: a boolean that is True if elimination should
+            stop at the first column without a pivot. The factorization is
+            then incomplete, and only its rank is meaningful.
+        Returns:
+            an elimination.PLUFactorization of the matrix.
+        '''
+        raise NotImplementedError
+
+class FractionBackend(Backend):
+    '''
+    This backend does Gaussian elimination directly on numpy object arrays of
+    Fractions.
+    '''
+
+    def __init__(self, pivot_rule = None):
+        '''
+        Args:
+            pivot_rule: one of the pivot rules in elimination.py that row
+            echelon form chooses pivots with. If it is None,
+            elimination.DEFAULT_PIVOT_RULE is used.
+        '''
+        self.pivot_rule = pivot_rule
+
+    def eliminate(self, scaled_matrix):
+        '''
+        This method brings the matrix to row echelon form.
+        Returns:
+            an elimination.EliminationResult holding the row echelon form.
+        '''
+
+        matrix_array = scaled_matrix.fraction_array()
+
+        pivot_columns = []
+
+        total_row_swaps = 0
+
+        row_permutation = list(range(matrix_array.shape[0]))
+
+        corner_row = 0
+        corner_column = 0
+
+        while corner_row < matrix_array.shape[0] and corner_column < \
+            matrix_array.shape[1]:
+
+            corner_entries = matrix_array[corner_row:, corner_column]
+
+            nonzero_counts = None
+
+            if self.pivot_rule == elimination.MARKOWITZ_PIVOT:
+                nonzero_counts = np.count_nonzero(
+                    matrix_array[corner_row:, corner_column:],
+                    axis = 1
+                ).tolist()
+
+            # Each Fraction is its numerator divided by its denominator, so
+            # the pivot is chosen the same way as for rows of ints.
+            offset = elimination.pivot_offset(
+                [entry.numerator for entry in corner_entries],
+                [entry.denominator for entry in corner_entries],
+                self.pivot_rule or elimination.DEFAULT_PIVOT_RULE,
+                nonzero_counts
+            )
+
+            # If every entry is 0 the column is a zero column, so the corner
+            # is moved one to the right.
+            if offset is None:
+                corner_column += 1
+                continue
+
+            max_row = corner_row + offset
+
+            if max_row != corner_row:
+                total_row_swaps += 1
+
+                matrix_array[[corner_row, max_row]] = \
+                    matrix_array[[max_row, corner_row]]
+
+                row_permutation[max_row], row_permutation[corner_row] = \
+                    row_permutation[corner_row], row_permutation[max_row]
+
+            pivot_columns.append(corner_column)
+
+            # Every entry in the corner column below the corner row is brought
+            # to zero.
+            elimination.eliminate_pivot_column(
+                matrix_array,
+                corner_row,
+                corner_column,
+                range(corner_row + 1, matrix_array.shape[0])
+            )
+
+            corner_row += 1
+            corner_column += 1
+
+        return elimination.EliminationResult(
+            matrix_array,
+            pivot_columns,
+            row_permutation,
+            total_row_swaps
+        )
+
+    def row_echelon_form(self, scaled_matrix):
+
+        echelon_result = self.eliminate(scaled_matrix)
+
+        return echelon_result.matrix, echelon_result.row_swaps
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+
+        reduced_result = self.eliminate(scaled_matrix)
+
+        matrix_array = reduced_result.matrix
+
+        # Starting from the bottom, each pivot row is divided by its pivot
+        # and the entries above its pivot are brought to zero.
+        for current_row in range(reduced_result.rank - 1, -1, -1):
+
+            pivot_column = reduced_result.pivot_columns[current_row]
+
+            # The entries left of the pivot are already zero.
+            matrix_array[current_row, pivot_column:] /= \
+                matrix_array[current_row, pivot_column]
+
+            elimination.eliminate_pivot_column(
+                matrix_array,
+                current_row,
+                pivot_column,
+                range(0, current_row)
+            )
+
+        return reduced_result
+
+    def determinant(self, scaled_matrix):
+
+        ref_array, row_swaps = self.row_echelon_form(scaled_matrix)
+
+        # The determinant is the product of the diagonal of a row echelon
+        # form, with its sign changed for each row swap.
+        determinant = Fraction(1)
+
+        for i in range(ref_array.shape[0]):
+            determinant *= ref_array[i, i]
+
+        return determinant * (-1) ** row_swaps
+
+    def inverse(self, scaled_matrix, hybrid = True):
+
+        # The matrix is factored once, stopping as soon as a column without a
+        # pivot shows it is singular, and inverted with triangular solves.
+        return self.LU_factorize(
+            scaled_matrix,
+            stop_when_singular = True
+        ).inverse()
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+
+        # L and U are found in the same array. Each entry eliminated below a
+        # pivot is replaced by the ratio it was eliminated with, which is the
+        # entry of L in the same place.
+        packed_array = scaled_matrix.fraction_array()
+
+        row_count, column_count = packed_array.shape
+
+        row_permutation = list(range(row_count))
+        pivot_columns = []
+
+        total_row_swaps = 0
+
+        corner_row = 0
+        corner_column = 0
+
+        while corner_row < row_count and corner_column < column_count:
+
+            corner_entries = packed_array[corner_row:, corner_column]
+
+            # A zero column moves the corner one to the right.
+            if np.all(corner_entries == 0):
+                if stop_when_singular:
+                    break
+
+                corner_column += 1
+                continue
+
+            # Rows are only swapped when the corner entry is 0, so there are
+            # no row swaps whenever the matrix has an LU factorization.
+            max_row = corner_row + int(np.flatnonzero(corner_entries != 0)[0])
+
+            if max_row != corner_row:
+                total_row_swaps += 1
+
+                packed_array[[corner_row, max_row]] = \
+                    packed_array[[max_row, corner_row]]
+
+                row_permutation[max_row], row_permutation[corner_row] = \
+                    row_permutation[corner_row], row_permutation[max_row]
+
+            pivot_columns.append(corner_column)
+
+            elimination.eliminate_pivot_column(
+                packed_array,
+                corner_row,
+                corner_column,
+                range(corner_row + 1, row_count),
+                keep_multipliers = True
+            )
+
+            corner_row += 1
+            corner_column += 1
+
+        return elimination.PLUFactorization(
+            packed_array,
+            row_permutation,
+            pivot_columns,
+            total_row_swaps
+        )
+
+class ScaledIntegerBackend(Backend):
+    '''
+    This backend scales each row to ints and does fraction-free (Bareiss)
+    elimination, converting back to Fractions only for the output. Matrices
+    of ints that fit in int64 are eliminated with int64 numpy arrays for row
+    echelon form, determinants and LU factorization, and only moved to Python
+    ints once an entry grows large enough that int64 could overflow.
+    '''
+
+    def __init__(self, pivot_rule = None):
+        '''
+        Args:
+            pivot_rule: one of the pivot rules in elimination.py that
+            elimination chooses pivots with. If it is None,
+            elimination.DEFAULT_PIVOT_RULE is used.
+        '''
+        self.pivot_rule = pivot_rule
+
+    def row_echelon_form(self, scaled_matrix):
+
+        integer_array = scaled_matrix.int64_array()
+
+        if integer_array is not None:
+            echelon_elimination = \
+                elimination.int64_fraction_free_eliminate(
+                    integer_array,
+                    pivot_rule = self.pivot_rule
+                )
+
+        else:
+            integer_rows, row_scales = scaled_matrix.integer_rows()
+
+            echelon_elimination = elimination.fraction_free_eliminate(
+                integer_rows,
+                row_scales,
+                pivot_rule = self.pivot_rule
+            )
+
+        return np.array(
+            elimination.echelon_rows_to_fractions(echelon_elimination),
+            dtype = object
+        ), echelon_elimination["row_swaps"]
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+
+        integer_rows, row_scales = scaled_matrix.integer_rows()
+
+        # Fraction-free Gauss-Jordan elimination eliminates the entries above
+        # and below each pivot in a single pass.
+        reduced_elimination = elimination.fraction_free_eliminate(
+            integer_rows,
+            row_scales,
+            reduce_above = True,
+            pivot_rule = self.pivot_rule
+        )
+
+        return elimination.EliminationResult(
+            np.array(
+                elimination.reduced_rows_to_fractions(reduced_elimination),
+                dtype = object
+            ),
+            reduced_elimination["pivot_columns"],
+            reduced_elimination["row_permutation"],
+            reduced_elimination["row_swaps"]
+        )
+
+    def determinant(self, scaled_matrix):
+
+        integer_array = scaled_matrix.int64_array()
+
+        if integer_array is not None:
+            return elimination.int64_determinant(
+                integer_array,
+                self.pivot_rule
+            )
+
+        integer_rows, row_scales = scaled_matrix.integer_rows()
+
+        return elimination.fraction_free_determinant(
+            integer_rows,
+            row_scales,
+            self.pivot_rule
+        )
+
+    def inverse(self, scaled_matrix, hybrid = True):
+
+        dimension = scaled_matrix.shape[0]
+
+        integer_rows, row_scales = scaled_matrix.integer_rows()
+
+        # Since each row was multiplied by its row scale to make it ints, the
+        # inverse solves the system whose constants are the row scales along
+        # the diagonal. The rounded float64 inverse is only used if it passes
+        # an exact check.
+        scale_rows = [[row_scales[i] if j == i else 0 for j in
+                       range(dimension)] for i in range(dimension)]
+
+        if hybrid:
+            inverse_rows = float_engine.certified_solve(
+                integer_rows,
+                scale_rows
+            )
+
+            if inverse_rows is not None:
+                return np.array(inverse_rows, dtype = object)
+
+        # The matrix of ints is factored next to the diagonal matrix of its
+        # row scales, which does the forward substitution for every column of
+        # the inverse at the same time, and stops as soon as a column without
+        # a pivot shows it is singular. Back substitution finishes it.
+        augmented_matrix = elimination.ScaledMatrix(
+            [row + scale_row for row, scale_row in
+             zip(integer_rows, scale_rows)],
+            [1] * dimension
+        )
+
+        integer_array = augmented_matrix.int64_array()
+
+        if integer_array is not None:
+            forward_elimination = elimination.int64_fraction_free_eliminate(
+                integer_array,
+                pivot_rule = self.pivot_rule,
+                stop_when_singular = True
+            )
+
+        else:
+            forward_elimination = elimination.fraction_free_eliminate(
+                augmented_matrix.rows,
+                augmented_matrix.row_scales,
+                pivot_rule = self.pivot_rule,
+                stop_when_singular = True
+            )
+
+        return elimination.fraction_free_inverse(
+            forward_elimination,
+            dimension
+        )
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+
+        integer_array = scaled_matrix.int64_array()
+
+        if integer_array is not None:
+            return elimination.int64_PLU(integer_array, stop_when_singular)
+
+        integer_rows, row_scales = scaled_matrix.integer_rows()
+
+        return elimination.fraction_free_PLU(
+            integer_rows,
+            row_scales,
+            stop_when_singular
+        )
+
+class ModularBackend(ScaledIntegerBackend):
+    '''
+    This backend does calculations modulo several word-sized primes with
+    int64 numpy arrays and rebuilds the exact results. Row echelon form is not
+    unique, so it and LU factorization are done by the scaled integer
+    backend.
+    '''
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+
+        integer_rows = scaled_matrix.integer_rows()[0]
+
+        modular_result = modular.multi_modular_reduced_row_echelon_form(
+            integer_rows
+        )
+
+        # If the result could not be verified, fraction-free elimination is
+        # used instead.
+        if modular_result is None:
+            return super().reduced_row_echelon_form(scaled_matrix)
+
+        # The matrix is reduced modulo each prime separately, so there is no
+        # single set of row swaps to report.
+        return elimination.EliminationResult(
+            np.array(modular_result[0], dtype = object),
+            modular_result[1]
+        )
+
+    def determinant(self, scaled_matrix):
+
+        integer_rows, row_scales = scaled_matrix.integer_rows()
+
+        return modular.multi_modular_determinant(integer_rows, row_scales)
+
+class Float64Backend(Backend):
+    '''
+    This backend does calculations in float64 with vectorized numpy row
+    operations, and LAPACK for determinants, and outputs rounded Decimals.
+    '''
+
+    outputs_decimal = True
+
+    def __init__(self, zero_tolerance = None):
+        '''
+        Args:
+            zero_tolerance: a float that is the fraction of the size of the
+            numbers a calculated number came from at which it is treated as
+            0. If it is None, float_engine.ZERO_TOLERANCE is used. The app
+            always leaves it as None, so the tolerance is fixed there, and
+            only other callers of this module choose another one.
+        '''
+        self.zero_tolerance = zero_tolerance
+
+    def row_echelon_form(self, scaled_matrix):
+
+        float_array, pivot_columns, total_row_swaps, row_permutation = \
+            float_engine.eliminate(
+                scaled_matrix.float_array(),
+                self.zero_tolerance
+            )
+
+        return float_engine.output_array(float_array), total_row_swaps
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+
+        float_array, pivot_columns, total_row_swaps, row_permutation = \
+            float_engine.eliminate(
+                scaled_matrix.float_array(),
+                self.zero_tolerance,
+                reduce_above = True
+            )
+
+        return elimination.EliminationResult(
+            float_engine.output_array(float_array),
+            pivot_columns,
+            row_permutation,
+            total_row_swaps
+        )
+
+    def determinant(self, scaled_matrix):
+
+        return float_engine.determinant(
+            scaled_matrix.float_array(),
+            self.zero_tolerance
+        )
+
+    def inverse(self, scaled_matrix, hybrid = True):
+
+        inverse_array = float_engine.inverse(
+            scaled_matrix.float_array(),
+            self.zero_tolerance
+        )
+
+        if inverse_array is None:
+            return None
+
+        return float_engine.output_array(inverse_array)
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+
+        float_factorization = float_engine.LU_factorize(
+            scaled_matrix.float_array(),
+            self.zero_tolerance,
+            stop_when_singular
+        )
+
+        # Only the packed array is rounded, since the identity and zero
+        # entries added when it is expanded need no rounding.
+        return elimination.PLUFactorization(
+            float_engine.output_array(float_factorization.packed_array),
+            float_factorization.row_permutation,
+            float_factorization.pivot_columns,
+            float_factorization.row_swaps
+        )
+
+class SparseBackend(Backend):
+    '''
+    This backend finds reduced row echelon forms with the sparse engine in
+    sparse_engine.py, which only stores and changes the nonzero entries of a
+    matrix. Reduced row echelon form is unique, so it gives the same result
+    as the dense backends. Every other calculation is done by a dense
+    backend, since row echelon form and LU factorization depend on the
+    pivots chosen.
+    '''
+
+    def __init__(self, dense_backend):
+        '''
+        Args:
+            dense_backend: the Backend object every calculation other than
+            reduced row echelon form is done with.
+        '''
+        self.dense_backend = dense_backend
+
+    def row_echelon_form(self, scaled_matrix):
+
+        return self.dense_backend.row_echelon_form(scaled_matrix)
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+
+        column_count = scaled_matrix.shape[1]
+
+        rows, pivot_columns, row_permutation, total_row_swaps = \
+            sparse_engine.reduced_row_echelon_form(
+                sparse_engine.sparse_rows(scaled_matrix),
+                column_count
+            )
+
+        return elimination.EliminationResult(
+            sparse_engine.dense_array(rows, column_count),
+            pivot_columns,
+            row_permutation,
+            total_row_swaps
+        )
+
+    def determinant(self, scaled_matrix):
+
+        return self.dense_backend.determinant(scaled_matrix)
+
+    def inverse(self, scaled_matrix, hybrid = True):
+
+        return self.dense_backend.inverse(scaled_matrix, hybrid)
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+
+        return self.dense_backend.LU_factorize(
+            scaled_matrix,
+            stop_when_singular
+        )
+
+class BlockDiagonalBackend(Backend):
+    '''
+    This backend finds reduced row echelon forms and determinants of matrices
+    made of blocks that share no rows or columns by doing the calculation on
+    each block with the backend select_backend chooses for it, using
+    block_diagonal.py. Both results are unique, so it gives the same results
+    as the other backends. Every other calculation is done by the backend
+    chosen for the whole matrix.
+    '''
+
+    def __init__(self, whole_backend, blocks, augmented = False):
+        '''
+        Args:
+            whole_backend: the Backend object every calculation other than
+            reduced row echelon form and the determinant is done with.
+            blocks: the list of blocks returned by
+            block_diagonal.matrix_blocks for the matrix.
+            augmented: a boolean that is True if the last column is the
+            constant column of a linear system and was left out of the
+            blocks.
+        '''
+        self.whole_backend = whole_backend
+        self.blocks = blocks
+        self.augmented = augmented
+
+    def block_backend(self, scaled_matrix):
+        '''
+        Args:
+            scaled_matrix: an elimination.ScaledMatrix holding a block.
+        Returns:
+            the Backend object the block is handled with. A block cannot be
+            split further, so it is not searched for blocks again.
+        '''
+
+        return select_backend(scaled_matrix, False, find_blocks = False)
+
+    def row_echelon_form(self, scaled_matrix):
+
+        return self.whole_backend.row_echelon_form(scaled_matrix)
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+
+        reduced_array, pivot_columns = \
+            block_diagonal.reduced_row_echelon_form(
+                scaled_matrix,
+                self.blocks,
+                self.block_backend,
+                self.augmented
+            )
+
+        # The rows of the blocks are mixed together, so the row each row
+        # started as is not kept.
+        return elimination.EliminationResult(reduced_array, pivot_columns)
+
+    def determinant(self, scaled_matrix):
+
+        return block_diagonal.determinant(
+            scaled_matrix,
+            self.blocks,
+            self.block_backend
+        )
+
+    def inverse(self, scaled_matrix, hybrid = True):
+
+        return self.whole_backend.inverse(scaled_matrix, hybrid)
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+
+        return self.whole_backend.LU_factorize(
+            scaled_matrix,
+            stop_when_singular
+        )
+
+class StructuredBackend(Backend):
+    '''
+    This backend finds determinants, inverses and LU factorizations of
+    diagonal, triangular and permutation matrices with the calculations in
+    structure.py, which read them off of the matrix or find them by
+    substitution rather than elimination. Every other calculation, and LU
+    factorization of a triangular matrix with a zero on its diagonal, is
+    done by the backend chosen for the whole matrix.
+    '''
+
+    def __init__(self, whole_backend, matrix_structure):
+        '''
+        Args:
+            whole_backend: the Backend object calculations without a faster
+            path are done with.
+            matrix_structure: the structure structure.classify returned for
+            the matrix, which is not structure.GENERAL.
+        '''
+        self.whole_backend = whole_backend
+        self.matrix_structure = matrix_structure
+
+    def row_echelon_form(self, scaled_matrix):
+
+        return self.whole_backend.row_echelon_form(scaled_matrix)
+
+    def reduced_row_echelon_form(self, scaled_matrix):
+
+        return self.whole_backend.reduced_row_echelon_form(scaled_matrix)
+
+    def determinant(self, scaled_matrix):
+
+        return structure.determinant(scaled_matrix, self.matrix_structure)
+
+    def inverse(self, scaled_matrix, hybrid = True):
+
+        return structure.inverse(scaled_matrix, self.matrix_structure)
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+
+        factorization = structure.LU_factorize(
+            scaled_matrix,
+            self.matrix_structure
+        )
+
+        if factorization is not None:
+            return factorization
+
+        return self.whole_backend.LU_factorize(
+            scaled_matrix,
+            stop_when_singular
+        )
+
+def select_backend(scaled_matrix, output_decimal, augmented = False,
+                   find_blocks = True):
+    '''
+    This function chooses the backend a calculation on a matrix should be done
+    with.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the input matrix.
+        output_decimal: a boolean that is True if the user wants decimal
+        outputs.
+        augmented: a boolean that is True if the matrix is the augmented
+        matrix of a linear system, so its last column does not link its rows
+        into one block.
+        find_blocks: a boolean that is True if the matrix should be searched
+        for blocks that share no rows or columns.
+    Returns:
+        a Backend object.
+    '''
+
+    if output_decimal:
+        return Float64Backend()
+
+    # The bit length of the largest int held stands in for the size of the
+    # entries.
+    entry_bits = scaled_matrix.entry_bits()
+
+    smaller_dimension = min(scaled_matrix.shape)
+
+    entry_count = scaled_matrix.shape[0] * scaled_matrix.shape[1]
+
+    if smaller_dimension >= MULTI_MODULAR_MIN_DIMENSION or \
+        smaller_dimension * entry_bits >= MULTI_MODULAR_MIN_MINOR_BITS:
+        dense_backend = ModularBackend()
+
+    elif entry_count <= FRACTION_BACKEND_MAX_ENTRIES and \
+        entry_bits <= FRACTION_BACKEND_MAX_BITS:
+        dense_backend = FractionBackend()
+
+    else:
+        dense_backend = ScaledIntegerBackend()
+
+    # Matrices that are mostly zeros are row reduced sparsely.
+    if sparse_engine.is_sparse(scaled_matrix):
+        whole_backend = SparseBackend(dense_backend)
+
+    else:
+        whole_backend = dense_backend
+
+    if find_blocks and entry_count >= BLOCK_DIAGONAL_MIN_ENTRIES:
+        column_count = scaled_matrix.shape[1]
+
+        blocks = block_diagonal.matrix_blocks(
+            scaled_matrix,
+            column_count - 1 if augmented else column_count
+        )
+
+        if len(blocks) > 1:
+            whole_backend = BlockDiagonalBackend(
+                whole_backend,
+                blocks,
+                augmented
+            )
+
+    # Square matrices are classified once, and diagonal, triangular and
+    # permutation matrices get faster paths for the calculations that need
+    # elimination otherwise. Augmented matrices are never inverted or
+    # factored, so they are not classified.
+    if not augmented and scaled_matrix.shape[0] == scaled_matrix.shape[1]:
+        matrix_structure = structure.classify(scaled_matrix)
+
+        if matrix_structure != structure.GENERAL:
+            return StructuredBackend(whole_backend, matrix_structure)
+
+    return whole_backend
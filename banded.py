@@ -0,0 +1,349 @@
+'''
+This file contains the exact banded solver used for square linear systems
+whose nonzero coefficients all lie in a narrow band around the diagonal, such
+as the tridiagonal systems that come from discretized differential equations
+and splines. It is Gaussian elimination that only works inside the band, so
+a system with n equations, p nonzero diagonals below the main diagonal and q
+above it takes O(n(p + q)p) operations rather than O(n^3). For a tridiagonal
+system with no row swaps, it is the Thomas algorithm. Decimal outputs are
+found the same way in float64 with partial pivoting inside the band.
+'''
+
+import numpy as np
+import float_engine
+
+from fractions import Fraction
+
+# Systems with at least this many equations are solved by the banded solver
+# if the band each row is stored in takes up at most BANDED_MAX_BAND_FRACTION
+# of the row. Smaller or wider systems are solved as dense systems.
+BANDED_MIN_DIMENSION = 20
+BANDED_MAX_BAND_FRACTION = 0.25
+
+def band_width(lower_bandwidth, upper_bandwidth):
+    '''
+    Args:
+        lower_bandwidth: an int that is the largest distance of a nonzero
+        coefficient below the diagonal.
+        upper_bandwidth: an int that is the largest distance of a nonzero
+        coefficient above the diagonal.
+    Returns:
+        an int that is the number of entries stored for each row. Swapping
+        rows can move nonzero entries up to lower_bandwidth more columns
+        right of the diagonal, so that room is stored too.
+    '''
+
+    return 2 * lower_bandwidth + upper_bandwidth + 1
+
+def is_banded(dimension, lower_bandwidth, upper_bandwidth):
+    '''
+    Args:
+        dimension: an int that is the number of equations and variables.
+        lower_bandwidth: an int that is the lower bandwidth of the
+        coefficients.
+        upper_bandwidth: an int that is the upper bandwidth of the
+        coefficients.
+    Returns:
+        a boolean that is True if the system should be solved by the banded
+        solver.
+    '''
+
+    return dimension >= BANDED_MIN_DIMENSION and \
+        band_width(lower_bandwidth, upper_bandwidth) <= \
+        BANDED_MAX_BAND_FRACTION * dimension
+
+def integer_band(scaled_matrix, lower_bandwidth, upper_bandwidth):
+    '''
+    This function copies the band of a square matrix. Row i is stored as the
+    ints in the columns from i - lower_bandwidth to i + lower_bandwidth +
+    upper_bandwidth, with zeros for columns outside the matrix, so the entry
+    in column j is at index j - i + lower_bandwidth. Only the band is read, so
+    the zeros outside it are never looked at.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square matrix.
+        lower_bandwidth: an int that is the lower bandwidth of the matrix.
+        upper_bandwidth: an int that is the upper bandwidth of the matrix.
+    Returns:
+        a 2d numpy array holding the band of each row multiplied by the row
+        scale of the row, as int64 if the matrix is held in an int64 array
+        and as Python ints otherwise.
+    '''
+
+    dimension = scaled_matrix.shape[0]
+
+    width = band_width(lower_bandwidth, upper_bandwidth)
+
+    # Entry (i, t) of the band is in column i - lower_bandwidth + t.
+    row_indexes = np.arange(dimension)[:, np.newaxis]
+    column_indexes = row_indexes - lower_bandwidth + np.arange(width)
+
+    inside_matrix = (column_indexes >= 0) & (column_indexes < dimension) & \
+        (column_indexes <= row_indexes + upper_bandwidth)
+
+    if isinstance(scaled_matrix.rows, np.ndarray):
+        return np.where(
+            inside_matrix,
+            scaled_matrix.rows[row_indexes,
+                               np.clip(column_indexes, 0, dimension - 1)],
+            0
+        )
+
+    band = np.zeros((dimension, width), dtype = object)
+
+    for i, t in zip(*np.nonzero(inside_matrix)):
+        band[i, t] = scaled_matrix.rows[i][int(column_indexes[i, t])]
+
+    return band
+
+def solve(scaled_matrix, constants, lower_bandwidth, upper_bandwidth):
+    '''
+    This function solves a square linear system with banded coefficients.
+    Each pivot is the first nonzero entry on or below the diagonal in its
+    column, which is always within lower_bandwidth rows, so rows are only
+    swapped when a pivot would be zero. Only the rows within lower_bandwidth
+    of the pivot have entries below it, and the pivot row has no nonzero
+    entries more than lower_bandwidth + upper_bandwidth columns right of the
+    diagonal, so elimination and back substitution stay inside the band.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square
+        coefficient matrix.
+        constants: a list of the constants of the equations as Fractions.
+        lower_bandwidth: an int that is the lower bandwidth of the
+        coefficients.
+        upper_bandwidth: an int that is the upper bandwidth of the
+        coefficients.
+    Returns:
+        a list of the value of each variable as a Fraction, or None if the
+        coefficient matrix is singular.
+    '''
+
+    dimension = scaled_matrix.shape[0]
+
+    width = band_width(lower_bandwidth, upper_bandwidth)
+
+    rows = [
+        [Fraction(entry, row_scale) for entry in row]
+        for row, row_scale in zip(
+            integer_band(scaled_matrix, lower_bandwidth, upper_bandwidth)
+            .tolist(),
+            scaled_matrix.row_scales
+        )
+    ]
+
+    constants = list(constants)
+
+    # This is the distance right of the diagonal of the last column a pivot
+    # row can have a nonzero entry in.
+    reach = lower_bandwidth + upper_bandwidth
+
+    for k in range(dimension):
+
+        last_row = min(dimension - 1, k + lower_bandwidth)
+        last_column = min(dimension - 1, k + reach)
+
+        pivot_row_index = next(
+            (i for i in range(k, last_row + 1)
+             if rows[i][k - i + lower_bandwidth] != 0),
+            None
+        )
+
+        # A column without a pivot means the coefficients are singular.
+        if pivot_row_index is None:
+            return None
+
+        # Each row's band starts lower_bandwidth columns left of the diagonal
+        # of the row it is in, so a row moved up is shifted right in its band
+        # and a row moved down is shifted left. The entries that fall off are
+        # zeros.
+        if pivot_row_index != k:
+            shift = pivot_row_index - k
+
+            rows[k], rows[pivot_row_index] = (
+                [Fraction(0)] * shift + rows[pivot_row_index][:width - shift],
+                rows[k][shift:] + [Fraction(0)] * shift
+            )
+
+            constants[k], constants[pivot_row_index] = \
+                constants[pivot_row_index], constants[k]
+
+        pivot_row = rows[k]
+        pivot = pivot_row[lower_bandwidth]
+
+        for i in range(k + 1, last_row + 1):
+
+            row = rows[i]
+
+            # Column j of row i is at index j + offset.
+            offset = lower_bandwidth - i
+
+            ratio = row[k + offset] / pivot
+
+            if ratio == 0:
+                continue
+
+            row[k + offset] = Fraction(0)
+
+            for j in range(k + 1, last_column + 1):
+                row[j + offset] -= ratio * pivot_row[j - k + lower_bandwidth]
+
+            constants[i] -= ratio * constants[k]
+
+    solution = [Fraction(0)] * dimension
+
+    # Back substitution from the last variable up.
+    for k in range(dimension - 1, -1, -1):
+
+        value = constants[k]
+
+        for j in range(k + 1, min(dimension - 1, k + reach) + 1):
+            value -= rows[k][j - k + lower_bandwidth] * solution[j]
+
+        solution[k] = value / rows[k][lower_bandwidth]
+
+    return solution
+
+def float_solve(scaled_matrix, constants, lower_bandwidth, upper_bandwidth,
+                zero_tolerance = None):
+    '''
+    This function solves a square linear system with banded coefficients in
+    float64. It is solve with partial pivoting: each pivot is the entry with
+    the highest absolute value on or below the diagonal in its column, which
+    is within lower_bandwidth rows, so the band still holds every nonzero
+    entry. As in float_engine.eliminate, the size of the numbers each entry
+    was calculated from is kept along with it, so a pivot, and an entry of the
+    solution, is only treated as 0 if it is negligible next to them.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square
+        coefficient matrix.
+        constants: a list of the constants of the equations as Fractions.
+        lower_bandwidth: an int that is the lower bandwidth of the
+        coefficients.
+        upper_bandwidth: an int that is the upper bandwidth of the
+        coefficients.
+        zero_tolerance: a float that is the fraction of its bound at which an
+        entry is treated as 0. If it is None, float_engine.ZERO_TOLERANCE is
+        used.
+    Returns:
+        a 1d numpy array of float64 holding the value of each variable, or
+        None if the coefficient matrix is singular.
+    '''
+
+    dimension = scaled_matrix.shape[0]
+
+    width = band_width(lower_bandwidth, upper_bandwidth)
+
+    # Dividing by the row scales here gives the closest float64 to each
+    # entry, as ScaledMatrix.float_array does.
+    rows = (integer_band(scaled_matrix, lower_bandwidth, upper_bandwidth) /
+            np.array(scaled_matrix.row_scales)[:, np.newaxis]) \
+        .astype(np.float64)
+
+    constants = np.array(constants, dtype = np.float64)
+
+    row_bounds = np.abs(rows)
+    constant_bounds = np.abs(constants)
+
+    reach = lower_bandwidth + upper_bandwidth
+
+    for k in range(dimension):
+
+        last_row = min(dimension - 1, k + lower_bandwidth)
+        last_column = min(dimension - 1, k + reach)
+
+        # Row i holds column k at index k - i + lower_bandwidth.
+        column_indexes = np.arange(k, last_row + 1)
+        band_indexes = k - column_indexes + lower_bandwidth
+
+        column_entries = np.abs(rows[column_indexes, band_indexes])
+
+        negligible = float_engine.negligible_entries(
+            column_entries,
+            row_bounds[column_indexes, band_indexes],
+            zero_tolerance
+        )
+
+        # A column without a pivot means the coefficients are singular.
+        if np.all(negligible):
+            return None
+
+        # Entries treated as 0 are set to exactly 0 so that they are not used
+        # to eliminate, as in float_engine.clear_negligible_column.
+        rows[column_indexes[negligible], band_indexes[negligible]] = 0.0
+
+        pivot_row_index = k + int(np.argmax(np.where(negligible, -1.0,
+                                                     column_entries)))
+
+        # Rows are shifted in their bands when they are swapped, as in solve.
+        if pivot_row_index != k:
+            shift = pivot_row_index - k
+
+            for band_array in [rows, row_bounds]:
+                pivot_band = band_array[pivot_row_index].copy()
+                corner_band = band_array[k].copy()
+
+                band_array[k] = 0.0
+                band_array[k, shift:] = pivot_band[:width - shift]
+
+                band_array[pivot_row_index] = 0.0
+                band_array[pivot_row_index, :width - shift] = \
+                    corner_band[shift:]
+
+            for vector in [constants, constant_bounds]:
+                vector[[k, pivot_row_index]] = vector[[pivot_row_index, k]]
+
+        pivot = rows[k, lower_bandwidth]
+
+        # The entries of the pivot row right of the pivot, from column k + 1
+        # to last_column.
+        pivot_entries = rows[k, lower_bandwidth + 1:
+                             last_column - k + lower_bandwidth + 1]
+        pivot_bounds = row_bounds[k, lower_bandwidth + 1:
+                                  last_column - k + lower_bandwidth + 1]
+
+        for i in range(k + 1, last_row + 1):
+
+            offset = lower_bandwidth - i
+
+            ratio = rows[i, k + offset] / pivot
+
+            if ratio == 0:
+                continue
+
+            rows[i, k + offset] = 0.0
+
+            rows[i, k + 1 + offset:last_column + 1 + offset] -= \
+                ratio * pivot_entries
+            row_bounds[i, k + 1 + offset:last_column + 1 + offset] += \
+                abs(ratio) * pivot_bounds
+
+            constants[i] -= ratio * constants[k]
+            constant_bounds[i] += abs(ratio) * constant_bounds[k]
+
+    solution = np.zeros(dimension)
+    solution_bounds = np.zeros(dimension)
+
+    # Back substitution from the last variable up.
+    for k in range(dimension - 1, -1, -1):
+
+        last_column = min(dimension - 1, k + reach)
+
+        upper_entries = rows[k, lower_bandwidth + 1:
+                             last_column - k + lower_bandwidth + 1]
+        upper_bounds = row_bounds[k, lower_bandwidth + 1:
+                                  last_column - k + lower_bandwidth + 1]
+
+        pivot = rows[k, lower_bandwidth]
+
+        solution[k] = (constants[k] - upper_entries.dot(
+            solution[k + 1:last_column + 1]
+        )) / pivot
+
+        solution_bounds[k] = (constant_bounds[k] + upper_bounds.dot(
+            np.abs(solution[k + 1:last_column + 1])
+        )) / abs(pivot)
+
+    # What is left of numbers that cancelled is set to exactly 0.
+    solution[float_engine.negligible_entries(solution, solution_bounds,
+                                             zero_tolerance)] = 0.0
+
+    return solution
@@ -0,0 +1,301 @@
+'''
+This file contains the block diagonal decomposition used for matrices made
+of several smaller matrices that share no rows or columns, such as a linear
+system made of independent smaller systems. Two rows are in the same block
+if a chain of nonzero entries links them, where each link goes between a row
+and a column it has a nonzero entry in. Once the rows and columns are put in
+the order of their blocks, the matrix is block diagonal, so each block is
+row reduced on its own and the results are put back in the original order.
+Blocks are handled one after another in the thread doing the calculation.
+Elimination on Python ints and Fractions holds the global interpreter lock,
+so threads would take turns rather than run at the same time, and the app's
+server is no place to start processes.
+'''
+
+import numpy as np
+import elimination
+
+from fractions import Fraction
+
+def find_root(parents, node):
+    '''
+    This function finds the node that stands for the group a node is in.
+    Args:
+        parents: a list holding the parent of each node. A node that is its
+        own parent stands for its group. Nodes on the path are moved closer to
+        the root so that later searches are shorter.
+        node: an int that is the index of the node.
+    Returns:
+        an int that is the index of the root of the node's group.
+    '''
+
+    while parents[node] != node:
+        parents[node] = parents[parents[node]]
+        node = parents[node]
+
+    return node
+
+def matrix_blocks(scaled_matrix, column_count = None):
+    '''
+    This function splits the rows and columns of a matrix into blocks.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+        column_count: an int that is the number of columns from the left that
+        link rows together, or None for every column. The constant column of
+        an augmented matrix is left out, since it would link every equation.
+    Returns:
+        a list holding, for each block, a tuple whose first item is a list of
+        the indexes of its rows and whose second item is a list of the
+        indexes of its columns. Blocks are in the order of their first
+        columns. Rows and columns without a nonzero entry are in no block.
+    '''
+
+    row_count = scaled_matrix.shape[0]
+
+    if column_count is None:
+        column_count = scaled_matrix.shape[1]
+
+    # Rows read into an int64 array are searched for nonzero entries with
+    # numpy rather than one entry at a time.
+    if isinstance(scaled_matrix.rows, np.ndarray):
+        row_columns = [np.flatnonzero(row[:column_count]).tolist()
+                       for row in scaled_matrix.rows]
+
+    else:
+        row_columns = [[j for j in range(column_count) if row[j] != 0]
+                       for row in scaled_matrix.rows]
+
+    # A row with no zeros links every column, so every row with a nonzero
+    # entry is in its block. This is the case for most dense matrices, which
+    # then do not have to be searched entry by entry.
+    if any(len(columns) == column_count for columns in row_columns):
+        return [(
+            [i for i, columns in enumerate(row_columns) if columns],
+            list(range(column_count))
+        )]
+
+    # Rows are the first row_count nodes and columns are the rest. Each
+    # nonzero entry joins the group of its row to the group of its column.
+    parents = list(range(row_count + column_count))
+
+    used_columns = set()
+
+    for i, columns in enumerate(row_columns):
+
+        row_root = find_root(parents, i)
+
+        for j in columns:
+            column_root = find_root(parents, row_count + j)
+
+            if column_root != row_root:
+                parents[column_root] = row_root
+
+        used_columns.update(columns)
+
+    blocks = {}
+
+    # Going through the columns from the left puts the blocks in the order
+    # of their first columns.
+    for j in sorted(used_columns):
+        blocks.setdefault(
+            find_root(parents, row_count + j),
+            ([], [])
+        )[1].append(j)
+
+    for i, columns in enumerate(row_columns):
+        if columns:
+            blocks[find_root(parents, i)][0].append(i)
+
+    return list(blocks.values())
+
+def block_matrix(scaled_matrix, row_indexes, column_indexes):
+    '''
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+        row_indexes: a list of the indexes of the rows of the block.
+        column_indexes: a list of the indexes of the columns of the block.
+    Returns:
+        an elimination.ScaledMatrix holding the block. Each row keeps its row
+        scale, since the entries it leaves out are all zero.
+    '''
+
+    row_scales = [scaled_matrix.row_scales[i] for i in row_indexes]
+
+    if isinstance(scaled_matrix.rows, np.ndarray):
+        return elimination.ScaledMatrix(
+            scaled_matrix.rows[np.ix_(row_indexes, column_indexes)],
+            row_scales
+        )
+
+    return elimination.ScaledMatrix(
+        [[scaled_matrix.rows[i][j] for j in column_indexes]
+         for i in row_indexes],
+        row_scales
+    )
+
+def reduced_row_echelon_form(scaled_matrix, blocks, select_backend,
+                             augmented = False):
+    '''
+    This function finds the reduced row echelon form of a matrix by row
+    reducing each of its blocks on its own. Every nonzero row of the reduced
+    row echelon form of a block is a nonzero row of the reduced row echelon
+    form of the matrix, placed by its pivot column. When the matrix is the
+    augmented matrix of a linear system, the constant column is part of
+    every block. If any block is inconsistent, the row of zeros ending in 1
+    is used to make every other entry of the constant column zero.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+        blocks: the list of blocks returned by matrix_blocks.
+        select_backend: a function that takes the elimination.ScaledMatrix of
+        a block and returns the Backend object it is row reduced with.
+        augmented: a boolean that is True if the last column is the constant
+        column of a linear system and was left out of the blocks.
+    Returns:
+        a tuple whose first item is a 2d numpy object array of Fractions
+        holding the reduced row echelon form and whose second item is a list
+        of the column index of each pivot.
+    '''
+
+    row_count, column_count = scaled_matrix.shape
+
+    constant_column = column_count - 1
+
+    block_columns = [
+        column_indexes + [constant_column] if augmented else column_indexes
+        for row_indexes, column_indexes in blocks
+    ]
+
+    block_matrices = [
+        block_matrix(scaled_matrix, row_indexes, column_indexes)
+        for (row_indexes, _), column_indexes in zip(blocks, block_columns)
+    ]
+
+    block_results = [
+        select_backend(matrix).reduced_row_echelon_form(matrix)
+        for matrix in block_matrices
+    ]
+
+    # Each nonzero row of each block is kept with its pivot column in the
+    # whole matrix.
+    pivot_rows = []
+
+    for column_indexes, block_result in zip(block_columns, block_results):
+        for k, pivot_column in enumerate(block_result.pivot_columns):
+            pivot_rows.append((
+                column_indexes[pivot_column],
+                column_indexes,
+                block_result.matrix[k]
+            ))
+
+    inconsistent = any(pivot_column == constant_column
+                       for pivot_column, _, _ in pivot_rows)
+
+    # A row in no block has only zeros to the left of the constant column,
+    # so the system is inconsistent if its constant is not zero.
+    if augmented and not inconsistent:
+        block_rows = set(i for row_indexes, _ in blocks for i in row_indexes)
+
+        inconsistent = any(
+            scaled_matrix.rows[i][constant_column] != 0
+            for i in range(row_count) if i not in block_rows
+        )
+
+    reduced_array = np.full((row_count, column_count), Fraction(0),
+                            dtype = object)
+
+    pivot_rows = [pivot_row for pivot_row in pivot_rows
+                  if pivot_row[0] != constant_column or not augmented]
+
+    pivot_rows.sort(key = lambda pivot_row: pivot_row[0])
+
+    for i, (_, column_indexes, block_row) in enumerate(pivot_rows):
+        reduced_array[i, column_indexes] = block_row
+
+    pivot_columns = [pivot_column for pivot_column, _, _ in pivot_rows]
+
+    if augmented and inconsistent:
+        reduced_array[:len(pivot_rows), constant_column] = Fraction(0)
+
+        reduced_array[len(pivot_rows), constant_column] = Fraction(1)
+
+        pivot_columns.append(constant_column)
+
+    return reduced_array, pivot_columns
+
+def permutation_sign(order):
+    '''
+    Args:
+        order: a list holding a permutation of the ints from 0 to its length.
+    Returns:
+        1 if the permutation is even and -1 if it is odd. A cycle of even
+        length is made of an odd number of swaps.
+    '''
+
+    sign = 1
+
+    visited = [False] * len(order)
+
+    for start in range(len(order)):
+
+        cycle_length = 0
+
+        i = start
+
+        while not visited[i]:
+            visited[i] = True
+
+            i = order[i]
+
+            cycle_length += 1
+
+        if cycle_length > 0 and cycle_length % 2 == 0:
+            sign = -sign
+
+    return sign
+
+def determinant(scaled_matrix, blocks, select_backend):
+    '''
+    This function finds the determinant of a square matrix from the
+    determinants of its blocks. The determinant of a block diagonal matrix is
+    the product of the determinants of its blocks, and putting the rows and
+    columns in the order of the blocks multiplies it by the sign of each
+    permutation.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square matrix.
+        blocks: the list of blocks returned by matrix_blocks.
+        select_backend: a function that takes the elimination.ScaledMatrix of
+        a block and returns the Backend object its determinant is found with.
+    Returns:
+        a Fraction that is the determinant.
+    '''
+
+    row_order = [i for row_indexes, _ in blocks for i in row_indexes]
+
+    column_order = [j for _, column_indexes in blocks for j in column_indexes]
+
+    # A zero row, a zero column, or a block with more rows than columns or
+    # more columns than rows makes the matrix singular.
+    if len(row_order) != scaled_matrix.shape[0] or \
+        len(column_order) != scaled_matrix.shape[1] or \
+        any(len(row_indexes) != len(column_indexes)
+            for row_indexes, column_indexes in blocks):
+        return Fraction(0)
+
+    block_matrices = [
+        block_matrix(scaled_matrix, row_indexes, column_indexes)
+        for row_indexes, column_indexes in blocks
+    ]
+
+    block_determinants = [
+        select_backend(matrix).determinant(matrix)
+        for matrix in block_matrices
+    ]
+
+    determinant = Fraction(
+        permutation_sign(row_order) * permutation_sign(column_order)
+    )
+
+    for block_determinant_value in block_determinants:
+        determinant *= block_determinant_value
+
+    return determinant
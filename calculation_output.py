@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 import matrix_input
 import calculations
+import result_cache
 
 from shiny import App, Inputs, Outputs, Session, render, ui, module, reactive
 
@@ -15,14 +16,22 @@ from format import spaced_section_express as spaced_section, \
 spaced_section_core
 
 # Create class that holds a function and has a property indicating the label
-# for the output and whether the output will be a number or a pandas DataFrame
+# for the output and whether the output will be a number or a pandas DataFrame.
+# shares_factorization is True if the function takes a factorization argument
+# through which it shares results with the other outputs in its panel.
+# cacheable is False if the output shows the entries as the user wrote them,
+# since the result cache gives the same result for every way of writing the
+# same numbers.
 
 class Output_Function:
 
-    def __init__(self, output_label, returns_frame, inner_function):
+    def __init__(self, output_label, returns_frame, inner_function,
+                 shares_factorization = False, cacheable = True):
         self.output_label = output_label
         self.returns_frame = returns_frame
         self.inner_function = inner_function
+        self.shares_factorization = shares_factorization
+        self.cacheable = cacheable
 
 @module.ui
 def calculation_output_ui(calculate_button_label):
@@ -83,6 +92,11 @@ def calculation_output_server(
         None
     '''
 
+    # The Factorization from the last click is kept for each session, so that
+    # when the user only edits one entry before clicking again, results such
+    # as the inverse are updated rather than calculated from the beginning.
+    last_calculation = {"factorization": None}
+
     # This function is read interactively like in Shiny Express. It is used to
     # output the results of calculations performed in the nav_panel this module
     # is in, once the button to trigger the calculation is pressed.
@@ -137,6 +151,28 @@ def calculation_output_server(
 
             return
       
+        # One Factorization is created for each click, so the input matrix is
+        # read only once and every output that shares it calculates the
+        # reduced row echelon form it needs from the input matrix only once
+        # between them. The exact results it keeps for updating the next
+        # click's Factorization are held in the shared cache too, so they can
+        # still be updated when this click's outputs are taken from the cache.
+        factorization = calculations.Factorization(
+            input_matrix_value,
+            output_decimal_value,
+            cache = result_cache.shared_cache
+        )
+
+        # Results are looked up in the cache shared by every session by a hash
+        # of the numbers in the input matrix, found from the matrix the
+        # Factorization read. The hash is None if an entry is not a valid
+        # number, in which case nothing is cached.
+        input_matrix_hash = factorization.matrix_hash
+
+        factorization.update_from(last_calculation["factorization"])
+
+        last_calculation["factorization"] = factorization
+
         # For every Output_Function in output_functions, a module to display
         # the output of the inner function held in the Output_Function is
         # called. Each calculation output is handled in its own module so that
@@ -148,10 +184,34 @@ def calculation_output_server(
             
             # The result of the output_functions[i]'s inner function is
             # calculated.
-            output_calculation = output_functions[i].inner_function(
-                input_matrix_value,
-                output_decimal_value
-            )
+            if output_functions[i].shares_factorization:
+                calculate = lambda: output_functions[i].inner_function(
+                    input_matrix_value,
+                    output_decimal_value,
+                    factorization = factorization
+                )
+
+            else:
+                calculate = lambda: output_functions[i].inner_function(
+                    input_matrix_value,
+                    output_decimal_value
+                )
+
+            # The result is taken from the cache if another session or an
+            # earlier click already calculated it.
+            if input_matrix_hash is not None and \
+                output_functions[i].cacheable:
+                output_calculation = result_cache.shared_cache.result(
+                    result_cache.result_key(
+                        input_matrix_hash,
+                        output_functions[i].inner_function,
+                        output_decimal_value
+                    ),
+                    calculate
+                )
+
+            else:
+                output_calculation = calculate()
 
             # A single_output_ui module written in Shiny Core is called. Its
             # name is based on the function number (i) so that it is unique and
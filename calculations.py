@@ -1,8 +1,15 @@
 import pandas as pd
 import numpy as np
+import backends
+import elimination
+import result_cache
 
 from fractions import Fraction
 from decimal import Decimal
+from math import lcm
+
+# Every int with at most this many bits is exactly a float64.
+FLOAT64_EXACT_BITS = 53
 
 # This class makes it possible to hold matrices in DataFrames that keep track
 # of row swaps since the original matrix. This class is primarily designed to
@@ -12,350 +19,519 @@ from decimal import Decimal
 class Matrix(pd.DataFrame):
     row_swaps_from_original = 0
 
-def row_echelon_form(matrix, output_decimal = False):
-    '''
-    The purpose of this function is to convert a user-entered matrix to a
-    row equivalent matrix in row echelon form.
-    Args:
-        matrix - A panda DataFrame that holds the matrix entered by the user.
-        The type of elements within the DataFrame may vary.
-        output_decimal - a boolean that is true if the user wants the output
-        matrix to have decimals rather than fractions.
-    Returns:
-        A panda DataFrame that holds a matrix in row echelon form that is row
-        equivalent to the matrix entered by the user.
-    '''
-
-    matrix = matrix.astype(object)
-
-    # The matrix is converted to fractions so that it can be created to a numpy
-    # array of floats that can have math done on it.
-    all_valid_numbers = convert_to_fractions(matrix)
-
-    # If the matrix is not all fractions, an error DataFrame is returned.
-    if not all_valid_numbers:
-
-        empty = np.array([])
-
-        error_frame = Matrix(empty)
+# This class holds the results calculated from one user-entered matrix when
+# the user clicks a calculate button. The outputs on a calculator panel are
+# all given the same Factorization, so a result more than one output needs,
+# such as the reduced row echelon form, is calculated once by the first output
+# that needs it and shared with the rest. The matrix itself is read once, when
+# the Factorization is created, and every output uses what was read.
+
+class Factorization:
+
+    def __init__(self, matrix, output_decimal, cache = None):
+        '''
+        Args:
+            matrix: a pandas DataFrame holding the user-entered matrix.
+            output_decimal: a boolean that is True if the user wants decimal
+            outputs.
+            cache: a result_cache.ResultCache that exact results kept for
+            updating later Factorizations are also held in, or None. Holding
+            them there lets the next edit be updated from this matrix even
+            when its outputs were taken from the cache rather than calculated.
+        '''
+        self.matrix = matrix
+        self.output_decimal = output_decimal
+        self.cache = cache
+        self.results = {}
+
+        # This is an elimination.ScaledMatrix, or None if an entry is not a
+        # valid number.
+        self.scaled_matrix = parse_matrix(matrix)
+
+        # Results are looked up in the cache by a hash of the numbers in the
+        # matrix, which is None when nothing is cached.
+        if cache is not None and self.scaled_matrix is not None:
+            self.matrix_hash = result_cache.scaled_matrix_hash(
+                self.scaled_matrix,
+                matrix.columns
+            )
 
-        error_frame.columns = ["At least one of the entries in\
-        your matrix is not a valid number."]
+        else:
+            self.matrix_hash = None
+
+    def cache_key(self, name):
+        '''
+        Args:
+            name: a string naming an exact result.
+        Returns:
+            a tuple that identifies the result in the cache, in the same form
+            as the keys result_cache.result_key returns. Exact results are
+            the same for both kinds of outputs.
+        '''
+
+        return (self.matrix_hash, "calculations.Factorization." + name,
+                "fraction")
+
+    def is_cached(self):
+        '''
+        Returns:
+            a boolean that is True if exact results are also held in the
+            cache.
+        '''
+
+        return self.cache is not None and self.matrix_hash is not None
+
+    def shared_result(self, name, calculate, cacheable = False):
+        '''
+        This method returns a result that is only calculated the first time it
+        is asked for.
+        Args:
+            name: a string naming the result.
+            calculate: a function that takes no arguments and returns the
+            result.
+            cacheable: a boolean that is True if the result only depends on
+            the numbers in the matrix, so it can be taken from and added to
+            the cache.
+        Returns:
+            the result, which is the same object every time.
+        '''
+
+        if name not in self.results:
+            if cacheable and self.is_cached():
+                self.results[name] = self.cache.result(self.cache_key(name),
+                                                       calculate)
 
-        return error_frame
+            else:
+                self.results[name] = calculate()
+
+        return self.results[name]
+
+    def shared_frame(self, name, calculate):
+        '''
+        This method returns a DataFrame that is only calculated the first time
+        it is asked for.
+        Args:
+            name: a string naming the result.
+            calculate: a function that takes no arguments and returns the
+            result as a DataFrame.
+        Returns:
+            a copy of the DataFrame, so that an output that changes its frame
+            does not change the frame the other outputs get.
+        '''
+
+        return self.shared_result(name, calculate).copy()
+
+    def kept_result(self, name):
+        '''
+        Args:
+            name: a string naming a cacheable result.
+        Returns:
+            the result if it was calculated for this Factorization or is held
+            in the cache, or None.
+        '''
+
+        if name in self.results:
+            return self.results[name]
+
+        if self.is_cached():
+            return self.cache.held_result(self.cache_key(name))
+
+        return None
+
+    def keep_result(self, name, result):
+        '''
+        This method holds a cacheable result that was found without calling
+        shared_result, and adds it to the cache.
+        Args:
+            name: a string naming the result.
+            result: the result.
+        '''
+
+        self.results[name] = result
+
+        if self.is_cached():
+            self.cache.put(self.cache_key(name), result)
+
+    def update_from(self, previous):
+        '''
+        This method reuses the exact results of a previous Factorization when
+        the matrix only differs from it in one entry, as it does when the user
+        edits one cell. Changing entry (i, j) by delta adds delta times
+        e_i e_j^T to the matrix. By the Sherman-Morrison formula the new
+        inverse is the old inverse minus delta times column i of it times row
+        j of it, divided by 1 + delta * inverse[j, i], and the PLU
+        factorization the determinant is found from is updated with
+        PLUFactorization.rank_one_update. Both take a number of steps
+        proportional to the number of entries rather than a new elimination.
+        Results the previous Factorization only has in the cache, because its
+        outputs were taken from the cache, are updated too.
+        Args:
+            previous: a Factorization from an earlier calculation, or None.
+        Returns:
+            None
+        '''
+
+        if previous is None or \
+            previous.matrix.shape != self.matrix.shape or \
+            not previous.matrix.columns.equals(self.matrix.columns):
+            return
+
+        previous_inverse = previous.kept_result("exact inverse")
+        previous_LU = previous.kept_result("exact LU")
+
+        # A singular matrix has no inverse to update, and its factorization
+        # does not have a pivot in every column.
+        if previous_inverse is None and previous_LU is None:
+            return
+
+        changed_entries = np.argwhere(
+            previous.matrix.to_numpy() != self.matrix.to_numpy()
+        )
 
-    # The DataFrame is converted to numpy array so math can be done on it.
-    matrix_array = matrix.to_numpy()
+        if len(changed_entries) != 1:
+            return
 
-    # corner_row and corner_column are the row and column of the portion of the
-    # matrix currently being reduced to row echelon form
+        i, j = changed_entries[0]
 
-    total_row_swaps = 0
+        previous_entry = parse_entry(previous.matrix.iat[i, j])
+        entry = parse_entry(self.matrix.iat[i, j])
 
-    corner_row = 0
+        if previous_entry is None or entry is None:
+            return
 
-    corner_column = 0
+        delta = entry - previous_entry
 
-    # The operations to row reduce this matrix to echelon form are performed in
-    # this while loop. Each time a column is filled with zeros below the pivot
-    # position, the corner is moved one down and one to the right.
-    # Each time there is a zero column, the corner is moved one ot the right.
-    # Once the corner is outside the matrix, the while loop ends. 
-    while corner_row < matrix_array.shape[0] and corner_column < \
-        matrix_array.shape[1]:
+        # If a pivot of the changed matrix would be 0, it is factored again
+        # when it is needed.
+        if previous_LU is not None:
+            LU = previous_LU.rank_one_update(int(i), int(j), delta)
 
-        zero_column = False
+            if LU is not None:
+                self.keep_result("exact LU", LU)
 
-        # The code below brings the row with the highest value in the corner
-        # column to the corner row to reduce errors associated with large
-        # numbers caused by multiplying rows by ratios above 1.
+        if previous_inverse is None:
+            return
 
-        i = corner_row + 1
+        determinant_ratio = 1 + delta * previous_inverse[j, i]
 
-        # This while loop finds the row that has the highest absolute value in
-        # the corner_column.
+        # If the determinant becomes 0, the new matrix is not invertible.
+        if determinant_ratio == 0:
+            self.keep_result("exact inverse", None)
 
-        max_row = corner_row
+            return
 
-        while i < matrix_array.shape[0]:
+        self.keep_result("exact inverse", previous_inverse - np.outer(
+            previous_inverse[:, i] * (delta / determinant_ratio),
+            previous_inverse[j, :]
+        ))
 
-            if fraction_absolute_value(matrix_array[i][corner_column]) > \
-                fraction_absolute_value(matrix_array[max_row][corner_column]):
-                max_row = i
-            
-            i += 1
+def invalid_number_frame():
+    '''
+    This function creates the error frame returned when an entry of a matrix
+    cannot be converted to a fraction.
+    Args:
+        None
+    Returns:
+        an empty Matrix whose only column name explains the error.
+    '''
 
-        # The first row with is switched with the row having the highest
-        # absolute value in corner_column.
+    empty = np.array([])
 
-        if max_row != corner_row:
-            total_row_swaps += 1
+    error_frame = Matrix(empty)
 
-        temp = matrix_array[max_row].copy()
+    error_frame.columns = ["At least one of the entries in\
+        your matrix is not a valid number."]
 
-        matrix_array[max_row] = matrix_array[corner_row]
+    return error_frame
 
-        matrix_array[corner_row] = temp
+def output_array(backend, result_array, output_decimal):
+    '''
+    This function prepares an array calculated by a backend to be outputted.
+    Args:
+        backend: the Backend object the array was calculated with.
+        result_array: a 2d numpy object array holding the result.
+        output_decimal: a boolean that is True if the user wants decimal
+        outputs.
+    Returns:
+        the array, with its Fractions converted to Decimals if the user wants
+        decimal outputs and the backend calculated Fractions.
+    '''
 
-        # If the max row has 0 in its corner_column then the column is a zero
-        # column
-        if matrix_array[corner_row][corner_column] == 0:
-            zero_column = True
-            
-            # The pivot position within the corner row is moved one to the
-            # right
+    if output_decimal and not backend.outputs_decimal:
+        convert_fractions_to_decimal(result_array)
 
-            corner_column += 1
+    return result_array
 
-        # This if statement brings all rows entries in the corner column below
-        # that of the corner row to zero. This is only possible if the column
-        # is not a zero column.
-        if not zero_column:           
-            
-            corner_num = matrix_array[corner_row, corner_column]
+def row_echelon_form(matrix, output_decimal = False, backend = None,
+                     factorization = None):
+    '''
+    The purpose of this function is to convert a user-entered matrix to a
+    row equivalent matrix in row echelon form.
+    Args:
+        matrix - A panda DataFrame that holds the matrix entered by the user.
+        The type of elements within the DataFrame may vary.
+        output_decimal - a boolean that is true if the user wants the output
+        matrix to have decimals rather than fractions.
+        backend - the Backend object from backends.py the calculation is done
+        with. If it is None, one is chosen with backends.select_backend.
+        factorization - a Factorization of the matrix the matrix is read from,
+        or None.
+    Returns:
+        A panda DataFrame that holds a matrix in row echelon form that is row
+        equivalent to the matrix entered by the user.
+    '''
 
-            # This for loop brings every entry in the corner column below the
-            # corner row to zero.
-            for i in range(corner_row + 1, matrix_array.shape[0]):
-                
-                ratio = matrix_array[i, corner_column] / corner_num
+    # The matrix is read into rows of ints with one scale per row so that each
+    # entry equals exactly the number the user entered.
+    scaled_matrix = parsed_matrix(matrix, factorization)
 
-                matrix_array[i] += -1 * ratio * matrix_array[corner_row]
+    # If an entry is not a valid number, an error DataFrame is returned.
+    if scaled_matrix is None:
+        return invalid_number_frame()
 
-            # The corner row is moved one down and the column is moved one to
-            # the right.
-            corner_row += 1
-            corner_column += 1
+    if backend is None:
+        backend = backends.select_backend(scaled_matrix, output_decimal)
 
-    if output_decimal:
-        convert_fractions_to_decimal(matrix_array)
+    # Row echelon form is not unique, so the matrix shown depends on how the
+    # backend chooses pivots. The exact backends use
+    # elimination.DEFAULT_PIVOT_RULE, which brings the entry whose numerator
+    # and denominator have the fewest bits to the corner to keep the numbers
+    # in later rows small. The float64 backend used for decimal outputs
+    # brings the entry with the highest absolute value to the corner to keep
+    # round-off errors small. So fraction and decimal outputs can show
+    # different row echelon forms of the same matrix.
+    ref_array, total_row_swaps = backend.row_echelon_form(scaled_matrix)
 
     ref_matrix = Matrix(
-            data = matrix_array
+            data = output_array(backend, ref_array, output_decimal)
         )
-    
+
     ref_matrix.row_swaps_from_original = total_row_swaps
 
     return ref_matrix
 
-def LU_factorize(matrix, output_decimal = False):
+def LU_factorize(matrix, output_decimal = False, backend = None,
+                 factorization = None):
     '''
-    This function is meant to find the LU factorization of a user-entered
-    matrix.
+    This function is meant to find the PLU factorization of a user-entered
+    matrix. Rows are only swapped when the matrix has no LU factorization,
+    except for decimal outputs, which use partial pivoting to keep round-off
+    errors small.
     Args:
         matrix - A panda DataFrame that holds the matrix entered by the user.
         The type of elements within the DataFrame may vary.
         output_decimal - a boolean that is true if the user wants the output
         matrix to have decimals rather than fractions.
+        backend - the Backend object from backends.py the calculation is done
+        with. If it is None, one is chosen with backends.select_backend.
+        factorization - a Factorization of the matrix the matrix is read from,
+        or None.
     Returns:
-        A panda DataFrame that holds both the L matrix and the U matrix with a
-        dividing column between them.
+        A panda DataFrame that holds the P matrix if rows were swapped, the L
+        matrix and the U matrix with a dividing column between each of them.
     '''
-    matrix = matrix.astype(object)
+    # The matrix is read into rows of ints with one scale per row so that each
+    # entry equals exactly the number the user entered.
+    scaled_matrix = parsed_matrix(matrix, factorization)
 
-    # The matrix is converted to fractions so that it can be created to a numpy
-    # array of floats that can have math done on it.
-    all_valid_numbers = convert_to_fractions(matrix)
+    # If an entry is not a valid number, an error DataFrame is returned.
+    if scaled_matrix is None:
+        return invalid_number_frame()
 
-    # If the matrix is not all fractions, an error DataFrame is returned.
-    if not all_valid_numbers:
+    if backend is None:
+        backend = backends.select_backend(scaled_matrix, output_decimal)
 
-        empty = np.array([])
+    # The factorization is held with L and U packed into one array, and it is
+    # only expanded into the full matrices here, to be displayed.
+    factorization = backend.LU_factorize(scaled_matrix)
 
-        error_frame = Matrix(empty)
+    return LU_frame_from_factorization(factorization, backend, output_decimal)
 
-        error_frame.columns = ["At least one of the entries in\
-        your matrix is not a valid number."]
-
-        return error_frame
-    
-    # A 2d array to hold the L matrix is created. This is a square matrix
-    # with the same dimension as the number of rows in matrix U. This is 
-    # necessary because to perform the multiplication L*U the number of columns
-    # in L must match the number of rows in U. Additionally, L must have the
-    # same number of row as U because LU must have the same number of rows as
-    # the original matrix and the product LU has the same number of rows as L.
-    L_array = np.full([matrix.shape[0], matrix.shape[0]], Fraction(0))
-    L_column = 0
+def LU_frame_from_factorization(factorization, backend, output_decimal):
+    '''
+    This function combines the matrices of a PLU factorization into one
+    DataFrame to be displayed. P is only displayed if rows were swapped.
+    Args:
+        factorization: the elimination.PLUFactorization to display.
+        backend: the Backend object the factorization was calculated with.
+        output_decimal: a boolean that is True if the user wants decimal
+        outputs.
+    Returns:
+        A panda DataFrame that holds the P matrix if there is one, the L
+        matrix and the U matrix with a dividing column between each of them.
+    '''
 
-    # Diagonals of L_array are set to 1 so that columns of L that are not
-    # needed if there are fewer pivots in U than columns in L, L has
-    # columns from identity matrix by default.
+    row_count = factorization.packed_array.shape[0]
 
-    for i in range(L_array.shape[0]):
-        L_array[i, i] = 1
+    # The dividing columns are empty except for a "*" in the middle row.
+    multiply_array = np.full((row_count, 1), "", dtype = object)
+    multiply_array[row_count // 2, 0] = "*"
 
-    # The DataFrame is converted to numpy array so math can be done on it.
-    U_array = matrix.to_numpy()
+    arrays = []
+    column_names = []
 
-    corner_row = 0
+    if factorization.row_swaps > 0:
+        P_array = output_array(
+            backend,
+            factorization.P_array(),
+            output_decimal
+        )
 
-    corner_column = 0
+        arrays += [P_array, multiply_array]
+        column_names += ["P" + str(i + 1) for i in range(row_count)] + \
+            ["Multiplied By L"]
 
-    # The operations to row reduce U_array to echelon form are performed in
-    # this while loop. Each time a column is filled with zeros below the pivot
-    # position, the corner is moved one down and one to the right.
-    # Each time there is a zero column, the corner is moved one to the right.
-    # Once the corner is outside the matrix, the while loop ends. 
-    while corner_row < U_array.shape[0] and corner_column < \
-        U_array.shape[1]:
+    L_array = output_array(backend, factorization.L_array(), output_decimal)
+    U_array = output_array(backend, factorization.U_array(), output_decimal)
 
-        zero_column = True
+    arrays += [L_array, multiply_array, U_array]
+    column_names += ["L" + str(i + 1) for i in range(L_array.shape[1])] + \
+        ["Multiplied By"] + \
+        ["U" + str(i + 1) for i in range(U_array.shape[1])]
 
-        i = corner_row
+    # The frame is made from one array rather than adding one column at a
+    # time, which copies the frame each time.
+    return pd.DataFrame(
+        data = np.hstack(arrays),
+        columns = column_names
+    )
 
-        # The code below checks if the current column is a zero_column
-        while zero_column and i < U_array.shape[0]:
+def parse_entry(entry):
+    '''
+    This function reads the number a user entered in one entry of a matrix.
+    Args:
+        entry: the entry, which may be a string, an int or a float.
+    Returns:
+        an int if the entry is a whole number written without a decimal point,
+        a Fraction equal to the entry otherwise, or None if the entry is not a
+        valid number.
+    '''
 
-            # If any row in the corner column has a nonzero entry, then
-            # zero_column is set to False. 
-            if U_array[i, corner_column] != 0:
-                zero_column = False
+    # The entry is made into a string so that the fraction version of the
+    # entry will be equal to the number the user entered rather than a float
+    # directly converted to a fraction.
+    entry = str(entry)
 
-            i += 1
+    # Most entries are ints, which are read without creating a Fraction.
+    try:
+        return int(entry)
 
-        # This is entered if every row in the corner column holds a 0.
-        if zero_column:
-            
-            # The pivot position within the corner row is moved one to the
-            # right
+    except ValueError:
+        pass
 
-            corner_column += 1
+    try:
 
-        # This if statement brings all rows entries in the corner column below
-        # that of the corner row to zero. This is only possible if the column
-        # is not a zero column.
-        if not zero_column:           
-            
-            # LU factorization cannot involve row swaps. If row swaps are
-            # necessary, PLU factorization would be needed.
+        # This converts fractions written with /
+        if entry.find("/") != -1:
 
-            corner_num = U_array[corner_row, corner_column]
+            divide_index = entry.index("/")
 
-            if corner_num == 0: 
-                empty = np.array([])
+            # A fraction can only be passed strings that can be made into ints
+            # if both the numerator and denominator are set. It can only take
+            # one argument if the number passed to it is a decimal. Because of
+            # this, in case the user entered decimals in the fraction, the
+            # numerator and denominator wll be set to fractions that are then
+            # divided.
+            numerator = Fraction(entry[:divide_index])
+            denominator = Fraction(entry[divide_index + 1:])
 
-                cannot_factor_frame = Matrix(empty)
+            return numerator / denominator
 
-                cannot_factor_frame.columns = ["The matrix you entered is " + \
-                                               "not LU factorizable."]
+        return Fraction(entry)
 
-                return cannot_factor_frame
-            
-            # The next column of the L_matrix is added based on the ratios of
-            # each row entry in the column to the corner_row entry
+    except:
+        return None
 
-            # An array is made from corner column of the current U_array.
-            # Unlike with normal 2d lists, this splice refers to locations 
-            # in the actual numpy array, not to a copy of the array, so .copy()
-            # is necessary
-            next_L_column = U_array[:, corner_column].copy()
+def parse_matrix(matrix):
+    '''
+    This function reads a user-entered matrix into a ScaledMatrix. It does
+    not modify the matrix or create a Fraction for every entry.
+    Args:
+        matrix: a panda DataFrame consisting of entries that vary in type.
+        The elements of this DataFrame correspond to a user entered matrix.
+    Returns:
+        an elimination.ScaledMatrix holding the matrix, or None if an entry is
+        not a valid number or the matrix is empty.
+    '''
 
-            # Each number in this array above corner_row is set to 0
-            for i in range(0, corner_row):
-                next_L_column[i] = 0
+    if matrix.empty:
+        return None
+
+    # Columns pandas already holds as ints are read straight into an int64
+    # array without creating a Python object for each entry.
+    if all(pd.api.types.is_signed_integer_dtype(dtype) for dtype in
+           matrix.dtypes):
+        return elimination.ScaledMatrix(
+            matrix.to_numpy(dtype = np.int64),
+            [1] * matrix.shape[0]
+        )
 
-            # Numbers in this array are changed to ratios of each entry to the
-            # entry in corner_column
+    entries = matrix.to_numpy(dtype = object)
 
-            next_L_column /= next_L_column[corner_column]
+    # Large matrices, such as banded ones, are mostly zeros, so only the
+    # entries not written as 0 are read. Comparing every entry to "0" is done
+    # by numpy without a Python call for each entry.
+    row_indexes, column_indexes = np.nonzero(entries != "0")
 
-            # The next column is added to L
+    numbers = [parse_entry(entry) for entry in
+               entries[row_indexes, column_indexes].tolist()]
 
-            L_array[:, L_column] = next_L_column
+    if any(number is None for number in numbers):
+        return None
 
-            L_column += 1
+    row_indexes = row_indexes.tolist()
+    column_indexes = column_indexes.tolist()
 
-            # This for loop brings every entry in the corner column below the
-            # corner row to zero.
-            for i in range(corner_row + 1, U_array.shape[0]):
-                
-                ratio =  U_array[i, corner_column] / corner_num
+    # Each row is multiplied by the least common multiple of the denominators
+    # in it, which clears every denominator while keeping the ints as small
+    # as possible. ints and Fractions both have a numerator and a
+    # denominator, so they are scaled the same way.
+    row_scales = [1] * matrix.shape[0]
 
-                U_array[i] += -1 * ratio * U_array[corner_row]
+    for i, number in zip(row_indexes, numbers):
+        if number.denominator != 1:
+            row_scales[i] = lcm(row_scales[i], number.denominator)
 
-            # The corner row is moved one down and the column is moved one to
-            # the right.
-            corner_row += 1
-            corner_column += 1
+    scaled_numbers = [
+        number.numerator * (row_scales[i] // number.denominator)
+        for i, number in zip(row_indexes, numbers)
+    ]
 
-    # The U matrix and the L matrix are converted to decimals if the user
-    # wants decimal outputs.
-    if output_decimal:
-        convert_fractions_to_decimal(L_array)
-        convert_fractions_to_decimal(U_array)
-    
-    LU_frame = pd.DataFrame()
+    # When every int and row scale is exact in float64, the matrix is held as
+    # an int64 array, so no Python object is made for its zeros and
+    # ScaledMatrix.float_array divides exact float64s.
+    largest_int = max([abs(number) for number in scaled_numbers] +
+                      row_scales)
 
-    # L_array and U_array are combined into the LU_frame
+    if largest_int.bit_length() <= FLOAT64_EXACT_BITS:
+        rows = np.zeros(matrix.shape, dtype = np.int64)
 
-    for i in range(L_array.shape[1]):
-        # Each column of the L_array is added to the LU_frame
-        LU_frame["L" + str(i + 1)] = L_array[:,i]
-    
-    # An array to divide L and U is added
-    multiply_array = [""] * L_array.shape[0]
-    multiply_array[len(multiply_array) // 2] = "*"
+        rows[row_indexes, column_indexes] = scaled_numbers
 
-    LU_frame["Multiplied By"] = multiply_array
+    else:
+        rows = [[0] * matrix.shape[1] for i in range(matrix.shape[0])]
 
-    for i in range(U_array.shape[1]):
-        # Each column of the L_array is added to the LU_frame
-        LU_frame["U" + str(i + 1)] = U_array[:,i]
+        for i, j, number in zip(row_indexes, column_indexes,
+                                scaled_numbers):
+            rows[i][j] = number
 
-    return LU_frame
+    return elimination.ScaledMatrix(rows, row_scales)
 
-def convert_to_fractions(matrix):
+def parsed_matrix(matrix, factorization = None):
     '''
-    The purpose of this function is to convert every element of a matrix to
-    fractions. It also returns true or false depending on if the matrix values
-    are all possible to convert to fraction.
     Args:
-        matrix - a panda DataFrame consisting of entries that vary in type.
-        The elements of this DataFrame correspond to a user entered matrix.
+        matrix: a panda DataFrame holding a user-entered matrix.
+        factorization: a Factorization of the matrix, or None.
     Returns:
-        a boolean that is True if the matrix elements can be converted to
-        fractions and false otherwise or if the matrix is empty.
+        the elimination.ScaledMatrix parse_matrix returns for the matrix,
+        which is taken from the factorization when there is one so that the
+        matrix is only read once for every output.
     '''
 
-    if matrix.empty:
-        return False
-
-    # This loop attempts to convert every element of the matrix to a float. If
-    # there is an error in this process, the function will return false
-    for i in range(0, matrix.shape[0]):
-        for j in range(0, matrix.shape[1]):
-
-            # The entry is made into a string so that the fractin version of
-            # the entry will be equal to the number the user entered rather
-            # than a float directly converted to a fraction.
-            entry = str(matrix.iat[i, j])
-
-            try:
-                
-                # This converts fractions written with / to floats
-                if str(entry).find("/") != -1:
-
-                    divide_index = entry.index("/")
-
-                    # A fraction can only be passed strings that can be made
-                    # into ints if both the numerator and denominator are set.
-                    # It can only take one argument if the number passed to it
-                    # is a decimal. Because of this, in case the user entered
-                    # decimals in the fraction, the numerator and denominator
-                    # wll be set to fractions that are then divided.
-                    numerator = Fraction(entry[:divide_index])
-                    denominator = Fraction(entry[divide_index + 1:])
-
-                    matrix.iat[i, j] = numerator / denominator
-
-                else :
-                    matrix.iat[i, j] = Fraction(entry)
-                
-            except:
-                return False
- 
-    return True
+    if factorization is not None:
+        return factorization.scaled_matrix
+
+    return parse_matrix(matrix)
 
 def convert_fractions_to_decimal(matrix_array):
     '''
@@ -373,128 +549,100 @@ def convert_fractions_to_decimal(matrix_array):
             matrix_array[i][j] = Decimal(matrix_array[i][j].numerator) / \
             Decimal(matrix_array[i][j].denominator)
 
-def fraction_absolute_value(number):
-    '''
-    This function is meant to return the absolute value of a Fraction object.
-    Args:
-        number: an object of the Fraction class whose absolute value is being
-        found
-    Returns:
-        a Fraction that is the absolute value of the number argument
-    '''
-
-    if number < 0:
-        number *= -1
-
-    return number
-
-def reduced_row_echelon_form(matrix, output_decimal = False):
+def reduced_row_echelon_form(matrix, output_decimal = False, backend = None,
+                             factorization = None):
     '''
     The purpose of this function is to find the reduced row echelon form of
     a user-entered matrix.
     Args:
         matrix - a panda DataFrame consisting of entries that vary in type.
         The elements of this DataFrame correspond to a user entered matrix.
+        output_decimal - a boolean that is true if the user wants the output
+        matrix to have decimals rather than fractions.
+        backend - the Backend object from backends.py the calculation is done
+        with. If it is None, one is chosen with backends.select_backend.
+        factorization - a Factorization of the matrix the matrix is read from,
+        or None.
     Returns:
         A panda DataFrame that holds a matrix in reduced row echelon form that
         is row equivalent to the matrix entered by the user.
     '''
 
-    # The first step of converting a matrix to reduced row echelon form is to
-    # convert it to row echelon form.
-
-    ref_matrix = row_echelon_form(matrix)
+    reduced_result = reduced_row_echelon_elimination(
+        matrix,
+        output_decimal,
+        backend,
+        scaled_matrix = parsed_matrix(matrix, factorization)
+    )
 
-    # If the row echelon form function returns an error DataFrame because not
-    # all elements of the matrix can be converted to floats, this function
-    # also returns an empty DataFrame
-    if ref_matrix.empty:
-        return ref_matrix
+    # If an entry is not a valid number, an error DataFrame is returned.
+    if reduced_result is None:
+        return invalid_number_frame()
 
-    # When ref_matrix is converted to a numpy array, there is no need to
-    # convert each element to a fraction since that was already done in the
-    # row_echelon_form function.
+    rref_matrix = pd.DataFrame(data = reduced_result.matrix)
 
-    matrix_array = ref_matrix.to_numpy()
-
-    lowest_nonzero_row = matrix_array.shape[0] - 1
-
-    # The np.all method checks if a condition is true for every element of a
-    # numpy array. The condition written as all's argument is checked for every
-    # element of the array.
-
-    # This while loop is exited once lowest_nonzero_row is the lowest row that
-    # does not have all zeros. If every row is all zeros, it is exited with
-    # lowest_nonzero equal to -1.
-
-    while lowest_nonzero_row >= 0 and np.all(matrix_array[lowest_nonzero_row]
-                                              == 0):
-        lowest_nonzero_row -= 1
-
-    current_row = lowest_nonzero_row
-
-    while current_row >= 0:
-        
-        pivot_column = 0
-
-        # The pivot_column in each row is the leftmost number in a row. This is
-        # found by traversing through a row of the matrix from the left until 
-        # a nonzero number is found.
-
-        while matrix_array[current_row, pivot_column] == 0:
-            pivot_column += 1
-
-        # Each row should be divided by the number in its pivot column so that
-        # the pivot number is 1.
-
-        matrix_array[current_row] /= matrix_array[current_row, pivot_column]
-
-        # All numbers in each pivot column aside from the pivot number should
-        # be 0. All numbers below each pivot position are already 0 from
-        # reducing to row echelon form, so the numbers in the pivot column
-        # above the pivot need to be made 0
-
-        for i in range(0, current_row):
-            num_in_pivot_column = matrix_array[i, pivot_column]
-
-            # The number in the pivot column in the current row has already
-            # been set to 0. So to eliminate the number in the pivot column
-            # in each row, all that is necessary is to multiply the current
-            # row by the opposite of the number in row i in the pivot column
-            # and add that to row i.
+    return rref_matrix
 
-            matrix_array[i] += -1 * num_in_pivot_column * \
-                matrix_array[current_row]
+def reduced_row_echelon_elimination(matrix, output_decimal = False,
+                                    backend = None, augmented = False,
+                                    scaled_matrix = None):
+    '''
+    This function brings a user-entered matrix to reduced row echelon form
+    and keeps what was learned about it during elimination.
+    Args:
+        matrix - a panda DataFrame consisting of entries that vary in type.
+        output_decimal - a boolean that is true if the user wants the output
+        matrix to have decimals rather than fractions.
+        backend - the Backend object from backends.py the calculation is done
+        with. If it is None, one is chosen with backends.select_backend.
+        augmented - a boolean that is true if the matrix is the augmented
+        matrix of a linear system.
+        scaled_matrix - the elimination.ScaledMatrix parse_matrix returns for
+        the matrix if it was already read, or None.
+    Returns:
+        An elimination.EliminationResult holding the reduced row echelon form
+        with its pivot columns, or None if an entry is not a valid number.
+    '''
 
-            # Due to round-off errors, entries in the pivot_column
-            # above the corner row may not be exactly brought to 0. But 
-            # the operation above is known to bring all of these entries to
-            # 0. Other minor errors are less important, but a nonzero number
-            # where there should be a zero changes the pivot positions in
-            # columns, so they will manually be set to 0 to correct for these
-            # errors
+    # The matrix is read into rows of ints with one scale per row so that each
+    # entry equals exactly the number the user entered.
+    if scaled_matrix is None:
+        scaled_matrix = parse_matrix(matrix)
 
-            matrix_array[i, pivot_column] = 0
+    if scaled_matrix is None:
+        return None
 
-        current_row -= 1
+    if backend is None:
+        backend = backends.select_backend(
+            scaled_matrix,
+            output_decimal,
+            augmented
+        )
 
-    if output_decimal:
-        convert_fractions_to_decimal(matrix_array)
+    # Since reduced row echelon form is unique, every backend gives the same
+    # matrix.
+    reduced_result = backend.reduced_row_echelon_form(scaled_matrix)
 
-    rref_matrix = pd.DataFrame(
-        data = matrix_array
-        )
+    output_array(backend, reduced_result.matrix, output_decimal)
 
-    return rref_matrix
+    return reduced_result
 
-def inverse(matrix, output_decimal = False):
+def inverse(matrix, output_decimal = False, hybrid = True, backend = None,
+            factorization = None):
     '''
     This function is meant to calculate the inverse of a user-entered matrix.
     Args:
-        matrix: a pandas DataFrame holding the matrix of which the inverse 
+        matrix: a pandas DataFrame holding the matrix of which the inverse
         will be calculated.
         output_decimal: a boolean that is True if the inverse should be
         outputted decimals and False otherwise.
+        hybrid: a boolean that is True if an exact inverse should first be
+        tried by rounding a float64 inverse to fractions and checking it
+        exactly.
+        backend: the Backend object from backends.py the calculation is done
+        with. If it is None, one is chosen with backends.select_backend.
+        factorization: a Factorization of the matrix the exact inverse is kept
+        in, or None.
     Returns:
         a pandas DataFrame holding the inverse matrix for the inputted matrix
         or an error matrix.
@@ -503,132 +651,99 @@ def inverse(matrix, output_decimal = False):
     # Only square matrices will be passed into this function.
     dimension = matrix.shape[0]
 
-    # An augmented column to solve for the input values necessary to create
-    # each column of the identity matrix is added to the input matrix.
+    scaled_matrix = parsed_matrix(matrix, factorization)
 
-    for i in range(dimension):
+    if scaled_matrix is None:
+        return invalid_number_frame()
 
-        column_list = []
+    if backend is None:
+        backend = backends.select_backend(scaled_matrix, output_decimal)
 
-        for j in range(dimension):
-            
-            # In the identity matrix, each entry where the row is equal to the
-            # column is set to one. Other entries are set to 0. 
-            if j == i:
-                column_list.append(1)
-            
-            else:
-                column_list.append(0)
-
-        # The column of the identity matrix is append as an augmented column to
-        # the input matrix. Column titles do not matter as they will be changed
-        # and only are used for testing.
-        matrix["Identity " + str(i + 1)] = column_list
-
-    # Once the matrix is brought to reduced row echelon form, the 
-    # augmented columns should represent the input vectors that would bring
-    # their respective column of the input matrix to the same column number of
-    # the identity matrix. So the augmented columns in reduced row echelon form
-    # represent the inverse of the input matrix. 
-    rref_matrix = reduced_row_echelon_form(matrix)
-
-    # If there were any errors in reducing the matrix row reduced row echelon
-    # form an empty matrix with the error will be returned.
-
-    if rref_matrix.empty:
-        return rref_matrix
-    
-    # If the input matrix has any zero rows, it is not invertible, as because
-    # it has the same number of rows as columns, that would indicate that not
-    # every column has a pivot. So there would be a free variable meaning that
-    # multiple vectors would be transformed by the input matrix to the same
-    # vector -- an operation that cannot be undone.
-    # To check if a square matrix in reduced row echelon form has no zero rows,
-    # it is only necessary to check that it is the identity matrix, as square
-    # matrices with no free variables in reduced row echelon form must be the
-    # identity matrix.
-
-    for i in range(dimension):
-        # If each entry along the diagonal of the original matrix in 
-        # reduced row echelon form is one, it is invertible as explained in
-        # the column above. This checks that the matrix in reduced row echelon
-        # form is the identity matrix.
-        if rref_matrix.iat[i, i] != 1:
-            error_matrix = pd.DataFrame()
-
-            error_matrix["The matrix you entered is not invertible."] = []
-            
-            return  error_matrix
-        
-    inverse_matrix = pd.DataFrame()
+    # An exact inverse is kept in the factorization, which may already hold
+    # it if it was updated from the previous matrix. It is copied since
+    # converting it to decimals changes it in place.
+    if factorization is not None and not backend.outputs_decimal:
+        inverse_array = factorization.shared_result(
+            "exact inverse",
+            lambda: backend.inverse(scaled_matrix, hybrid),
+            cacheable = True
+        )
 
-    # The column names of rref_matrix are of the following form:
-    # 0, 1, 2, ..., dimension - 1, dimension, dimension + 1, ..., 2 * dimension
-    # - 1.
-    for i in range(dimension): 
-        # dimension + i starts at dimension and goes up to 2 * dimension - 1
-        # so every augmented column of rref matrix is added to inverse_matrix.
-        inverse_matrix["Column " + str(i + 1)] = \
-        rref_matrix[dimension + i]
+        if inverse_array is not None:
+            inverse_array = inverse_array.copy()
 
-    if output_decimal:
+    else:
+        inverse_array = backend.inverse(scaled_matrix, hybrid)
 
-        # inverse_matrix is converted from a DataFrame to a numpy array
-        # as convert_fractions_to_decimal assumes the input is a numpy array.
-        inverse_array = inverse_matrix.to_numpy()
+    # If a column of the input matrix has no pivot, it is not invertible, as
+    # because it has the same number of rows as columns, there would be a free
+    # variable meaning that multiple vectors would be transformed by the input
+    # matrix to the same vector -- an operation that cannot be undone. The
+    # backends stop factoring the matrix as soon as they find such a column.
+    if inverse_array is None:
+        error_matrix = pd.DataFrame()
 
-        convert_fractions_to_decimal(inverse_array)
-        
-        # inverse_array is converted back to a DataFrame and its data
-        # inverse_matrix is set assigned to the object created by the
-        # conversion.
-        inverse_matrix = pd.DataFrame(data = inverse_array)
+        error_matrix["The matrix you entered is not invertible."] = []
 
-    return inverse_matrix
+        return  error_matrix
 
+    return pd.DataFrame(
+        data = output_array(backend, inverse_array, output_decimal),
+        columns = ["Column " + str(i + 1) for i in range(dimension)]
+    )
 
-def determinant(matrix, output_decimal = False):
+def determinant(matrix, output_decimal = False, backend = None,
+                factorization = None):
     '''
     This function is meant to calculate the determinant of a user-entered
     matrix.
     Args:
-        matrix: a pandas DataFrame holding the matrix of which the determinant 
+        matrix: a pandas DataFrame holding the matrix of which the determinant
         will be calculated.
         output_decimal: a boolean that is True if the determinant should be
         outputted as a decimal and False otherwise.
+        backend: the Backend object from backends.py the calculation is done
+        with. If it is None, one is chosen with backends.select_backend.
+        factorization: a Factorization of the matrix the exact PLU
+        factorization the determinant is found from is kept in, or None.
     Returns:
         The determinant of the user-entered matrix.
     '''
 
-    ref_matrix = row_echelon_form(matrix)
-
-    # If the row echelon form function returns an error DataFrame because not
-    # all elements of the matrix can be converted to floats, this function
-    # also returns an empty DataFrame
-    if ref_matrix.empty:
-
-        # This function does not return a DataFrame so the error should be
-        # returned as a string.
-        return ref_matrix.columns[0]
-    
-    determinant = 1
-
-    # The absolute value of the determinant is equal to the product of the 
-    # elements in the diagonal once the matrix is reduced to row echelon form.
-    # This is because row operations where a multiple of one row is added to
-    # another do not change the determinant and switching two rows only changes
-    # the sign of the determinant. Doing cofactor expansion down the first
-    # column over and over leads to the product of the entries on the diagonal.
-    for i in range(ref_matrix.shape[0]):
-        determinant *= ref_matrix.iat[i, i]
-
-    # Each row swap changes the sign of the determinant so this is undone here.
-    determinant *= (-1) ** ref_matrix.row_swaps_from_original
-
-    if output_decimal:
+    scaled_matrix = parsed_matrix(matrix, factorization)
+
+    # If not every element of the matrix is a valid number, the error is
+    # returned as a string since this function does not return a DataFrame.
+    if scaled_matrix is None:
+        return "At least one of the entries in\
+        your matrix is not a valid number."
+
+    if backend is None:
+        backend = backends.select_backend(scaled_matrix, output_decimal)
+
+    # Row operations where a multiple of one row is added to another do not
+    # change the determinant and switching two rows only changes its sign.
+    # When there is a factorization, the determinant is found from an exact
+    # PLU factorization kept in it, since the factorization, unlike the
+    # determinant alone, can be updated when the user edits one entry. It may
+    # already hold it if it was updated from the previous matrix.
+    if factorization is not None and not backend.outputs_decimal:
+        determinant = factorization.shared_result(
+            "exact LU",
+            lambda: backend.LU_factorize(
+                scaled_matrix,
+                stop_when_singular = True
+            ),
+            cacheable = True
+        ).determinant()
+
+    else:
+        determinant = backend.determinant(scaled_matrix)
+
+    if output_decimal and not backend.outputs_decimal:
         determinant = Decimal(determinant.numerator) / \
             Decimal(determinant.denominator)
-    
+
     return determinant
 
 def file_generator_from_frame(input_frame):
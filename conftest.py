@@ -0,0 +1,9 @@
+'''
+This file lets pytest import the calculation modules at the top of the
+repository from the tests in the tests directory.
+'''
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,1180 @@
+'''
+This file contains the exact elimination engine used by the calculations
+in this project. Rather than doing row operations on numpy arrays of
+Fraction objects, which normalize every entry with a gcd after each
+operation, the engine works on rows of Python ints using fraction-free
+(Bareiss) elimination. Results are only converted back to Fractions by the
+functions that output them.
+'''
+
+import numpy as np
+
+from fractions import Fraction
+from math import gcd, lcm
+
+# An int64 matrix is only eliminated in int64 while the absolute value of
+# every entry left to eliminate is below this. Each new entry is the
+# difference of two products of such entries, so it stays below 2 ** 63.
+INT64_ENTRY_LIMIT = 2 ** 31
+
+# These are the rules elimination can choose each pivot with.
+# LARGEST_PIVOT picks the entry with the highest absolute value, which keeps
+# round-off errors small in floating point but does nothing for exact
+# arithmetic. SMALLEST_BITS_PIVOT picks the entry whose numerator and
+# denominator have the fewest bits, which keeps the entries of exact
+# elimination from growing. MARKOWITZ_PIVOT picks the entry whose row has the
+# fewest nonzero entries left, so that the fewest entries are changed, with
+# ties broken by bit size. FIRST_NONZERO_PIVOT keeps the corner entry unless
+# it is 0, so rows are only swapped when elimination cannot go on without it.
+# The app uses DEFAULT_PIVOT_RULE, and FIRST_NONZERO_PIVOT for LU
+# factorization. LARGEST_PIVOT and MARKOWITZ_PIVOT are only used when they
+# are passed to an exact backend, such as to compare the rules.
+LARGEST_PIVOT = "largest"
+SMALLEST_BITS_PIVOT = "smallest bits"
+MARKOWITZ_PIVOT = "markowitz"
+FIRST_NONZERO_PIVOT = "first nonzero"
+
+# This is the rule exact elimination uses when none is given.
+DEFAULT_PIVOT_RULE = SMALLEST_BITS_PIVOT
+
+def fractions_to_integer_rows(fraction_array):
+    '''
+    This function converts a matrix of Fractions to a matrix of ints by
+    multiplying each row by the least common multiple of the denominators in
+    that row.
+    Args:
+        fraction_array: a 2d numpy array (or 2d list) of Fractions.
+    Returns:
+        a tuple whose first item is a list of rows that are lists of ints and
+        whose second item is a list holding the int each row was multiplied by.
+    '''
+
+    integer_rows = []
+    row_scales = []
+
+    for row in fraction_array:
+
+        # Multiplying the row by the lcm of its denominators clears every
+        # denominator in the row while keeping the numbers as small as
+        # possible.
+        row_scale = lcm(*[entry.denominator for entry in row])
+
+        integer_rows.append(
+            [entry.numerator * (row_scale // entry.denominator)
+             for entry in row]
+        )
+
+        row_scales.append(row_scale)
+
+    return integer_rows, row_scales
+
+def pivot_offset(column_entries, row_scales, pivot_rule,
+                 nonzero_counts = None):
+    '''
+    This function chooses the pivot in the corner column of a matrix of ints
+    being eliminated.
+    Args:
+        column_entries: a list of the ints in the corner column from the
+        corner row down.
+        row_scales: a list of the positive ints the rows those entries are in
+        are divided by.
+        pivot_rule: LARGEST_PIVOT, SMALLEST_BITS_PIVOT, MARKOWITZ_PIVOT or
+        FIRST_NONZERO_PIVOT.
+        nonzero_counts: a list of the number of nonzero entries in each of the
+        rows from the corner column on. It is only needed for
+        MARKOWITZ_PIVOT.
+    Returns:
+        an int that is how many rows below the corner row the pivot row is,
+        or None if every entry is 0. Ties go to the highest row, so the corner
+        row is never swapped for an equally good row.
+    '''
+
+    best_offset = None
+    best_key = None
+
+    for offset, (entry, row_scale) in enumerate(
+        zip(column_entries, row_scales)
+    ):
+
+        if entry == 0:
+            continue
+
+        if pivot_rule == FIRST_NONZERO_PIVOT:
+            return offset
+
+        # Entries are compared after dividing by the row scale. This is done
+        # by cross multiplying so that no fractions are created.
+        if pivot_rule == LARGEST_PIVOT:
+            if best_offset is None or abs(entry) * \
+                row_scales[best_offset] > \
+                abs(column_entries[best_offset]) * row_scale:
+                best_offset = offset
+
+            continue
+
+        key = abs(entry).bit_length() + row_scale.bit_length()
+
+        if pivot_rule == MARKOWITZ_PIVOT:
+            key = (nonzero_counts[offset], key)
+
+        if best_offset is None or key < best_key:
+            best_offset = offset
+            best_key = key
+
+    return best_offset
+
+def eliminate_pivot_column(matrix_array, pivot_row, pivot_column, rows,
+                           keep_multipliers = False):
+    '''
+    This function is the elimination step shared by row echelon form, reduced
+    row echelon form and LU factorization on numpy arrays of numbers. It
+    brings the entries of the pivot column in the given rows to zero by
+    subtracting a multiple of the pivot row from each of them. Every entry
+    of the pivot row left of the pivot is zero, so only the columns right of
+    the pivot column are updated, and they are updated at once as an outer
+    product. Rows whose entry in the pivot column is already zero are
+    skipped, since their multiple is zero.
+    Args:
+        matrix_array: a 2d numpy array. This array is modified in place.
+        pivot_row: an int that is the index of the pivot row.
+        pivot_column: an int that is the index of the pivot column.
+        rows: a range of the indexes of the rows to eliminate from.
+        keep_multipliers: a boolean that is True if each eliminated entry
+        should be replaced by the ratio it was eliminated with, as LU
+        factorization needs, and False if it should be set to zero.
+    '''
+
+    rows = np.array(rows, dtype = np.intp)
+
+    rows = rows[matrix_array[rows, pivot_column] != 0]
+
+    if rows.size == 0:
+        return
+
+    ratios = matrix_array[rows, pivot_column] / \
+        matrix_array[pivot_row, pivot_column]
+
+    trailing_columns = np.arange(pivot_column + 1, matrix_array.shape[1])
+
+    matrix_array[np.ix_(rows, trailing_columns)] -= np.outer(
+        ratios,
+        matrix_array[pivot_row, pivot_column + 1:]
+    )
+
+    matrix_array[rows, pivot_column] = ratios if keep_multipliers else \
+        ratios * 0
+
+class ScaledMatrix:
+    '''
+    This class holds a matrix of rational numbers as rows of ints, each with
+    one row scale that every entry in the row is divided by. This takes a
+    fraction of the memory of a numpy array of Fractions, since each entry is
+    a single int rather than a Fraction object holding two, and row operations
+    on it are int operations that never need a gcd. A matrix of ints read
+    from int columns is held as an int64 numpy array instead, so no Python
+    object is created for each entry.
+    '''
+
+    def __init__(self, rows, row_scales):
+        '''
+        Args:
+            rows: a list of rows that are lists of ints, or a 2d numpy int64
+            array.
+            row_scales: a list holding the positive int each row is divided by.
+        '''
+        self.rows = rows
+        self.row_scales = row_scales
+        self.shape = (len(rows), len(rows[0]) if len(rows) > 0 else 0)
+
+    def integer_rows(self):
+        '''
+        This method copies the matrix for functions that modify rows of ints in
+        place.
+        Returns:
+            a tuple whose first item is a copy of the rows and whose second
+            item is a copy of the row scales.
+        '''
+
+        if isinstance(self.rows, np.ndarray):
+            return self.rows.tolist(), self.row_scales.copy()
+
+        return [row.copy() for row in self.rows], self.row_scales.copy()
+
+    def int64_array(self):
+        '''
+        This method copies the matrix for int64 elimination.
+        Returns:
+            a 2d numpy int64 array holding the matrix, or None if a row scale
+            is not 1 or an entry does not fit in int64.
+        '''
+
+        if any(row_scale != 1 for row_scale in self.row_scales):
+            return None
+
+        # One bit is left free so that the absolute value of every entry
+        # fits too.
+        if self.entry_bits() >= 63:
+            return None
+
+        if isinstance(self.rows, np.ndarray):
+            return self.rows.copy()
+
+        return np.array(self.rows, dtype = np.int64).reshape(self.shape)
+
+    def with_identity(self):
+        '''
+        This method puts the identity matrix to the right of the matrix. Each
+        row of the identity matrix is multiplied by the row scale of the row
+        it is next to so that they share one scale.
+        Returns:
+            a ScaledMatrix holding the matrix next to the identity matrix.
+        '''
+
+        integer_rows, row_scales = self.integer_rows()
+
+        row_count = self.shape[0]
+
+        return ScaledMatrix(
+            [row + [row_scale if j == i else 0 for j in range(row_count)]
+             for i, (row, row_scale) in enumerate(zip(integer_rows,
+                                                      row_scales))],
+            row_scales
+        )
+
+    def column_range(self, start, stop):
+        '''
+        This method takes some of the columns of the matrix, such as the
+        coefficient part of an augmented matrix.
+        Args:
+            start: an int that is the index of the first column taken.
+            stop: an int that is the index after the last column taken.
+        Returns:
+            a ScaledMatrix holding the columns. Each row and its scale are
+            divided by their greatest common divisor, so the columns are held
+            the same way as if they had been read on their own.
+        '''
+
+        if isinstance(self.rows, np.ndarray):
+            rows = self.rows[:, start:stop]
+
+            # A row scale of 1 has no divisor to share with the row.
+            if all(row_scale == 1 for row_scale in self.row_scales):
+                return ScaledMatrix(rows, self.row_scales.copy())
+
+            divisors = np.gcd(np.gcd.reduce(rows, axis = 1),
+                              np.array(self.row_scales, dtype = np.int64))
+
+            return ScaledMatrix(
+                rows // divisors[:, np.newaxis],
+                [row_scale // int(divisor) for row_scale, divisor in
+                 zip(self.row_scales, divisors)]
+            )
+
+        rows = []
+        row_scales = []
+
+        for row, row_scale in zip(self.rows, self.row_scales):
+            row = row[start:stop]
+
+            divisor = gcd(row_scale, *row)
+
+            if divisor != 1:
+                row = [entry // divisor for entry in row]
+                row_scale //= divisor
+
+            rows.append(row)
+            row_scales.append(row_scale)
+
+        return ScaledMatrix(rows, row_scales)
+
+    def fraction_array(self):
+        '''
+        Returns:
+            a 2d numpy object array of Fractions holding the matrix.
+        '''
+
+        return np.array(
+            [[Fraction(entry, row_scale) for entry in row]
+             for row, row_scale in zip(self.integer_rows()[0],
+                                       self.row_scales)],
+            dtype = object
+        ).reshape(self.shape)
+
+    def float_array(self):
+        '''
+        Returns:
+            a 2d numpy array of float64 holding the matrix. Dividing two ints
+            rounds correctly, so each float is the closest float64 to the
+            entry.
+        '''
+
+        if isinstance(self.rows, np.ndarray):
+            return self.rows / np.array(self.row_scales)[:, np.newaxis]
+
+        return np.array(
+            [[entry / row_scale for entry in row]
+             for row, row_scale in zip(self.rows, self.row_scales)],
+            dtype = np.float64
+        ).reshape(self.shape)
+
+    def entry_bits(self):
+        '''
+        Returns:
+            an int that is the bit length of the largest int held, either an
+            entry or a row scale.
+        '''
+
+        if isinstance(self.rows, np.ndarray):
+            largest_entry = max(int(self.rows.max()), -int(self.rows.min()))
+
+        else:
+            largest_entry = max(abs(entry) for row in self.rows
+                                for entry in row)
+
+        return max(
+            largest_entry.bit_length(),
+            max(row_scale.bit_length() for row_scale in self.row_scales)
+        )
+
+class EliminationResult:
+    '''
+    This class holds a matrix brought to row echelon form or reduced row
+    echelon form along with what was learned about it during elimination, so
+    that the functions using it do not have to search the matrix again for its
+    pivots and zero rows.
+    '''
+
+    def __init__(self, matrix, pivot_columns, row_permutation = None,
+                 row_swaps = None):
+        '''
+        Args:
+            matrix: a 2d numpy object array holding the eliminated matrix.
+            pivot_columns: a list of the column index of the pivot in each
+            nonzero row. The nonzero rows are the first rows of the matrix.
+            row_permutation: a list holding, for each row of the eliminated
+            matrix, the index of the row of the input matrix it started as,
+            or None if the elimination did not keep track of it.
+            row_swaps: the number of row swaps performed, or None if the
+            elimination did not keep track of it.
+        '''
+        self.matrix = matrix
+        self.pivot_columns = pivot_columns
+        self.rank = len(pivot_columns)
+        self.row_permutation = row_permutation
+        self.row_swaps = row_swaps
+
+        # When the matrix is the augmented matrix of a linear system, the
+        # system is inconsistent if and only if the constant column holds a
+        # pivot, since that row says 0 equals a nonzero number.
+        self.inconsistent = self.rank > 0 and \
+            pivot_columns[-1] == matrix.shape[1] - 1
+
+class PLUFactorization:
+    '''
+    This class holds a PLU factorization of a matrix A, where A = PLU, P is a
+    permutation matrix, L is lower triangular with ones on its diagonal and U
+    is in row echelon form. L and U are packed into one array. Each entry of L
+    below the diagonal is held in the same row as it is in L, in the pivot
+    column of the step of elimination it was found in, which is always 0 in
+    U. Only the row order of P is held. The full matrices are only made when
+    they are displayed.
+    '''
+
+    def __init__(self, packed_array, row_permutation, pivot_columns,
+                 row_swaps):
+        '''
+        Args:
+            packed_array: a 2d numpy array holding L and U packed together.
+            row_permutation: a list holding, for each row of LU, the index of
+            the row of A it equals.
+            pivot_columns: a list of the column index of the pivot in each
+            nonzero row of U.
+            row_swaps: the number of row swaps performed.
+        '''
+        self.packed_array = packed_array
+        self.row_permutation = row_permutation
+        self.pivot_columns = pivot_columns
+        self.rank = len(pivot_columns)
+        self.row_swaps = row_swaps
+
+    def identity_array(self, size):
+        '''
+        Args:
+            size: an int that is the number of rows of the identity matrix.
+        Returns:
+            a 2d numpy array holding the identity matrix with entries of the
+            same type as the packed array.
+        '''
+
+        number_type = type(self.packed_array.flat[0])
+
+        return np.array(
+            [[number_type(int(i == j)) for j in range(size)]
+             for i in range(size)],
+            dtype = self.packed_array.dtype
+        )
+
+    def L_array(self):
+        '''
+        Returns:
+            a 2d numpy array holding L.
+        '''
+
+        L_array = self.identity_array(self.packed_array.shape[0])
+
+        for k, pivot_column in enumerate(self.pivot_columns):
+            L_array[k + 1:, k] = self.packed_array[k + 1:, pivot_column]
+
+        return L_array
+
+    def U_array(self):
+        '''
+        Returns:
+            a 2d numpy array holding U.
+        '''
+
+        U_array = self.packed_array.copy()
+
+        zero = self.identity_array(2)[0, 1]
+
+        for k, pivot_column in enumerate(self.pivot_columns):
+            U_array[k + 1:, pivot_column] = zero
+
+        return U_array
+
+    def P_array(self):
+        '''
+        Returns:
+            a 2d numpy array holding P. Row i of LU is row
+            row_permutation[i] of A, so column i of P is column
+            row_permutation[i] of the identity matrix.
+        '''
+
+        return self.identity_array(
+            self.packed_array.shape[0]
+        )[:, self.row_permutation]
+
+    def inverse(self):
+        '''
+        This method finds the inverse of a square matrix from its
+        factorization. Since A = PLU, the inverse is U^-1 L^-1 P^-1. L^-1 P^-1
+        is found by forward substitution on the rows of the identity matrix
+        in the order of LU, and then U^-1 times it by back substitution.
+        Returns:
+            a 2d numpy array holding the inverse, or None if the matrix is not
+            square or not every column holds a pivot.
+        '''
+
+        row_count, column_count = self.packed_array.shape
+
+        if row_count != column_count or self.rank != row_count:
+            return None
+
+        # P^-1 moves each row of A to the row it is in LU.
+        solution_array = self.identity_array(row_count)[self.row_permutation]
+
+        # Forward substitution with L, which has ones on its diagonal. The
+        # entries of L below the diagonal in column k are held below the
+        # pivot in column k, since every column holds a pivot.
+        for k in range(row_count - 1):
+            solution_array[k + 1:] -= np.outer(
+                self.packed_array[k + 1:, k],
+                solution_array[k]
+            )
+
+        # Back substitution with U, from the last row up.
+        for k in range(row_count - 1, -1, -1):
+            if k + 1 < row_count:
+                solution_array[k] -= self.packed_array[k, k + 1:].dot(
+                    solution_array[k + 1:]
+                )
+
+            solution_array[k] /= self.packed_array[k, k]
+
+        return solution_array
+
+    def determinant(self):
+        '''
+        This method finds the determinant of a square matrix from its
+        factorization. The determinant of L is 1, the determinant of U is the
+        product of its diagonal, and the determinant of P is 1 or -1 depending
+        on whether the number of row swaps is even or odd.
+        Returns:
+            the determinant, which is 0 if not every column holds a pivot.
+        '''
+
+        if self.rank != self.packed_array.shape[0]:
+            return self.identity_array(2)[0, 1]
+
+        determinant = self.identity_array(1)[0, 0]
+
+        for k in range(self.rank):
+            determinant *= self.packed_array[k, k]
+
+        return determinant * (-1) ** self.row_swaps
+
+    def rank_one_update(self, row_index, column_index, delta):
+        '''
+        This method finds the factorization of the matrix with delta added to
+        one of its entries, without eliminating again. Adding delta to entry
+        (i, j) of A adds x y^T to LU, where x is delta times the unit vector of
+        the row of LU that is row i of A and y is the unit vector of column j.
+        Splitting off the first row and column, LU + x y^T has the pivot u +
+        x_1 y_1, so the first row of U and the first column of L can be
+        updated directly, and what is left is the factorization of the rest
+        plus another rank one matrix x' y'^T with x' = x_2 - x_1 l and
+        y' = (u y_2 - y_1 r) / (u + x_1 y_1), where u, l and r are the old
+        pivot, column of L and row of U. Repeating this for each pivot keeps
+        P, and takes a number of steps proportional to the number of entries.
+        This is Bennett's algorithm.
+        Args:
+            row_index: an int that is the index of the row of A of the entry.
+            column_index: an int that is the index of the column of A of the
+            entry.
+            delta: the number added to the entry, of the same type as the
+            entries of the packed array.
+        Returns:
+            a new PLUFactorization of the changed matrix, or None if the
+            matrix is not square, this factorization does not have a pivot in
+            every column, or a pivot of the changed matrix would be 0, in which
+            case it would need other row swaps.
+        '''
+
+        dimension, column_count = self.packed_array.shape
+
+        if dimension != column_count or self.rank != dimension:
+            return None
+
+        identity_array = self.identity_array(dimension)
+
+        packed_array = self.packed_array.copy()
+
+        x = identity_array[self.row_permutation.index(row_index)] * delta
+        y = identity_array[column_index].copy()
+
+        for k in range(dimension):
+
+            # A step where both vectors are 0 leaves everything as it is.
+            if x[k] == 0 and y[k] == 0:
+                continue
+
+            pivot = packed_array[k, k]
+
+            new_pivot = pivot + x[k] * y[k]
+
+            if new_pivot == 0:
+                return None
+
+            upper_row = packed_array[k, k + 1:].copy()
+            lower_column = packed_array[k + 1:, k].copy()
+
+            packed_array[k, k] = new_pivot
+
+            packed_array[k, k + 1:] = upper_row + x[k] * y[k + 1:]
+
+            packed_array[k + 1:, k] = \
+                (lower_column * pivot + x[k + 1:] * y[k]) / new_pivot
+
+            x[k + 1:] = x[k + 1:] - x[k] * lower_column
+
+            y[k + 1:] = (pivot * y[k + 1:] - y[k] * upper_row) / new_pivot
+
+        return PLUFactorization(
+            packed_array,
+            list(self.row_permutation),
+            list(self.pivot_columns),
+            self.row_swaps
+        )
+
+def fraction_free_eliminate(integer_rows, row_scales, reduce_above = False,
+                            pivot_rule = None, keep_multipliers = False,
+                            stop_when_singular = False):
+    '''
+    This function performs Bareiss fraction-free elimination on a matrix of
+    ints. Every entry produced is a minor of the input matrix, so each
+    division done is exact and no fractions are ever created.
+    Args:
+        integer_rows: a list of rows that are lists of ints. This list is
+        modified in place.
+        row_scales: a list holding the int each row of the original matrix was
+        multiplied by to make it a matrix of ints. It is swapped along with
+        integer_rows so that pivots are chosen the same way they would be for
+        the original matrix.
+        reduce_above: a boolean that is True if entries above each pivot
+        should also be eliminated (Gauss-Jordan elimination) and False if only
+        entries below each pivot should be.
+        pivot_rule: the rule pivots are chosen with. If it is None,
+        DEFAULT_PIVOT_RULE is used.
+        keep_multipliers: a boolean that is True if each entry eliminated
+        below a pivot should be kept in its place rather than set to 0, as
+        LU factorization needs. It moves with its row when rows are swapped.
+        stop_when_singular: a boolean that is True if elimination should
+        stop at the first column without a pivot, which proves that a square
+        matrix is singular.
+    Returns:
+        a dictionary with the following keys:
+            "rows": the eliminated rows.
+            "row_scales": the row scales in the order of the eliminated rows.
+            "pivot_columns": a list of the column index of the pivot in each
+            nonzero row.
+            "divisors": a list holding, for each pivot row, the pivot that was
+            used before that row became a pivot row. Dividing a pivot row in
+            row echelon form by its divisor and its row scale gives the row
+            ordinary Gaussian elimination would have produced.
+            "row_swaps": the number of row swaps performed.
+            "row_permutation": a list holding, for each eliminated row, the
+            index of the row of the input matrix it started as.
+    '''
+
+    if pivot_rule is None:
+        pivot_rule = DEFAULT_PIVOT_RULE
+
+    row_count = len(integer_rows)
+    column_count = len(integer_rows[0]) if row_count > 0 else 0
+
+    pivot_columns = []
+    divisors = []
+
+    total_row_swaps = 0
+
+    row_permutation = list(range(row_count))
+
+    # previous_pivot is the pivot used in the previous step of elimination.
+    # Every row update is divided by it, which is what keeps the entries from
+    # growing the way they would with plain cross multiplication.
+    previous_pivot = 1
+
+    corner_row = 0
+    corner_column = 0
+
+    while corner_row < row_count and corner_column < column_count:
+
+        # Each row holds its entries multiplied by the same divisor and its
+        # own row scale, so the divisor does not change which entry is chosen
+        # as the pivot.
+        nonzero_counts = None
+
+        if pivot_rule == MARKOWITZ_PIVOT:
+            nonzero_counts = [
+                sum(1 for entry in integer_rows[i][corner_column:]
+                    if entry != 0)
+                for i in range(corner_row, row_count)
+            ]
+
+        offset = pivot_offset(
+            [integer_rows[i][corner_column] for i in
+             range(corner_row, row_count)],
+            row_scales[corner_row:],
+            pivot_rule,
+            nonzero_counts
+        )
+
+        # If every entry is 0, this is a zero column so the corner is moved
+        # one to the right.
+        if offset is None:
+            if stop_when_singular:
+                break
+
+            corner_column += 1
+            continue
+
+        max_row = corner_row + offset
+
+        if max_row != corner_row:
+            total_row_swaps += 1
+
+            integer_rows[max_row], integer_rows[corner_row] = \
+                integer_rows[corner_row], integer_rows[max_row]
+
+            row_scales[max_row], row_scales[corner_row] = \
+                row_scales[corner_row], row_scales[max_row]
+
+            row_permutation[max_row], row_permutation[corner_row] = \
+                row_permutation[corner_row], row_permutation[max_row]
+
+        pivot_row = integer_rows[corner_row]
+        pivot = pivot_row[corner_column]
+
+        pivot_columns.append(corner_column)
+        divisors.append(previous_pivot)
+
+        # Rows below the corner row have zeros to the left of the corner
+        # column, so only the entries from the corner column on are updated.
+        for i in range(corner_row + 1, row_count):
+
+            row = integer_rows[i]
+            ratio_numerator = row[corner_column]
+
+            # The new row is (pivot * row - entry * pivot_row) / previous_pivot
+            # which always divides exactly.
+            row[corner_column:] = [
+                (pivot * entry - ratio_numerator * pivot_entry) \
+                    // previous_pivot
+                for entry, pivot_entry in zip(
+                    row[corner_column:],
+                    pivot_row[corner_column:]
+                )
+            ]
+
+            if keep_multipliers:
+                row[corner_column] = ratio_numerator
+
+        # For Gauss-Jordan elimination, rows above the corner row are updated
+        # the same way. These rows can have nonzero entries anywhere, so the
+        # whole row is updated.
+        if reduce_above:
+            for i in range(0, corner_row):
+
+                row = integer_rows[i]
+                ratio_numerator = row[corner_column]
+
+                integer_rows[i] = [
+                    (pivot * entry - ratio_numerator * pivot_entry) \
+                        // previous_pivot
+                    for entry, pivot_entry in zip(row, pivot_row)
+                ]
+
+        previous_pivot = pivot
+
+        corner_row += 1
+        corner_column += 1
+
+    return {
+        "rows": integer_rows,
+        "row_scales": row_scales,
+        "pivot_columns": pivot_columns,
+        "divisors": divisors,
+        "row_swaps": total_row_swaps,
+        "row_permutation": row_permutation
+    }
+
+def echelon_rows_to_fractions(elimination):
+    '''
+    This function converts the rows from a forward fraction-free elimination
+    into the row echelon form Gaussian elimination would produce.
+    Args:
+        elimination: the dictionary returned by fraction_free_eliminate when
+        reduce_above is False.
+    Returns:
+        a list of rows that are lists of Fractions.
+    '''
+
+    fraction_rows = []
+
+    for i, row in enumerate(elimination["rows"]):
+
+        # Rows after the last pivot row hold only zeros, so their divisor
+        # does not matter.
+        if i < len(elimination["divisors"]):
+            row_divisor = elimination["divisors"][i] * \
+                elimination["row_scales"][i]
+
+        else:
+            row_divisor = 1
+
+        fraction_rows.append([Fraction(entry, row_divisor) for entry in row])
+
+    return fraction_rows
+
+def reduced_rows_to_fractions(elimination):
+    '''
+    This function converts the rows from a fraction-free Gauss-Jordan
+    elimination into reduced row echelon form.
+    Args:
+        elimination: the dictionary returned by fraction_free_eliminate when
+        reduce_above is True.
+    Returns:
+        a list of rows that are lists of Fractions.
+    '''
+
+    pivot_columns = elimination["pivot_columns"]
+
+    fraction_rows = []
+
+    for i, row in enumerate(elimination["rows"]):
+
+        # After fraction-free Gauss-Jordan elimination every pivot holds the
+        # same number, so dividing a pivot row by its own pivot gives the row
+        # in reduced row echelon form.
+        if i < len(pivot_columns):
+            row_divisor = row[pivot_columns[i]]
+
+        else:
+            row_divisor = 1
+
+        fraction_rows.append([Fraction(entry, row_divisor) for entry in row])
+
+    return fraction_rows
+
+def free_column_order(reduced_rows, pivot_columns, column_count):
+    '''
+    This function orders the free columns of a matrix in reduced row echelon
+    form the way they are met when the rows are read from top to bottom, so
+    that solution sets and null space bases list their vectors in the same
+    order they always have.
+    Args:
+        reduced_rows: a 2d numpy array or list of lists holding the nonzero
+        rows of the reduced row echelon form.
+        pivot_columns: a list holding the pivot column of each row.
+        column_count: an int that is the number of columns that hold
+        variables, which excludes the constant column of an augmented matrix.
+    Returns:
+        a list of the free columns.
+    '''
+
+    free_columns = []
+
+    previous_pivot = -1
+
+    for i, pivot_column in enumerate(pivot_columns):
+
+        # Every column between the previous pivot and this one is met before
+        # this row's pivot, so it comes first unless an earlier row already
+        # depended on it.
+        for j in range(previous_pivot + 1, pivot_column):
+            if j not in free_columns:
+                free_columns.append(j)
+
+        # Then the free columns this row depends on are met to the right of
+        # its pivot. A free column can only have a nonzero to the right of the
+        # pivot, since every other pivot column is zero in this row.
+        for j in range(pivot_column + 1, column_count):
+            if reduced_rows[i][j] != 0 and j not in free_columns and \
+                j not in pivot_columns:
+                free_columns.append(j)
+
+        previous_pivot = pivot_column
+
+    # The columns after the last pivot that no row depended on are free as
+    # well.
+    for j in range(previous_pivot + 1, column_count):
+        if j not in free_columns:
+            free_columns.append(j)
+
+    return free_columns
+
+def fraction_free_determinant(integer_rows, row_scales, pivot_rule = None):
+    '''
+    This function calculates the determinant of a square matrix using
+    fraction-free elimination.
+    Args:
+        integer_rows: a list of rows that are lists of ints. This list is
+        modified in place.
+        row_scales: a list holding the int each row of the original matrix was
+        multiplied by to make it a matrix of ints.
+        pivot_rule: the rule pivots are chosen with. If it is None,
+        DEFAULT_PIVOT_RULE is used.
+    Returns:
+        a Fraction holding the determinant of the original matrix.
+    '''
+
+    # The scales are multiplied together before elimination since
+    # elimination reorders them.
+    total_scale = 1
+
+    for row_scale in row_scales:
+        total_scale *= row_scale
+
+    elimination = fraction_free_eliminate(
+        integer_rows,
+        row_scales,
+        pivot_rule = pivot_rule
+    )
+
+    # If any column has no pivot, the matrix is not invertible.
+    if len(elimination["pivot_columns"]) < len(integer_rows):
+        return Fraction(0)
+
+    # The last pivot of Bareiss elimination on a square matrix is the
+    # determinant of the rows it was given. Each row swap changes the sign
+    # and each row was multiplied by its row scale, so both are undone here.
+    last_pivot = integer_rows[-1][-1]
+
+    return Fraction(
+        last_pivot * (-1) ** elimination["row_swaps"],
+        total_scale
+    )
+
+def fraction_free_PLU(integer_rows, row_scales, stop_when_singular = False):
+    '''
+    This function finds the PLU factorization of a matrix using fraction-free
+    elimination. Rows are only swapped when a pivot would be 0, so P is the
+    identity matrix whenever the matrix has an LU factorization.
+    Args:
+        integer_rows: a list of rows that are lists of ints. This list is
+        modified in place.
+        row_scales: a list holding the int each row of the original matrix was
+        multiplied by to make it a matrix of ints.
+        stop_when_singular: a boolean that is True if elimination should
+        stop at the first column without a pivot. The factorization is then
+        incomplete, and only its rank is meaningful.
+    Returns:
+        a PLUFactorization whose packed array holds Fractions.
+    '''
+
+    return packed_factorization(
+        fraction_free_eliminate(
+            integer_rows,
+            row_scales,
+            pivot_rule = FIRST_NONZERO_PIVOT,
+            keep_multipliers = True,
+            stop_when_singular = stop_when_singular
+        )
+    )
+
+def packed_factorization(elimination):
+    '''
+    This function converts a fraction-free elimination that kept its
+    multipliers into a PLU factorization.
+    Args:
+        elimination: the dictionary returned by fraction_free_eliminate or
+        int64_fraction_free_eliminate with keep_multipliers set to True.
+    Returns:
+        a PLUFactorization whose packed array holds Fractions.
+    '''
+
+    integer_rows = elimination["rows"]
+    row_scales = elimination["row_scales"]
+    pivot_columns = elimination["pivot_columns"]
+
+    packed_array = np.array(
+        echelon_rows_to_fractions(elimination),
+        dtype = object
+    ).reshape(len(integer_rows), len(integer_rows[0]))
+
+    # The entry of L below each pivot is the entry that was eliminated divided
+    # by the pivot. Both hold the same divisor, so it cancels, and each holds
+    # its own row scale, so the row scales are divided out.
+    for k, pivot_column in enumerate(pivot_columns):
+
+        pivot = integer_rows[k][pivot_column]
+
+        for i in range(k + 1, len(integer_rows)):
+            packed_array[i, pivot_column] = Fraction(
+                integer_rows[i][pivot_column] * row_scales[k],
+                pivot * row_scales[i]
+            )
+
+    return PLUFactorization(
+        packed_array,
+        elimination["row_permutation"],
+        pivot_columns,
+        elimination["row_swaps"]
+    )
+
+def int64_fraction_free_eliminate(integer_array, pivot_rule = None,
+                                  keep_multipliers = False,
+                                  stop_when_singular = False):
+    '''
+    This function performs the same fraction-free elimination as
+    fraction_free_eliminate on a matrix of ints held in an int64 numpy array,
+    updating every row below each pivot at once. Before each step, the
+    largest entry left to eliminate is checked against INT64_ENTRY_LIMIT. If
+    the step could overflow int64, the array is promoted to a numpy object
+    array of Python ints, which cannot overflow, and elimination continues.
+    Args:
+        integer_array: a 2d numpy int64 array. This array is modified in
+        place until it is promoted.
+        pivot_rule: the rule pivots are chosen with. If it is None,
+        DEFAULT_PIVOT_RULE is used.
+        keep_multipliers: a boolean that is True if each entry eliminated
+        below a pivot should be kept in its place rather than set to 0, as
+        LU factorization needs.
+        stop_when_singular: a boolean that is True if elimination should
+        stop at the first column without a pivot, which proves that a square
+        matrix is singular.
+    Returns:
+        the dictionary returned by fraction_free_eliminate with every row
+        scale 1.
+    '''
+
+    if pivot_rule is None:
+        pivot_rule = DEFAULT_PIVOT_RULE
+
+    row_count, column_count = integer_array.shape
+
+    pivot_columns = []
+    divisors = []
+
+    total_row_swaps = 0
+
+    row_permutation = list(range(row_count))
+
+    previous_pivot = 1
+
+    corner_row = 0
+    corner_column = 0
+
+    while corner_row < row_count and corner_column < column_count:
+
+        corner_entries = integer_array[corner_row:, corner_column]
+
+        # If every entry is 0, this is a zero column so the corner is moved
+        # one to the right.
+        if not corner_entries.any():
+            if stop_when_singular:
+                break
+
+            corner_column += 1
+            continue
+
+        nonzero_counts = None
+
+        if pivot_rule == MARKOWITZ_PIVOT:
+            nonzero_counts = np.count_nonzero(
+                integer_array[corner_row:, corner_column:],
+                axis = 1
+            ).tolist()
+
+        # The pivot is chosen the same way fraction_free_eliminate chooses
+        # it.
+        max_row = corner_row + pivot_offset(
+            corner_entries.tolist(),
+            [1] * (row_count - corner_row),
+            pivot_rule,
+            nonzero_counts
+        )
+
+        if max_row != corner_row:
+            total_row_swaps += 1
+
+            integer_array[[corner_row, max_row]] = \
+                integer_array[[max_row, corner_row]]
+
+            row_permutation[max_row], row_permutation[corner_row] = \
+                row_permutation[corner_row], row_permutation[max_row]
+
+        if integer_array.dtype != object and np.abs(
+            integer_array[corner_row:, corner_column:]
+        ).max() >= INT64_ENTRY_LIMIT:
+            integer_array = integer_array.astype(object)
+
+        pivot = int(integer_array[corner_row, corner_column])
+
+        ratio_numerators = integer_array[corner_row + 1:, corner_column].copy()
+
+        pivot_columns.append(corner_column)
+        divisors.append(previous_pivot)
+
+        # Each row below the corner row becomes
+        # (pivot * row - entry * pivot_row) / previous_pivot, which always
+        # divides exactly.
+        integer_array[corner_row + 1:, corner_column:] = (
+            pivot * integer_array[corner_row + 1:, corner_column:] - \
+            np.outer(
+                ratio_numerators,
+                integer_array[corner_row, corner_column:]
+            )
+        ) // previous_pivot
+
+        if keep_multipliers:
+            integer_array[corner_row + 1:, corner_column] = ratio_numerators
+
+        previous_pivot = pivot
+
+        corner_row += 1
+        corner_column += 1
+
+    return {
+        "rows": integer_array.tolist(),
+        "row_scales": [1] * row_count,
+        "pivot_columns": pivot_columns,
+        "divisors": divisors,
+        "row_swaps": total_row_swaps,
+        "row_permutation": row_permutation
+    }
+
+def int64_determinant(integer_array, pivot_rule = None):
+    '''
+    This function calculates the determinant of a square matrix of ints held
+    in an int64 numpy array using int64_fraction_free_eliminate.
+    Args:
+        integer_array: a 2d numpy int64 array. This array may be modified.
+        pivot_rule: the rule pivots are chosen with. If it is None,
+        DEFAULT_PIVOT_RULE is used.
+    Returns:
+        a Fraction holding the determinant.
+    '''
+
+    elimination = int64_fraction_free_eliminate(
+        integer_array,
+        pivot_rule = pivot_rule
+    )
+
+    if len(elimination["pivot_columns"]) < integer_array.shape[0]:
+        return Fraction(0)
+
+    return Fraction(
+        elimination["rows"][-1][-1] * (-1) ** elimination["row_swaps"]
+    )
+
+def int64_PLU(integer_array, stop_when_singular = False):
+    '''
+    This function finds the PLU factorization of a matrix of ints held in an
+    int64 numpy array using int64_fraction_free_eliminate. Rows are only
+    swapped when a pivot would be 0.
+    Args:
+        integer_array: a 2d numpy int64 array. This array may be modified.
+        stop_when_singular: a boolean that is True if elimination should
+        stop at the first column without a pivot. The factorization is then
+        incomplete, and only its rank is meaningful.
+    Returns:
+        a PLUFactorization whose packed array holds Fractions.
+    '''
+
+    return packed_factorization(
+        int64_fraction_free_eliminate(
+            integer_array,
+            pivot_rule = FIRST_NONZERO_PIVOT,
+            keep_multipliers = True,
+            stop_when_singular = stop_when_singular
+        )
+    )
+
+def fraction_free_inverse(elimination, dimension):
+    '''
+    This function finishes inverting a square matrix of ints from a forward
+    fraction-free elimination of the matrix next to the identity matrix.
+    Each pivot row holds a row of U next to the same combination of the rows
+    of the identity matrix, so U times the inverse equals the identity part.
+    The last pivot D is the determinant up to sign, so D times the inverse
+    is a matrix of ints, and it is found by back substitution where every
+    division is exact.
+    Args:
+        elimination: the dictionary returned by fraction_free_eliminate or
+        int64_fraction_free_eliminate for the matrix next to the identity
+        matrix.
+        dimension: an int that is the number of rows of the matrix.
+    Returns:
+        a 2d numpy object array of Fractions holding the inverse, or None if
+        not every column of the matrix holds a pivot.
+    '''
+
+    if elimination["pivot_columns"][:dimension] != list(range(dimension)):
+        return None
+
+    rows = np.array(elimination["rows"], dtype = object)
+
+    U_array = rows[:, :dimension]
+    identity_part = rows[:, dimension:]
+
+    last_pivot = U_array[dimension - 1, dimension - 1]
+
+    scaled_inverse = np.empty((dimension, dimension), dtype = object)
+
+    # Back substitution with U, from the last row up.
+    for k in range(dimension - 1, -1, -1):
+        numerators = last_pivot * identity_part[k]
+
+        if k + 1 < dimension:
+            numerators = numerators - U_array[k, k + 1:].dot(
+                scaled_inverse[k + 1:]
+            )
+
+        scaled_inverse[k] = numerators // U_array[k, k]
+
+    return np.array(
+        [[Fraction(entry, last_pivot) for entry in row]
+         for row in scaled_inverse.tolist()],
+        dtype = object
+    )
@@ -0,0 +1,554 @@
+'''
+This file contains the float64 engine used when the user wants decimal
+outputs. Rather than doing every calculation with Fractions and converting
+the results to decimals, decimal calculations are done directly on numpy
+arrays of float64. Elimination, LU factorization and inverses use
+vectorized row operations that keep track of how large the numbers each
+entry came from were, so that round-off errors are not taken for pivots.
+Only the determinant and the float64 inverse the certified solves start
+from use the LAPACK routines behind numpy.linalg.
+'''
+
+import numpy as np
+import elimination
+
+from decimal import Decimal
+from fractions import Fraction
+from math import lcm
+
+# A calculated number is treated as 0 if its absolute value is at most this
+# fraction of the size of the numbers it was calculated from. This keeps
+# round-off errors left when numbers cancel from creating pivots where exact
+# arithmetic would have a 0, while numbers that are small only because the
+# matrix holds small numbers are kept, whatever the scale of the matrix. The
+# app always uses this tolerance, since backends.select_backend creates every
+# Float64Backend without one.
+ZERO_TOLERANCE = 1e-10
+
+# Outputs are rounded to this many significant digits so that round-off
+# errors in the last digits of a float64 are not displayed.
+OUTPUT_SIGNIFICANT_DIGITS = 12
+
+# Certified solves round each entry of a float64 solution to the nearest
+# fraction whose denominator is at most this number.
+RATIONAL_DENOMINATOR_LIMIT = 10 ** 6
+
+# This is how many rounds of iterative refinement are done on a float64
+# solution before it is rounded to fractions.
+REFINEMENT_ITERATIONS = 2
+
+# A float64 solution is only rounded to fractions if each fraction is within
+# this fraction of the float it replaces.
+ROUNDING_TOLERANCE = 1e-9
+
+def negligible_entries(float_array, bound_array, zero_tolerance = None):
+    '''
+    This function finds the entries of a calculated array that are treated
+    as 0.
+    Args:
+        float_array: a numpy array of float64 holding calculated numbers.
+        bound_array: a numpy array of float64 of the same shape holding, for
+        each number, the size of the numbers it was calculated from, which
+        its round-off error is proportional to.
+        zero_tolerance: a float that is the fraction of the bound treated as
+        0. If it is None, ZERO_TOLERANCE is used.
+    Returns:
+        a numpy array of booleans that are True for the entries treated as 0.
+    '''
+
+    if zero_tolerance is None:
+        zero_tolerance = ZERO_TOLERANCE
+
+    return np.abs(float_array) <= zero_tolerance * bound_array
+
+def output_decimal(number):
+    '''
+    This function converts a float to a Decimal rounded to
+    OUTPUT_SIGNIFICANT_DIGITS significant digits.
+    Args:
+        number: a float.
+    Returns:
+        a Decimal holding the rounded number.
+    '''
+
+    # Adding 0.0 turns -0.0 into 0.0 so that it is not displayed with a
+    # negative sign.
+    return Decimal(f"{number + 0.0:.{OUTPUT_SIGNIFICANT_DIGITS}g}")
+
+def output_array(float_array):
+    '''
+    This function prepares a float64 array to be outputted by converting its
+    entries to rounded Decimals. Entries treated as 0 are already set to
+    exactly 0 by the calculations, relative to the numbers each entry was
+    calculated from, so no entry is zeroed here.
+    Args:
+        float_array: a 2d numpy array of float64.
+    Returns:
+        a 2d numpy object array of Decimals.
+    '''
+
+    return np.array(
+        [[output_decimal(entry) for entry in row]
+         for row in float_array.tolist()],
+        dtype = object
+    ).reshape(float_array.shape)
+
+def pivot_row(float_array, bound_array, corner_row, corner_column,
+              zero_tolerance = None):
+    '''
+    This function chooses the pivot in a column for partial pivoting.
+    Args:
+        float_array: a 2d numpy array of float64 being eliminated.
+        bound_array: a 2d numpy array of float64 holding the size of the
+        numbers each entry was calculated from.
+        corner_row: an int that is the index of the first row the pivot can
+        be in.
+        corner_column: an int that is the index of the column.
+        zero_tolerance: a float that is the fraction of its bound at which an
+        entry is treated as 0. If it is None, ZERO_TOLERANCE is used.
+    Returns:
+        an int that is the index of the row with the highest absolute value
+        in the column among the entries not treated as 0, or None if every
+        entry is treated as 0.
+    '''
+
+    column_entries = np.abs(float_array[corner_row:, corner_column])
+
+    negligible = negligible_entries(
+        column_entries,
+        bound_array[corner_row:, corner_column],
+        zero_tolerance
+    )
+
+    if np.all(negligible):
+        return None
+
+    return corner_row + int(np.argmax(np.where(negligible, -1.0,
+                                               column_entries)))
+
+def clear_negligible_column(float_array, bound_array, first_row,
+                            column, zero_tolerance = None):
+    '''
+    This function sets the entries of a column that are treated as 0 to
+    exactly 0 before they are used to eliminate. Otherwise the ratio made from
+    what is left of numbers that cancelled would carry it into other entries
+    with a bound as small as itself, where it would look like a number that
+    did not come from cancellation.
+    Args:
+        float_array: a 2d numpy array of float64 being eliminated. This array
+        is modified in place.
+        bound_array: a 2d numpy array of float64 holding the size of the
+        numbers each entry was calculated from.
+        first_row: an int that is the index of the first row to clear.
+        column: an int that is the index of the column.
+        zero_tolerance: a float that is the fraction of its bound at which an
+        entry is treated as 0. If it is None, ZERO_TOLERANCE is used.
+    '''
+
+    column_entries = float_array[first_row:, column]
+
+    column_entries[negligible_entries(
+        column_entries,
+        bound_array[first_row:, column],
+        zero_tolerance
+    )] = 0.0
+
+def eliminate(float_array, zero_tolerance = None, reduce_above = False):
+    '''
+    This function performs Gaussian elimination with partial pivoting on a
+    float64 matrix. Each pivot step updates the rows it changes at once as
+    an outer product. Along with the matrix, the size of the numbers each
+    entry was calculated from is updated the same way, with absolute values,
+    so that an entry is only treated as 0 if it is negligible next to the
+    numbers that cancelled to make it. Scaling a row or a column of the input
+    does not change which entries are treated as 0.
+    Args:
+        float_array: a 2d numpy array of float64. This array is modified in
+        place.
+        zero_tolerance: a float that is the fraction of its bound at which an
+        entry is treated as 0. If it is None, ZERO_TOLERANCE is used.
+        reduce_above: a boolean that is True if every pivot should be made 1
+        with the entries above it eliminated, giving reduced row echelon form.
+    Returns:
+        a tuple whose first item is the eliminated array, whose second item
+        is the list of pivot columns, whose third item is the number of row
+        swaps performed and whose fourth item is a list holding, for each
+        eliminated row, the index of the input row it started as.
+    '''
+
+    row_count, column_count = float_array.shape
+
+    bound_array = np.abs(float_array)
+
+    pivot_columns = []
+
+    total_row_swaps = 0
+
+    row_permutation = list(range(row_count))
+
+    corner_row = 0
+    corner_column = 0
+
+    while corner_row < row_count and corner_column < column_count:
+
+        # Every entry of the corner column is used to eliminate when the
+        # entries above the pivot are eliminated too.
+        clear_negligible_column(float_array, bound_array,
+                                0 if reduce_above else corner_row,
+                                corner_column, zero_tolerance)
+
+        # The row with the highest absolute value in the corner column is
+        # brought to the corner row to keep round-off errors small.
+        max_row = pivot_row(float_array, bound_array, corner_row,
+                            corner_column, zero_tolerance)
+
+        if max_row is None:
+
+            # Entries treated as 0 are set to exactly 0 so that later code
+            # does not see them as pivots.
+            float_array[corner_row:, corner_column] = 0.0
+
+            corner_column += 1
+            continue
+
+        if max_row != corner_row:
+            total_row_swaps += 1
+
+            float_array[[corner_row, max_row]] = \
+                float_array[[max_row, corner_row]]
+
+            bound_array[[corner_row, max_row]] = \
+                bound_array[[max_row, corner_row]]
+
+            row_permutation[max_row], row_permutation[corner_row] = \
+                row_permutation[corner_row], row_permutation[max_row]
+
+        pivot = float_array[corner_row, corner_column]
+
+        if reduce_above:
+            float_array[corner_row, corner_column:] /= pivot
+            bound_array[corner_row, corner_column:] /= abs(pivot)
+
+            # Every other row has the pivot row times its entry in the corner
+            # column subtracted from it.
+            ratios = float_array[:, corner_column].copy()
+
+            ratios[corner_row] = 0.0
+
+            float_array[:, corner_column:] -= np.outer(
+                ratios,
+                float_array[corner_row, corner_column:]
+            )
+
+            bound_array[:, corner_column:] += np.outer(
+                np.abs(ratios),
+                bound_array[corner_row, corner_column:]
+            )
+
+            # The entries above and below the pivot are known to be 0.
+            float_array[:, corner_column] = 0.0
+            float_array[corner_row, corner_column] = 1.0
+
+        else:
+            ratios = float_array[corner_row + 1:, corner_column] / pivot
+
+            float_array[corner_row + 1:, corner_column:] -= np.outer(
+                ratios,
+                float_array[corner_row, corner_column:]
+            )
+
+            bound_array[corner_row + 1:, corner_column:] += np.outer(
+                np.abs(ratios),
+                bound_array[corner_row, corner_column:]
+            )
+
+            # The entries below the pivot are known to be 0.
+            float_array[corner_row + 1:, corner_column] = 0.0
+
+        pivot_columns.append(corner_column)
+
+        corner_row += 1
+        corner_column += 1
+
+    # What is left of numbers that cancelled is set to exactly 0.
+    float_array[negligible_entries(float_array, bound_array,
+                                   zero_tolerance)] = 0.0
+
+    return float_array, pivot_columns, total_row_swaps, row_permutation
+
+def LU_factorize(float_array, zero_tolerance = None,
+                 stop_when_singular = False):
+    '''
+    This function finds the PLU factorization of a float64 matrix with
+    partial pivoting. L and U are packed into the input array. Entries are
+    treated as 0 relative to the numbers they were calculated from, as in
+    eliminate.
+    Args:
+        float_array: a 2d numpy array of float64. This array is modified in
+        place and becomes the packed array of the factorization.
+        zero_tolerance: a float that is the fraction of its bound at which an
+        entry is treated as 0. If it is None, ZERO_TOLERANCE is used.
+        stop_when_singular: a boolean that is True if elimination should
+        stop at the first column without a pivot.
+    Returns:
+        an elimination.PLUFactorization whose packed array is float_array.
+    '''
+
+    row_count, column_count = float_array.shape
+
+    bound_array = np.abs(float_array)
+
+    pivot_columns = []
+
+    total_row_swaps = 0
+
+    row_permutation = list(range(row_count))
+
+    corner_row = 0
+    corner_column = 0
+
+    while corner_row < row_count and corner_column < column_count:
+
+        clear_negligible_column(float_array, bound_array, corner_row,
+                                corner_column, zero_tolerance)
+
+        # The row with the highest absolute value in the corner column is
+        # brought to the corner row to keep round-off errors small.
+        max_row = pivot_row(float_array, bound_array, corner_row,
+                            corner_column, zero_tolerance)
+
+        # A zero column moves the corner one to the right.
+        if max_row is None:
+            float_array[corner_row:, corner_column] = 0.0
+
+            if stop_when_singular:
+                break
+
+            corner_column += 1
+            continue
+
+        # The whole row is swapped, so the entries of L already found in it
+        # move with it.
+        if max_row != corner_row:
+            total_row_swaps += 1
+
+            float_array[[corner_row, max_row]] = \
+                float_array[[max_row, corner_row]]
+
+            bound_array[[corner_row, max_row]] = \
+                bound_array[[max_row, corner_row]]
+
+            row_permutation[max_row], row_permutation[corner_row] = \
+                row_permutation[corner_row], row_permutation[max_row]
+
+        pivot_columns.append(corner_column)
+
+        ratios = float_array[corner_row + 1:, corner_column] / \
+            float_array[corner_row, corner_column]
+
+        float_array[corner_row + 1:, corner_column + 1:] -= np.outer(
+            ratios,
+            float_array[corner_row, corner_column + 1:]
+        )
+
+        bound_array[corner_row + 1:, corner_column + 1:] += np.outer(
+            np.abs(ratios),
+            bound_array[corner_row, corner_column + 1:]
+        )
+
+        # The ratios used to eliminate the corner column are the entries of
+        # the next column of L, so they are kept where the eliminated entries
+        # were. They are not the result of cancellation, so their bound is 0
+        # and they are never treated as 0.
+        float_array[corner_row + 1:, corner_column] = ratios
+
+        bound_array[corner_row + 1:, corner_column] = 0.0
+
+        corner_row += 1
+        corner_column += 1
+
+    # What is left of numbers that cancelled is set to exactly 0.
+    float_array[negligible_entries(float_array, bound_array,
+                                   zero_tolerance)] = 0.0
+
+    return elimination.PLUFactorization(
+        float_array,
+        row_permutation,
+        pivot_columns,
+        total_row_swaps
+    )
+
+def determinant(float_array, zero_tolerance = None):
+    '''
+    This function calculates the determinant of a square float64 matrix with
+    the LAPACK LU factorization behind numpy.linalg.det.
+    Args:
+        float_array: a 2d numpy array of float64.
+        zero_tolerance: a float that is the fraction of the Hadamard bound
+        of the matrix at which the determinant is treated as 0. If it is
+        None, ZERO_TOLERANCE is used.
+    Returns:
+        a Decimal holding the determinant.
+    '''
+
+    if zero_tolerance is None:
+        zero_tolerance = ZERO_TOLERANCE
+
+    float_determinant = float(np.linalg.det(float_array))
+
+    # The determinant is compared to the Hadamard bound, the largest it could
+    # be for rows of the same lengths, to decide if it is treated as 0.
+    hadamard_bound = float(np.prod(np.linalg.norm(float_array, axis = 1)))
+
+    if abs(float_determinant) <= zero_tolerance * hadamard_bound:
+        float_determinant = 0.0
+
+    return output_decimal(float_determinant)
+
+def inverse(float_array, zero_tolerance = None):
+    '''
+    This function calculates the inverse of a square float64 matrix by
+    bringing the matrix next to the identity matrix, [A | I], to reduced row
+    echelon form, which is [I | A^-1] when the matrix is invertible. Doing
+    this with eliminate rather than LAPACK keeps the size of the numbers each
+    entry of the inverse was calculated from, so the entries that are 0 in
+    exact arithmetic are found relative to those numbers rather than to the
+    entries of the matrix.
+    Args:
+        float_array: a 2d numpy array of float64.
+        zero_tolerance: a float that is the fraction of its bound at which an
+        entry is treated as 0. If it is None, ZERO_TOLERANCE is used.
+    Returns:
+        a 2d numpy array of float64 holding the inverse, or None if the matrix
+        is not invertible.
+    '''
+
+    dimension = float_array.shape[0]
+
+    reduced_array, pivot_columns = eliminate(
+        np.hstack([float_array, np.identity(dimension)]),
+        zero_tolerance,
+        reduce_above = True
+    )[:2]
+
+    # The matrix is invertible if it has a pivot in every column once the
+    # entries treated as 0 are ignored.
+    if pivot_columns[dimension - 1:dimension] != [dimension - 1]:
+        return None
+
+    return reduced_array[:, dimension:]
+
+def float_inverse(integer_rows):
+    '''
+    This function inverts a square matrix of ints in float64 with LAPACK.
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+    Returns:
+        a 2d numpy array of float64 holding the inverse, or None if the
+        matrix is singular or its ints are too large for float64.
+    '''
+
+    try:
+        return np.linalg.inv(np.array(integer_rows, dtype = np.float64))
+
+    except (OverflowError, np.linalg.LinAlgError):
+        return None
+
+def certified_solve(integer_rows, constant_rows, iterations = None,
+                    inverse_array = None):
+    '''
+    This function solves a square linear system exactly by solving it in
+    float64 and rounding the solution to nearby fractions. The fractions are
+    only returned once they are checked exactly, so a system whose solution
+    does not have small denominators is never given a wrong answer.
+    Args:
+        integer_rows: a list of rows that are lists of ints holding the
+        coefficient matrix.
+        constant_rows: a list of rows that are lists of ints holding one or
+        more constant columns.
+        iterations: an int that is the number of rounds of iterative
+        refinement done. If it is None, REFINEMENT_ITERATIONS is used.
+        inverse_array: the array float_inverse returned for the coefficient
+        matrix, if it was already found. If it is None, it is found here.
+    Returns:
+        a list of rows that are lists of Fractions holding the solution for
+        each constant column, or None if no solution could be certified.
+    '''
+
+    if iterations is None:
+        iterations = REFINEMENT_ITERATIONS
+
+    # The inverse is found once with LAPACK so that each round of refinement
+    # is only a matrix product. Ints too large for float64 and singular
+    # matrices cannot be solved this way.
+    if inverse_array is None:
+        inverse_array = float_inverse(integer_rows)
+
+    if inverse_array is None:
+        return None
+
+    try:
+        coefficient_array = np.array(integer_rows, dtype = np.float64)
+        constant_array = np.array(constant_rows, dtype = np.float64)
+
+    except OverflowError:
+        return None
+
+    solution_array = inverse_array @ constant_array
+
+    # Each round of iterative refinement solves for the error left in the
+    # solution by round-off and removes it.
+    for i in range(iterations):
+        residual_array = constant_array - coefficient_array @ solution_array
+
+        solution_array += inverse_array @ residual_array
+
+    if not np.all(np.isfinite(solution_array)):
+        return None
+
+    solution_rows = []
+
+    for row in solution_array.tolist():
+
+        solution_row = []
+
+        for entry in row:
+
+            fraction = Fraction(entry).limit_denominator(
+                RATIONAL_DENOMINATOR_LIMIT
+            )
+
+            # If the nearest small fraction is not within round-off error of
+            # the float, the solution does not have small denominators, so
+            # there is no point rounding the rest of it.
+            if abs(float(fraction) - entry) > \
+                ROUNDING_TOLERANCE * max(1.0, abs(entry)):
+                return None
+
+            solution_row.append(fraction)
+
+        solution_rows.append(solution_row)
+
+    # The residual is checked exactly with ints. Each column of the solution
+    # is written over a common denominator.
+    column_denominators = [
+        lcm(*[row[j].denominator for row in solution_rows])
+        for j in range(constant_array.shape[1])
+    ]
+
+    numerator_array = np.array(
+        [[int(entry * denominator) for entry, denominator in
+          zip(row, column_denominators)] for row in solution_rows],
+        dtype = object
+    )
+
+    expected_array = np.array(constant_rows, dtype = object) * \
+        np.array(column_denominators, dtype = object)
+
+    if not np.array_equal(
+        np.array(integer_rows, dtype = object).dot(numerator_array),
+        expected_array
+    ):
+        return None
+
+    return solution_rows
@@ -1,8 +1,26 @@
 import pandas as pd
 import numpy as np
 import calculations
-
-def solution_set(linear_system, output_decimal):
+import backends
+import modular
+import float_engine
+import elimination
+import result_cache
+import structure
+import banded
+
+from fractions import Fraction
+from decimal import Decimal
+from math import lcm
+
+# The inverses of the coefficient parts of recently solved systems are kept
+# here so that a system whose constants are the only thing that changed is
+# solved without inverting its coefficients again.
+COEFFICIENT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+coefficient_cache = result_cache.ResultCache(COEFFICIENT_CACHE_MAX_BYTES)
+
+def solution_set(linear_system, output_decimal, factorization = None):
     '''
     The purpose of this function is to find the solution set of a linear system
     and return it as a frame of strings that can be outputted and easily read.
@@ -11,6 +29,9 @@ def solution_set(linear_system, output_decimal):
         system with variable names as headers.
         output_decimal: a boolean that is true if the user wants their output as
         decimals and false if they want it as fractions.
+        factorization: a calculations.Factorization of the linear system shared
+        with other outputs, or None if the reduced augmented matrix should not
+        be shared.
     Returns:
         a DataFrame of strings representing each variable's solution. The
         header of this DataFrame will already be set.
@@ -29,17 +50,32 @@ def solution_set(linear_system, output_decimal):
     # This removes the constant column name.
     variable_names.pop(len(variable_names) - 1)
 
-    solved_system_frame = calculations.reduced_row_echelon_form(
+    reduced_result = reduced_augmented_elimination(
         linear_system,
-        output_decimal
+        output_decimal,
+        factorization = factorization
         )
     
     # This occurs if the user's matrix is not formatted correctly so there are
     # entries in their matrix that aren't numbers.
-    if solved_system_frame.empty:
-        return solved_system_frame
+    if reduced_result is None:
+        return calculations.invalid_number_frame()
+
+    # If the constant column holds a pivot, that row says 0 equals a nonzero
+    # number, so the system is inconsistent.
+    if reduced_result.inconsistent:
+
+        inconsistent_array = np.array([["This system is inconsistent so \
+                                            there are no solutions."]])
+        
+        inconsistent_frame = pd.DataFrame (
+            data = inconsistent_array,
+            columns = ["Solution Set"]
+        )
+
+        return inconsistent_frame
     
-    solved_system_array = solved_system_frame.to_numpy()
+    solved_system_array = reduced_result.matrix
     
     # This 2d list will be vertical and will only have one column.
     # In each row there will be a string representing the solution to a
@@ -49,179 +85,94 @@ def solution_set(linear_system, output_decimal):
     # This will be used to access constants when solving for variables.
     last_column_index = solved_system_array.shape[1] - 1
 
-    # Since each row's search will start at the previous_pivot + 1,
-    # previous_pivot will start at -1.
-    previous_pivot = -1
+    # This maps each pivot column to the row its pivot is in. Every column
+    # that is not a pivot column is a free variable.
+    pivot_rows = {pivot_column: i for i, pivot_column in
+                  enumerate(reduced_result.pivot_columns)}
 
-    # Once a zero_row is reached, there will be no more pivots so there is not
-    # point checking lower rows.
-    zero_row_reached = False
+    free_columns = [j for j in range(len(variable_names))
+                    if j not in pivot_rows]
 
-    i = 0
+    for j in range(len(variable_names)):
 
-    # This checks that the bottom row has not yet been reached, there have been
-    # no zero rows yet, and the last column has not yet been a pivot. If any of
-    # these conditions are violated, then this loop will end.
-    while i < solved_system_array.shape[0] and not zero_row_reached and \
-        previous_pivot + 1 < solved_system_array.shape[1] - 1:
+        if j not in pivot_rows:
+            solutions_for_variables.append([f"{variable_names[j]} is free"])
 
-        variable_solution_row = []
+            continue
 
-        variable_solution = ""
+        i = pivot_rows[j]
 
-        pivot_column_reached = False
+        # The solution for the variable in a pivot column is first set as
+        # equal to the number in the constant column.
+        row_constant = solved_system_array[i, last_column_index]
 
-        # j goes up to the second to last column since the last column
-        # represents constants. It starts one higher than the previous pivot
-        # because in row echelon form there will never be a pivot that is not to
-        # the right of the previous pivot position.
-        for j in range(previous_pivot + 1, solved_system_array.shape[1] - 1):
+        variable_solution = f"{variable_names[j]} = {row_constant}"
 
-            coefficient = solved_system_array[i, j]
+        # In reduced row echelon form, the only nonzero coefficients in a row
+        # other than its pivot are in free columns to the right of the pivot.
+        for free_column in free_columns:
 
-            # This indicates that the row is a zero row
+            coefficient = solved_system_array[i, free_column]
 
-            if not pivot_column_reached and j == solved_system_array.shape[1] -\
-                2 and coefficient == 0:
-                
-                # This ensures that the final column will be added as a free 
-                # variable.
+            if free_column < j or coefficient == 0:
+                continue
 
-                solutions_for_variables.append(
-                    [f"{variable_names[j]} is free"]
-                )
+            term_coefficient_string = ""
 
-                zero_row_reached = True
+            # Since the coefficient should be brought to the solution side,
+            # it is multiplied by negative 1 in the solution.
+            term_coefficient_value = -1 * coefficient
 
-            elif not pivot_column_reached and coefficient == 0:
-                # If there is a 0 coefficient in a column that exists before the
-                # first pivot position in its row and after the pivot in the
-                # previous row, that column is not a pivot column so its
-                # variable is free.
+            # There is no point in including a 1 before the variable since
+            # that is implied, so if the coefficient is 1, the string before
+            # the variable will be nothing.
+            if term_coefficient_value == 1 or term_coefficient_value == -1:
+                term_coefficient_string == ""
 
-                solutions_for_variables.append(
-                    [f"{variable_names[j]} is free"])
+            # The term in the parentheses will always be positive. Negative
+            # values will be accounted for with a - sign rather than a + 
+            # sign. The coefficient term is always in parentheses in case
+            # the user chooses variable names that start with numbers.
 
-            elif not pivot_column_reached and coefficient != 0:
-                pivot_column_reached = True
+            if term_coefficient_value < 0:
+                term_coefficient_string = \
+                    f"({-1 * term_coefficient_value})"
 
-                # Once the pivot column has reached, the solution for the
-                # variable in that column will first be set as equal to the
-                # number in the constant column.
+            else:
+                term_coefficient_string = f"({term_coefficient_value})"
 
-                previous_pivot = j
-                
-                row_constant = solved_system_array[i, last_column_index]
+            # If the current variable is the first after the constant and
+            # the constant is 0, the zero is removed as it is unnecessary.
+            # 0 is only included if it is the only element of the equation.
                 
-                variable_solution += f"{variable_names[j]} = {row_constant}"
-            
-            # This block is only reached if pivot_column_reached is true
-            # and the coefficient is not 0.
-            elif coefficient != 0:
-                
-                term_coefficient_string = ""
-
-                # Since the coefficient should be brought to the solution side,
-                # it is multiplied by negative 1 in the solution.
-                term_coefficient_value = -1 * coefficient
-
-                # There is no point in including a 1 before the variable since
-                # that is implied, so if the coefficient is 1, the string before
-                # the variable will be nothing.
-                if term_coefficient_value == 1 or term_coefficient_value == -1:
-                    term_coefficient_string == ""
-
-                # The term in the parentheses will always be positive. Negative
-                # values will be accounted for with a - sign rather than a + 
-                # sign. The coefficient term is always in parentheses in case
-                # the user chooses variable names that start with numbers.
-
-                if term_coefficient_value < 0:
-                    term_coefficient_string = \
-                        f"({-1 * term_coefficient_value})"
-
-                else:
-                    term_coefficient_string = f"({term_coefficient_value})"
-
-                # If the current variable is the first after the constant and
-                # the constant is 0, the zero is removed as it is unnecessary.
-                # 0 is only included if it is the only element of the equation.
-                
-                if variable_solution[len(variable_solution) - 3 : 
-                                     len(variable_solution)] == "= 0":
+            if variable_solution[len(variable_solution) - 3 : 
+                                 len(variable_solution)] == "= 0":
                     
-                    # This is variable solution without the last zero, as it is 
-                    # no longer necessary since constants are being added.
-                    variable_solution = variable_solution[0 : 
-                                                    len(variable_solution) - 1]
+                # This is variable solution without the last zero, as it is 
+                # no longer necessary since constants are being added.
+                variable_solution = variable_solution[0 : 
+                                                len(variable_solution) - 1]
                     
-                    # Since this term is the first term in the equation, a
-                    # a negative sign should be included for negative numbers.
-
-                    if term_coefficient_value < 0:
-                        term_coefficient_string = "-" + term_coefficient_string
+                # Since this term is the first term in the equation, a
+                # a negative sign should be included for negative numbers.
 
-                else:
-
-                    if term_coefficient_value < 0:
-                        variable_solution += " - "
-
-                    else:
-                        variable_solution += " + "
-
-
-                variable_solution += \
-                f"{term_coefficient_string}{variable_names[j]}"
-                
-        # If a zero row is reached then there is nothing to append.
-        if (not zero_row_reached):   
-            variable_solution_row.append(variable_solution)
-
-            solutions_for_variables.append(variable_solution_row)
+                if term_coefficient_value < 0:
+                    term_coefficient_string = "-" + term_coefficient_string
 
-        i += 1
+            else:
 
-    # If the last column has been a pivot, it is still possible for the system
-    # to be inconsistent. The while loop only catches inconsistent systems where
-    # there are free variables between the last pivot column and the pivot in
-    # the constant column. Since the row after a pivot in the last column is
-    # guaranteed to be a zero row, if there is a row after the pivot in the last
-    # column, the program will only check if there is a nonzero number in the 
-    # constant column of that row. Since all rows entirely full of zeros are at
-    # the bottom in reduced row echelon form, there is no need to check lower
-    # rows. If a zero row has been reached, then that row is the only row that
-    # can have a pivot in its augmented column rather than the row after the
-    # the last row checked in the loop, so 1 is subtracted from i.
+                if term_coefficient_value < 0:
+                    variable_solution += " - "
 
-    if zero_row_reached:
-        i -= 1
+                else:
+                    variable_solution += " + "
 
-    if i < solved_system_array.shape[0]:
 
-        if solved_system_array[i, last_column_index] != 0:
+            variable_solution += \
+            f"{term_coefficient_string}{variable_names[free_column]}"
 
-            inconsistent_array = np.array([["This system is inconsistent so \
-                                            there are no solutions."]])
-            
-            inconsistent_frame = pd.DataFrame (
-                data = inconsistent_array,
-                columns = ["Solution Set"]
-            )
+        solutions_for_variables.append([variable_solution])
 
-            return inconsistent_frame
-        
-    # If the pivot in the last row is not the same as the last column then the
-    # the variables for columns that follow will be considered free. This is
-    # only necessary if there are no zero rows and the last row has a pivot
-    # before the last column. If a zero row is reached, then the loop will add
-    # the free variables because every column between two pivots in the loop is
-    # considered to be free and a pivot is never reached in a zero row.
-    if not zero_row_reached:
-        for j in range(previous_pivot + 1, solved_system_array.shape[1] - 1):
-            solutions_for_variables.append(
-                [f"{variable_names[j]} is free"]
-                )
-        
     solution_string_array = np.array(solutions_for_variables)
 
     solution_string_frame = pd.DataFrame(
@@ -232,7 +183,8 @@ def solution_set(linear_system, output_decimal):
     return solution_string_frame
 
 def parametric_vector_solution_set(linear_system, output_decimal, 
-                                   return_vectors = False):
+                                   return_vectors = False,
+                                   factorization = None):
     '''
     The purpose of this function is to find the solution set to a linear system
     and return the solution in a way that that it can be displayed in
@@ -247,6 +199,9 @@ def parametric_vector_solution_set(linear_system, output_decimal,
         this function is called by other functions, as by default, this
         function returns a DataFrame meant to be easy to read, not easy to
         use for other purposes.)
+        factorization: a calculations.Factorization of the linear system shared
+        with other outputs, or None if the reduced augmented matrix should not
+        be shared.
     Returns:
         a DataFrame holding the solution to the linear system in parametric
         vector form.
@@ -265,17 +220,33 @@ def parametric_vector_solution_set(linear_system, output_decimal,
     # This removes the constant column name.
     variable_names.pop(len(variable_names) - 1)
 
-    solved_system_frame = calculations.reduced_row_echelon_form(
+    reduced_result = reduced_augmented_elimination(
         linear_system,
-        output_decimal
+        output_decimal,
+        factorization = factorization
         )
-    
+
     # This occurs if the user's matrix is not formatted correctly so there are
     # entries in their matrix that aren't numbers.
-    if solved_system_frame.empty:
-        return solved_system_frame
-    
-    solved_system_array = solved_system_frame.to_numpy()
+    if reduced_result is None:
+        return calculations.invalid_number_frame()
+
+    # If the constant column holds a pivot, that row says 0 equals a nonzero
+    # number, so the system is inconsistent.
+    if reduced_result.inconsistent:
+
+        inconsistent_array = np.array([
+            ["This system is inconsistent so there are no solutions."]]
+            )
+
+        inconsistent_frame = pd.DataFrame (
+            data = inconsistent_array,
+            columns = ["Solution Set"]
+        )
+
+        return inconsistent_frame
+
+    solved_system_array = reduced_result.matrix
 
     # A dictionary of solution vectors is created. The constant vector is added
     # by default in case there are no free variables and every variable is
@@ -285,160 +256,37 @@ def parametric_vector_solution_set(linear_system, output_decimal,
     # This will be used to access constants when solving for variables.
     last_column_index = solved_system_array.shape[1] - 1
 
-    # Since each row's search will start at the previous_pivot + 1,
-    # previous_pivot will start at -1.
-    previous_pivot = -1
+    # The constant vector has the row corresponding with each pivot variable
+    # set to the constant in that pivot's row of the solution array.
+    for i, pivot_column in enumerate(reduced_result.pivot_columns):
+        solution_vectors["Constant"][pivot_column] = \
+            solved_system_array[i, last_column_index]
 
-    # Once a zero_row is reached, there will be no more pivots so there is not
-    # point checking lower rows.
-    zero_row_reached = False
+    # The free variables are added in the order they are met when reading
+    # the rows from top to bottom.
+    free_columns = elimination.free_column_order(
+        solved_system_array, reduced_result.pivot_columns, len(variable_names)
+    )
 
-    i = 0
+    for j in free_columns:
 
-    # This checks that the bottom row has not yet been reached, there have been
-    # no zero rows yet, and the last column has not yet been a pivot. If any of
-    # these conditions are violated, then this loop will end.
-    while i < solved_system_array.shape[0] and not zero_row_reached and \
-        previous_pivot + 1 < solved_system_array.shape[1] - 1:
+        current_vector = [0] * len(variable_names)
 
-        pivot_column_reached = False
+        # This sets the free variable equal to itself.
+        current_vector[j] = 1
 
-        # j goes up to the second to last column since the last column
-        # represents constants. It starts one higher than the previous pivot
-        # because in row echelon form there will never be a pivot that is not
-        # to the right of the previous pivot position.
-        for j in range(previous_pivot + 1, solved_system_array.shape[1] - 1):
+        for i, pivot_column in enumerate(reduced_result.pivot_columns):
 
             coefficient = solved_system_array[i, j]
 
-            # This indicates that the row is a zero row
-
-            if not pivot_column_reached and j == solved_system_array.shape[1]-\
-                2 and coefficient == 0:
-                
-                # This ensures that the final column will be added as a free 
-                # variable by adding it to the solution vector dictionary if it
-                # has not been already.
-                if not variable_names[j] in solution_vectors:
-                    current_vector = [0] * len(variable_names)
-
-                    # This sets the free variable equal to itself.
-                    current_vector[j] = 1
-
-                    solution_vectors[variable_names[j]] = current_vector
-
-                zero_row_reached = True
-
-            elif not pivot_column_reached and coefficient == 0:
-                # If there is a 0 coefficient in a column that exists before
-                # the first pivot position in its row and after the pivot in
-                # the previous row, that column is not a pivot column so its
-                # variable is free.
-
-                # This ensures that this column will be added as a free 
-                # variable by adding it to the solution vector dictionary if it
-                # has not been already.
-                if not variable_names[j] in solution_vectors:
-                    current_vector = [0] * len(variable_names)
-
-                    # This sets the free variable equal to itself.
-                    current_vector[j] = 1
-
-                    solution_vectors[variable_names[j]] = current_vector
-
-            elif not pivot_column_reached and coefficient != 0:
-                pivot_column_reached = True
-
-                # Once the pivot column has reached, the solution for the
-                # variable in that column will first be set as equal to the
-                # number in the constant column.
-
-                previous_pivot = j
-                
-                row_constant = solved_system_array[i, last_column_index]
-
-                # The constant vector has its row corresponding with this pivot
-                # variable set to the constant in this row of the solution
-                # array.
-                solution_vectors["Constant"][j] = row_constant
-            
-            # This block is only reached if pivot_column_reached is true
-            # and the coefficient is not 0.
-            elif coefficient != 0:
-
-                # Since the variable should be brought to the solution side,
-                # it is multiplied by negative 1 in the solution.
-                variable_multiple = -1 * coefficient
-
-                # This ensures that this column will be added as a free 
-                # variable by adding it to the solution vector dictionary if it
-                # has not been already.
-                if not variable_names[j] in solution_vectors:
-                    current_vector = [0] * len(variable_names)
-
-                    # This sets the free variable equal to itself.
-                    current_vector[j] = 1
-
-                    solution_vectors[variable_names[j]] = current_vector
-
-                # The row of the solution vector for this free variable 
-                # corresponding to the pivot variable is set to the variable 
-                # multiple in this row of the solution array.
-                solution_vectors[variable_names[j]][previous_pivot] = \
-                    variable_multiple
-
-        i += 1
-
-    # If the last column has been a pivot, it is still possible for the system
-    # to be inconsistent. The while loop only catches inconsistent systems 
-    # where there are free variables between the last pivot column and the
-    # pivot in the constant column. Since the row after a pivot in the last
-    # column is guaranteed to be a zero row, if there is a row after the pivot
-    # in the last column, the program will only check if there is a nonzero
-    # number in the constant column of that row. Since all rows entirely full
-    # of zeros are at the bottom in reduced row echelon form, there is no need
-    # to check  lower rows. If a zero row has been reached, then that row is
-    # the only row that can have a pivot in its augmented column rather than
-    # the row after the  the last row checked in the loop, so 1 is subtracted
-    # from i.
-
-    if zero_row_reached:
-        i -= 1
-
-    if i < solved_system_array.shape[0]:
-
-        if solved_system_array[i, last_column_index] != 0:
-
-            inconsistent_array = np.array([
-                ["This system is inconsistent so there are no solutions."]]
-                )
-            
-            inconsistent_frame = pd.DataFrame (
-                data = inconsistent_array,
-                columns = ["Solution Set"]
-            )
-
-            return inconsistent_frame
-        
-    # If the pivot in the last row is not the same as the last column then the
-    # the variables for columns that follow will be considered free. This is
-    # only necessary if there are no zero rows and the last row has a pivot
-    # before the last column. If a zero row is reached, then the loop will add
-    # the free variables because every column between two pivots in the loop is
-    # considered to be free and a pivot is never reached in a zero row.
-    if not zero_row_reached:
-        for j in range(previous_pivot + 1, solved_system_array.shape[1] - 1):
-            
-            # This ensures that this column will be added as a free 
-            # variable by adding it to the solution vector dictionary if it
-            # has not been already.
-            if not variable_names[j] in solution_vectors:
-                current_vector = [0] * len(variable_names)
-
-                # This sets the free variable equal to itself.
-                current_vector[j] = 1
+            # Since the variable should be brought to the solution side, it is
+            # multiplied by negative 1 in the solution. The row of the
+            # solution vector for this free variable corresponding to the
+            # pivot variable is set to that multiple.
+            if coefficient != 0:
+                current_vector[pivot_column] = -1 * coefficient
 
-                solution_vectors[variable_names[j]] = current_vector
+        solution_vectors[variable_names[j]] = current_vector
 
     # As long as the constant vector is not the only vector, it is removed if
     # it consists of all zeros. For homogenous equations, it will always be all
@@ -548,4 +396,419 @@ def parametric_vector_solution_set(linear_system, output_decimal,
             
             current_column += 1
 
-    return parametric_vector_frame
\ No newline at end of file
+    return parametric_vector_frame
+
+def reduced_augmented_elimination(linear_system, output_decimal, hybrid = True,
+                                  factorization = None, scaled_system = None):
+    '''
+    This function finds the reduced row echelon form of the augmented matrix
+    of a linear system. When the coefficient part of the matrix is square and
+    invertible, the reduced row echelon form is the identity matrix next to
+    the solution, so the solution is found directly. If the coefficients lie
+    in a narrow band around the diagonal, it is found by banded elimination,
+    in float64 when the output is decimal. Otherwise it is first found in
+    float64 and rounded to fractions that are checked exactly, and if that
+    fails, it is found with p-adic lifting. When the coefficient part is
+    singular or not square, or when the output is decimal and the
+    coefficients are not banded, the whole augmented matrix is row reduced.
+    Args:
+        linear_system: a DataFrame holding the augmented matrix for the linear
+        system.
+        output_decimal: a boolean that is True if the user wants their output
+        as decimals and False if they want it as fractions.
+        hybrid: a boolean that is True if the certified float64 solve should
+        be tried before p-adic lifting.
+        factorization: a calculations.Factorization of the linear system. If it
+        is not None, the result is shared with every other output using it.
+        scaled_system: the elimination.ScaledMatrix calculations.parse_matrix
+        returns for the augmented matrix if it was already read, or None.
+    Returns:
+        an elimination.EliminationResult holding the augmented matrix in
+        reduced row echelon form with its pivot columns, or None if an entry
+        is not a valid number.
+    '''
+
+    if factorization is not None:
+        return factorization.shared_result(
+            "reduced augmented elimination",
+            lambda: reduced_augmented_elimination(
+                linear_system,
+                output_decimal,
+                hybrid,
+                scaled_system = factorization.scaled_matrix
+            )
+        )
+
+    if scaled_system is None:
+        scaled_system = calculations.parse_matrix(linear_system)
+
+    if scaled_system is None:
+        return None
+
+    dimension = linear_system.shape[0]
+
+    # Only systems with as many equations as variables can have a square
+    # coefficient part.
+    if linear_system.shape[1] != dimension + 1:
+        return calculations.reduced_row_echelon_elimination(
+            linear_system,
+            output_decimal,
+            augmented = True,
+            scaled_matrix = scaled_system
+        )
+
+    # The coefficient part is taken on its own so that it is held the same
+    # way whatever the constants are.
+    coefficient_matrix = scaled_system.column_range(0, dimension)
+
+    constant_column = scaled_system.column_range(dimension, dimension + 1)
+
+    constants = [Fraction(int(constant_row[0]), row_scale) for
+                 constant_row, row_scale in zip(constant_column.rows,
+                                                constant_column.row_scales)]
+
+    lower_bandwidth, upper_bandwidth = structure.matrix_bandwidths(
+        coefficient_matrix
+    )
+
+    is_banded = banded.is_banded(dimension, lower_bandwidth, upper_bandwidth)
+
+    # Decimal outputs of banded systems are found by elimination inside the
+    # band in float64. Other decimal outputs are found with the float64
+    # engine used for reduced row echelon form.
+    if output_decimal:
+        solution = None if not is_banded else banded.float_solve(
+            coefficient_matrix,
+            constants,
+            lower_bandwidth,
+            upper_bandwidth
+        )
+
+        if solution is None:
+            return calculations.reduced_row_echelon_elimination(
+                linear_system,
+                output_decimal,
+                augmented = True,
+                scaled_matrix = scaled_system
+            )
+
+        solved_system_array = np.full((dimension, dimension + 1), Decimal(0),
+                                      dtype = object)
+
+        for i in range(dimension):
+            solved_system_array[i, i] = Decimal(1)
+            solved_system_array[i, dimension] = \
+                float_engine.output_decimal(solution[i])
+
+        return elimination.EliminationResult(
+            solved_system_array,
+            list(range(dimension))
+        )
+
+    # Systems whose coefficients lie in a narrow band around the diagonal,
+    # such as tridiagonal systems, are solved by elimination inside the band.
+    if is_banded:
+        solution = banded.solve(
+            coefficient_matrix,
+            constants,
+            lower_bandwidth,
+            upper_bandwidth
+        )
+
+    else:
+        solution_rows = square_system_solutions(
+            coefficient_matrix,
+            [[constant] for constant in constants],
+            hybrid
+        )
+
+        solution = None if solution_rows is None else \
+            [row[0] for row in solution_rows]
+
+    # If the coefficient part is singular, the augmented matrix is row
+    # reduced as usual.
+    if solution is None:
+        return calculations.reduced_row_echelon_elimination(
+            linear_system,
+            output_decimal,
+            augmented = True,
+            scaled_matrix = scaled_system
+        )
+
+    # Every entry of the identity part other than its diagonal is the same 0
+    # Fraction, so a large system does not make an object for each of them.
+    solved_system_array = np.full((dimension, dimension + 1), Fraction(0),
+                                  dtype = object)
+
+    for i in range(dimension):
+        solved_system_array[i, i] = Fraction(1)
+        solved_system_array[i, dimension] = solution[i]
+
+    # Every coefficient column holds a pivot. The solution was not found by
+    # row operations, so there are no row swaps to report.
+    return elimination.EliminationResult(
+        solved_system_array,
+        list(range(dimension))
+    )
+
+def square_system_solutions(coefficient_matrix, constant_rows, hybrid = True):
+    '''
+    This function solves square linear systems that share a coefficient
+    matrix, one for each constant column. Every column is solved at once in
+    float64 and rounded to fractions that are checked exactly, and if that
+    fails, each column is found with p-adic lifting. If lifting fails too, the
+    coefficient matrix is checked exactly and every column is found by exact
+    elimination. The inverses both ways use are cached by the coefficients,
+    so they are found once however many constant columns there are.
+    Args:
+        coefficient_matrix: an elimination.ScaledMatrix holding the square
+        coefficient matrix.
+        constant_rows: a list of rows that are lists of Fractions holding one
+        or more constant columns.
+        hybrid: a boolean that is True if the certified float64 solve should
+        be tried before p-adic lifting.
+    Returns:
+        a list of rows that are lists of Fractions holding the solution for
+        each constant column, or None if the coefficient matrix is singular.
+    '''
+
+    # Multiplying an equation by a number does not change the solution, so
+    # each row of coefficients is held as ints without its row scale, and its
+    # constants are multiplied by the row scale too.
+    coefficient_rows, row_scales = coefficient_matrix.integer_rows()
+
+    scaled_constant_rows = [
+        [Fraction(constant) * row_scale for constant in row]
+        for row, row_scale in zip(constant_rows, row_scales)
+    ]
+
+    constant_count = len(scaled_constant_rows[0])
+
+    # Each constant column is multiplied by the common denominator of its
+    # entries to make them ints, which multiplies its solution by it as well.
+    constant_denominators = [
+        lcm(*[row[j].denominator for row in scaled_constant_rows])
+        for j in range(constant_count)
+    ]
+
+    integer_constant_rows = [
+        [int(constant * denominator) for constant, denominator in
+         zip(row, constant_denominators)]
+        for row in scaled_constant_rows
+    ]
+
+    # The inverses the solvers use are the part of the work that takes a
+    # number of steps proportional to the cube of the dimension. They only
+    # depend on the coefficients, so they are cached by a hash of the
+    # coefficients, and solving the same coefficients with new constants only
+    # takes matrix products.
+    coefficient_hash = result_cache.scaled_matrix_hash(coefficient_matrix)
+
+    integer_solution_rows = None
+
+    # A cached inverse of None means the coefficients could not be inverted
+    # that way. It is not passed on, since the solvers would take None to
+    # mean that the inverse was not found yet and try again.
+    if hybrid:
+        inverse_array = coefficient_cache.result(
+            result_cache.result_key(
+                coefficient_hash,
+                float_engine.float_inverse,
+                False
+            ),
+            lambda: float_engine.float_inverse(coefficient_rows)
+        )
+
+        if inverse_array is not None:
+            integer_solution_rows = float_engine.certified_solve(
+                coefficient_rows,
+                integer_constant_rows,
+                inverse_array = inverse_array
+            )
+
+    if integer_solution_rows is None:
+        modular_inverse = coefficient_cache.result(
+            result_cache.result_key(
+                coefficient_hash,
+                modular.inverse_modulo_prime,
+                False
+            ),
+            lambda: modular.inverse_modulo_prime(coefficient_rows)
+        )
+
+        solution_columns = []
+
+        # A matrix can be singular modulo each of the fixed primes tried
+        # without being singular, such as one whose determinant is their
+        # product, so neither a missing modular inverse nor a failed lift
+        # shows that it is singular.
+        if modular_inverse is not None:
+            for j in range(constant_count):
+                solution_column = modular.dixon_solve(
+                    coefficient_rows,
+                    [row[j] for row in integer_constant_rows],
+                    modular_inverse = modular_inverse
+                )
+
+                if solution_column is None:
+                    break
+
+                solution_columns.append(solution_column)
+
+        if len(solution_columns) == constant_count:
+            integer_solution_rows = [list(row) for row in
+                                     zip(*solution_columns)]
+
+        else:
+            integer_solution_rows = exact_elimination_solutions(
+                coefficient_matrix,
+                coefficient_rows,
+                integer_constant_rows
+            )
+
+        if integer_solution_rows is None:
+            return None
+
+    return [
+        [entry / denominator for entry, denominator in
+         zip(row, constant_denominators)]
+        for row in integer_solution_rows
+    ]
+
+def exact_elimination_solutions(coefficient_matrix, coefficient_rows,
+                                integer_constant_rows):
+    '''
+    This function solves square linear systems that share a coefficient
+    matrix when lifting could not, after checking exactly that the
+    coefficient matrix is invertible. The solutions are the constant columns
+    of the reduced row echelon form of [A | B].
+    Args:
+        coefficient_matrix: an elimination.ScaledMatrix holding the square
+        coefficient matrix.
+        coefficient_rows: a list of rows that are lists of ints holding the
+        coefficient matrix with each row multiplied by its row scale.
+        integer_constant_rows: a list of rows that are lists of ints holding
+        the constant columns, multiplied the same way.
+    Returns:
+        a list of rows that are lists of Fractions holding the solution for
+        each constant column, or None if the coefficient matrix is singular.
+    '''
+
+    if backends.select_backend(coefficient_matrix, False).determinant(
+        coefficient_matrix
+    ) == 0:
+        return None
+
+    dimension = len(coefficient_rows)
+
+    augmented_matrix = elimination.ScaledMatrix(
+        [coefficient_row + constant_row for coefficient_row, constant_row in
+         zip(coefficient_rows, integer_constant_rows)],
+        [1] * dimension
+    )
+
+    reduced_result = backends.select_backend(
+        augmented_matrix,
+        False
+    ).reduced_row_echelon_form(augmented_matrix)
+
+    return [list(row) for row in reduced_result.matrix[:, dimension:]]
+
+def batch_solutions(linear_systems, output_decimal, factorization = None):
+    '''
+    This function solves many square linear systems that share a coefficient
+    matrix. The coefficient matrix is held in as many columns as there are
+    equations, and every column after them holds the constants of one system.
+    The coefficient matrix is factored once for every system.
+    Args:
+        linear_systems: a DataFrame whose first columns hold the coefficient
+        matrix, named after its variables, and whose last columns each hold
+        the constants of one system.
+        output_decimal: a boolean that is True if the user wants their output
+        as decimals and False if they want it as fractions.
+        factorization: a calculations.Factorization of the matrix the matrix
+        is read from, or None.
+    Returns:
+        a DataFrame whose first column holds the variable names and whose
+        other columns hold the solution of the system with the constants in
+        the column of the same name.
+    '''
+
+    if linear_systems.empty:
+        return linear_systems
+
+    dimension = linear_systems.shape[0]
+
+    if linear_systems.shape[1] <= dimension:
+
+        error_frame = pd.DataFrame()
+
+        error_frame[""] = []
+
+        calculations.name_error_column(
+            error_frame = error_frame,
+            error_message = "Your matrix must have one column of " + \
+            "coefficients for each equation, followed by at least one " + \
+            "column of constants."
+        )
+
+        return error_frame
+
+    column_names = list(linear_systems.columns)
+
+    variable_names = column_names[:dimension]
+
+    constant_names = column_names[dimension:]
+
+    scaled_systems = calculations.parsed_matrix(linear_systems, factorization)
+
+    if scaled_systems is None:
+        return calculations.invalid_number_frame()
+
+    coefficient_matrix = scaled_systems.column_range(0, dimension)
+
+    constant_matrix = scaled_systems.column_range(dimension,
+                                                  linear_systems.shape[1])
+
+    constant_rows = [
+        [Fraction(int(constant), row_scale) for constant in row]
+        for row, row_scale in zip(constant_matrix.rows,
+                                  constant_matrix.row_scales)
+    ]
+
+    solution_rows = square_system_solutions(coefficient_matrix, constant_rows)
+
+    # Without an invertible coefficient matrix, each system has either no
+    # solution or infinitely many, which the linear system solver describes.
+    if solution_rows is None:
+
+        singular_array = np.array([["The coefficient matrix is not " + \
+                                    "invertible, so no system has exactly " + \
+                                    "one solution. Please solve each " + \
+                                    "system with the linear system solver."]])
+
+        singular_frame = pd.DataFrame(
+            data = singular_array,
+            columns = ["Solutions"]
+        )
+
+        return singular_frame
+
+    solution_array = np.array(solution_rows, dtype = object)
+
+    if output_decimal:
+        calculations.convert_fractions_to_decimal(solution_array)
+
+    solution_frame = pd.DataFrame(
+        data = solution_array,
+        columns = constant_names
+    )
+
+    solution_frame.insert(
+        0,
+        "Variable",
+        variable_names,
+        allow_duplicates = True
+    )
+
+    return solution_frame
@@ -0,0 +1,835 @@
+'''
+This file contains the multi-modular engine used for large integer
+matrices. Calculations are done modulo several primes that fit in a machine
+word using vectorized int64 numpy arithmetic, and the exact answer is rebuilt
+from the results with the Chinese Remainder Theorem.
+'''
+
+import numpy as np
+
+from fractions import Fraction
+from math import isqrt, lcm
+
+# Primes are kept below 2 ** 31 so that the product of two residues always
+# fits in an int64 without overflowing.
+PRIME_LIMIT = 2 ** 31
+
+# This is the most primes whose elimination is done together in one set of
+# numpy arrays.
+PRIME_BATCH_SIZE = 16
+
+# Primes used by p-adic lifting are kept below 2 ** 21 so that a dot product
+# of a row of residues with a vector of residues fits in an int64 for any
+# matrix with fewer than 2 ** 21 columns.
+LIFTING_PRIME_LIMIT = 2 ** 21
+
+# Primes are found once and stored here so that later calculations can reuse
+# them. The keys are the limits the primes are below.
+found_primes = {}
+
+# This is how many primes are tried when inverting a coefficient matrix for
+# p-adic lifting before it is treated as singular.
+LIFTING_PRIME_ATTEMPTS = 3
+
+def is_prime(number):
+    '''
+    This function checks if a number below 3,215,031,751 is prime using the
+    Miller-Rabin test. For numbers this small, testing the bases 2, 3, 5 and 7
+    is known to give the right answer every time.
+    Args:
+        number: a positive int below 3,215,031,751.
+    Returns:
+        a boolean that is True if number is prime and False otherwise.
+    '''
+
+    if number < 2:
+        return False
+
+    for small_prime in (2, 3, 5, 7):
+        if number % small_prime == 0:
+            return number == small_prime
+
+    # number - 1 is written as odd_part * 2 ** power_of_two.
+    odd_part = number - 1
+    power_of_two = 0
+
+    while odd_part % 2 == 0:
+        odd_part //= 2
+        power_of_two += 1
+
+    for base in (2, 3, 5, 7):
+
+        result = pow(base, odd_part, number)
+
+        if result == 1 or result == number - 1:
+            continue
+
+        for i in range(power_of_two - 1):
+            result = result * result % number
+
+            if result == number - 1:
+                break
+
+        else:
+            return False
+
+    return True
+
+def prime(index, limit = PRIME_LIMIT):
+    '''
+    This function returns the prime at a given position in the list of
+    primes used by the multi-modular engine. These are the largest primes
+    below a limit in decreasing order.
+    Args:
+        index: an int that is the position of the prime.
+        limit: an int that every prime in the list is below.
+    Returns:
+        an int that is the prime at that position.
+    '''
+
+    primes = found_primes.setdefault(limit, [])
+
+    # Primes are only searched for when a position past the end of the list
+    # of found primes is asked for.
+    while len(primes) <= index:
+
+        if primes:
+            candidate = primes[-1] - 2
+
+        else:
+            candidate = limit - 1
+
+        while not is_prime(candidate):
+            candidate -= 2
+
+        primes.append(candidate)
+
+    return primes[index]
+
+def reduce_modulo(integer_rows, moduli):
+    '''
+    This function reduces a matrix of Python ints modulo several primes at
+    once and stores the results in an int64 numpy array.
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+        moduli: a list of ints that are the primes the matrix is reduced
+        modulo.
+    Returns:
+        a 3d numpy array of int64 whose first index is the position of the
+        prime in moduli and whose other two indices are the row and column of
+        the entry.
+    '''
+
+    # Python ints can be too large to fit in an int64, so the reduction is
+    # done on an object array before the type is changed.
+    object_array = np.array(integer_rows, dtype = object)
+
+    return np.array(
+        [(object_array % modulus).astype(np.int64) for modulus in moduli]
+    )
+
+def determinants_modulo(residue_stack, moduli):
+    '''
+    This function calculates the determinant of a square matrix modulo
+    several primes with Gaussian elimination over the integers modulo each
+    prime. The matrices for every prime are eliminated together, and each
+    pivot step updates every row below the pivot at once as an outer product.
+    Args:
+        residue_stack: a 3d numpy array of int64 as returned by reduce_modulo.
+        This array is modified in place.
+        moduli: a list of ints that are primes below PRIME_LIMIT.
+    Returns:
+        a list of ints holding the determinant modulo each prime.
+    '''
+
+    prime_count, dimension = residue_stack.shape[0], residue_stack.shape[1]
+
+    prime_indices = np.arange(prime_count)
+
+    # The moduli are given extra dimensions so that they line up with the
+    # rows and entries they reduce.
+    modulus_column = np.array(moduli, dtype = np.int64)[:, None]
+    modulus_block = modulus_column[:, :, None]
+
+    determinants = [1] * prime_count
+
+    for corner in range(dimension):
+
+        # Over the integers modulo a prime any nonzero entry can be a pivot,
+        # so the first one in the corner column is used for each prime.
+        nonzero_entries = residue_stack[:, corner:, corner] != 0
+
+        pivot_rows = corner + np.argmax(nonzero_entries, axis = 1)
+
+        # The corner row and pivot row are swapped for every prime at once.
+        # Where they are the same row this changes nothing.
+        corner_rows = residue_stack[prime_indices, corner].copy()
+
+        residue_stack[prime_indices, corner] = \
+            residue_stack[prime_indices, pivot_rows]
+
+        residue_stack[prime_indices, pivot_rows] = corner_rows
+
+        pivots = residue_stack[:, corner, corner]
+
+        pivot_inverses = np.zeros(prime_count, dtype = np.int64)
+
+        for i in range(prime_count):
+
+            pivot = int(pivots[i])
+
+            # Each row swap changes the sign of the determinant. If there is
+            # no nonzero pivot, the determinant modulo this prime is 0.
+            if pivot_rows[i] != corner:
+                determinants[i] = -determinants[i]
+
+            determinants[i] = determinants[i] * pivot % moduli[i]
+
+            # Multiplying by the inverse of the pivot modulo the prime takes
+            # the place of dividing by the pivot.
+            if pivot != 0:
+                pivot_inverses[i] = pow(pivot, -1, moduli[i])
+
+        ratios = residue_stack[:, corner + 1:, corner] * \
+            pivot_inverses[:, None] % modulus_column
+
+        # Entries are below 2 ** 31, so each product is below 2 ** 62 and the
+        # difference still fits in an int64. This means only one reduction
+        # is needed for each update.
+        residue_stack[:, corner + 1:, corner:] = (
+            residue_stack[:, corner + 1:, corner:] -
+            ratios[:, :, None] * residue_stack[:, corner, None, corner:]
+        ) % modulus_block
+
+    return determinants
+
+def hadamard_bound_squared(integer_rows):
+    '''
+    This function calculates the square of the Hadamard bound of a square
+    matrix, the product of the squared lengths of its rows. The absolute value
+    of the determinant of the matrix is never larger than the Hadamard bound.
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+    Returns:
+        an int that is the square of the Hadamard bound.
+    '''
+
+    bound_squared = 1
+
+    for row in integer_rows:
+        bound_squared *= sum(entry * entry for entry in row)
+
+    return bound_squared
+
+def multi_modular_determinant(integer_rows, row_scales):
+    '''
+    This function calculates the determinant of a square matrix by finding
+    it modulo several primes and combining the results with the Chinese
+    Remainder Theorem. Primes are added until their product is more than twice
+    the Hadamard bound, at which point only one integer in the range the
+    determinant can be in matches every result.
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+        row_scales: a list holding the int each row of the original matrix was
+        multiplied by to make it a matrix of ints.
+    Returns:
+        a Fraction holding the determinant of the original matrix.
+    '''
+
+    bound_squared = hadamard_bound_squared(integer_rows)
+
+    # A matrix with a zero row has a determinant of 0.
+    if bound_squared == 0:
+        return Fraction(0)
+
+    total_scale = 1
+
+    for row_scale in row_scales:
+        total_scale *= row_scale
+
+    # The determinant is between -bound and bound, so the residues identify
+    # it once the product of the primes is larger than 2 * bound. Both sides
+    # are squared so that no square root is needed. The primes needed are
+    # chosen before any elimination is done.
+    moduli = []
+    combined_modulus = 1
+
+    while combined_modulus * combined_modulus <= 4 * bound_squared:
+
+        moduli.append(prime(len(moduli)))
+
+        combined_modulus *= moduli[-1]
+
+    # combined_residue is the determinant modulo the product of every prime
+    # handled so far. The primes are handled in batches so that the array
+    # holding the matrix modulo each prime in a batch stays small.
+    combined_residue = 0
+    handled_modulus = 1
+
+    for batch_start in range(0, len(moduli), PRIME_BATCH_SIZE):
+
+        batch_moduli = moduli[batch_start : batch_start + PRIME_BATCH_SIZE]
+
+        batch_determinants = determinants_modulo(
+            reduce_modulo(integer_rows, batch_moduli),
+            batch_moduli
+        )
+
+        for modulus, residue in zip(batch_moduli, batch_determinants):
+            combined_residue, handled_modulus = chinese_remainder(
+                combined_residue,
+                handled_modulus,
+                residue,
+                modulus
+            )
+
+    # The residue is moved to the range centered on 0 so that negative
+    # determinants are recovered.
+    if combined_residue > combined_modulus // 2:
+        combined_residue -= combined_modulus
+
+    return Fraction(combined_residue, total_scale)
+
+def chinese_remainder(first_residue, first_modulus, second_residue,
+                      second_modulus):
+    '''
+    This function combines a number known modulo two coprime moduli into the
+    number modulo their product.
+    Args:
+        first_residue: an int that is the number modulo first_modulus.
+        first_modulus: a positive int.
+        second_residue: an int that is the number modulo second_modulus.
+        second_modulus: a positive int coprime to first_modulus.
+    Returns:
+        a tuple whose first item is the number modulo the product of the
+        moduli and whose second item is that product.
+    '''
+
+    # The first residue is corrected by a multiple of first_modulus so that it
+    # also matches the second residue.
+    correction = (second_residue - first_residue) * \
+        pow(first_modulus, -1, second_modulus) % second_modulus
+
+    combined_modulus = first_modulus * second_modulus
+
+    return (first_residue + first_modulus * correction) % combined_modulus, \
+        combined_modulus
+
+def reduced_row_echelon_modulo(residue_stack, moduli):
+    '''
+    This function brings a matrix to reduced row echelon form modulo several
+    primes at once with Gauss-Jordan elimination. A column is treated as a
+    pivot column if it has a pivot modulo any of the primes. Primes where it
+    does not are primes where a nonzero number happened to be a multiple of
+    the prime, so they are dropped.
+    Args:
+        residue_stack: a 3d numpy array of int64 as returned by reduce_modulo.
+        moduli: a list of ints that are primes below PRIME_LIMIT.
+    Returns:
+        a tuple whose first item is the 3d numpy array holding the reduced
+        row echelon form modulo each prime that was kept, whose second item is
+        the list of those primes, and whose third item is the list of pivot
+        columns.
+    '''
+
+    moduli = np.array(moduli, dtype = np.int64)
+
+    row_count, column_count = residue_stack.shape[1], residue_stack.shape[2]
+
+    pivot_columns = []
+
+    corner_row = 0
+    corner_column = 0
+
+    while corner_row < row_count and corner_column < column_count and \
+        moduli.size > 0:
+
+        nonzero_entries = residue_stack[:, corner_row:, corner_column] != 0
+
+        has_pivot = np.any(nonzero_entries, axis = 1)
+
+        # If no prime has a nonzero number in the corner column, it is a zero
+        # column.
+        if not np.any(has_pivot):
+            corner_column += 1
+            continue
+
+        # Primes without a pivot in this column are dropped.
+        if not np.all(has_pivot):
+            residue_stack = residue_stack[has_pivot]
+            moduli = moduli[has_pivot]
+            nonzero_entries = nonzero_entries[has_pivot]
+
+        prime_indices = np.arange(moduli.size)
+
+        modulus_column = moduli[:, None]
+
+        pivot_rows = corner_row + np.argmax(nonzero_entries, axis = 1)
+
+        # The corner row and the pivot row are swapped for every prime.
+        corner_rows = residue_stack[prime_indices, corner_row].copy()
+
+        residue_stack[prime_indices, corner_row] = \
+            residue_stack[prime_indices, pivot_rows]
+
+        residue_stack[prime_indices, pivot_rows] = corner_rows
+
+        # The pivot row is multiplied by the inverse of its pivot so that the
+        # pivot is 1.
+        pivot_inverses = np.array(
+            [pow(int(pivot), -1, int(modulus)) for pivot, modulus in
+             zip(residue_stack[:, corner_row, corner_column], moduli)],
+            dtype = np.int64
+        )
+
+        residue_stack[:, corner_row, corner_column:] = \
+            residue_stack[:, corner_row, corner_column:] * \
+            pivot_inverses[:, None] % modulus_column
+
+        # Every other row has the pivot row times its entry in the corner
+        # column subtracted from it. Entries to the left of the corner column
+        # in the pivot row are 0, so only the entries from the corner column
+        # on change.
+        ratios = residue_stack[:, :, corner_column].copy()
+
+        ratios[:, corner_row] = 0
+
+        residue_stack[:, :, corner_column:] = (
+            residue_stack[:, :, corner_column:] -
+            ratios[:, :, None] *
+            residue_stack[:, corner_row, None, corner_column:]
+        ) % modulus_column[:, :, None]
+
+        pivot_columns.append(corner_column)
+
+        corner_row += 1
+        corner_column += 1
+
+    return residue_stack, moduli.tolist(), pivot_columns
+
+def rational_reconstruction(residue, modulus, bound):
+    '''
+    This function finds the fraction n / d with |n| and d at most bound
+    that is equal to residue modulo modulus, if there is one. It does so with
+    the extended Euclidean algorithm, stopping halfway.
+    Args:
+        residue: an int between 0 and modulus - 1.
+        modulus: a positive int.
+        bound: a positive int where 2 * bound ** 2 is less than modulus so
+        that there is at most one such fraction.
+    Returns:
+        a Fraction if one is found and None otherwise.
+    '''
+
+    previous_remainder, remainder = modulus, residue
+    previous_coefficient, coefficient = 0, 1
+
+    while remainder > bound:
+        quotient = previous_remainder // remainder
+
+        previous_remainder, remainder = \
+            remainder, previous_remainder - quotient * remainder
+
+        previous_coefficient, coefficient = \
+            coefficient, previous_coefficient - quotient * coefficient
+
+    if coefficient == 0 or abs(coefficient) > bound:
+        return None
+
+    return Fraction(remainder, coefficient)
+
+def pivot_columns_precede(first_pivots, second_pivots):
+    '''
+    This function checks if a list of pivot columns found modulo one prime
+    comes before a list found modulo another. The true pivot columns always
+    come first, since modulo a bad prime a pivot can only be missed, which
+    moves it later or removes it.
+    Args:
+        first_pivots: a list of column indices.
+        second_pivots: a list of column indices.
+    Returns:
+        a boolean that is True if first_pivots comes first.
+    '''
+
+    for first_pivot, second_pivot in zip(first_pivots, second_pivots):
+        if first_pivot != second_pivot:
+            return first_pivot < second_pivot
+
+    return len(first_pivots) > len(second_pivots)
+
+def multi_modular_reduced_row_echelon_form(integer_rows):
+    '''
+    This function brings a matrix of ints to reduced row echelon form by
+    finding it modulo several primes, combining the results with the Chinese
+    Remainder Theorem, and recovering each fraction with rational
+    reconstruction. The result is checked exactly against the input before
+    it is returned.
+    Args:
+        integer_rows: a list of rows that are lists of ints. Multiplying rows
+        by nonzero numbers does not change reduced row echelon form, so rows
+        scaled to clear denominators can be passed.
+    Returns:
+        a tuple whose first item is a list of rows that are lists of Fractions
+        holding the reduced row echelon form and whose second item is the list
+        of pivot columns, or None if it could not be verified.
+    '''
+
+    integer_array = np.array(integer_rows, dtype = object)
+
+    row_count, column_count = integer_array.shape
+
+    # Every number in reduced row echelon form is a ratio of two minors of
+    # the matrix, and no minor is larger than the product of the lengths of
+    # the nonzero rows. Once the product of the primes is larger than twice
+    # the square of this bound, rational reconstruction is certain to find
+    # the right fractions.
+    bound_squared = 1
+
+    for row in integer_rows:
+        row_length_squared = sum(entry * entry for entry in row)
+
+        if row_length_squared != 0:
+            bound_squared *= row_length_squared
+
+    best_pivots = None
+
+    combined_residues = None
+    combined_modulus = 1
+
+    prime_index = 0
+
+    while combined_modulus <= 2 * bound_squared or \
+        combined_residues is None:
+
+        batch_moduli = [prime(prime_index + i) for i in
+                        range(PRIME_BATCH_SIZE)]
+
+        prime_index += PRIME_BATCH_SIZE
+
+        residue_stack, batch_moduli, batch_pivots = \
+            reduced_row_echelon_modulo(
+                reduce_modulo(integer_rows, batch_moduli),
+                batch_moduli
+            )
+
+        # Results from primes whose pivot columns come after the best pivot
+        # columns found so far are wrong, so they are not used. If this batch
+        # found better pivot columns, every earlier result was wrong.
+        if best_pivots is not None and \
+            pivot_columns_precede(best_pivots, batch_pivots):
+            continue
+
+        if best_pivots != batch_pivots:
+            best_pivots = batch_pivots
+            combined_residues = None
+            combined_modulus = 1
+
+        rank = len(best_pivots)
+
+        pivot_set = set(best_pivots)
+
+        free_columns = [j for j in range(column_count) if j not in pivot_set]
+
+        # Only the entries in free columns of the pivot rows need to be
+        # recovered. Every other entry is either 0 or a pivot of 1.
+        for i, modulus in enumerate(batch_moduli):
+
+            residues = residue_stack[i][:rank, free_columns].astype(object)
+
+            if combined_residues is None:
+                combined_residues = residues % modulus
+                combined_modulus = modulus
+
+            else:
+                combined_residues, combined_modulus = chinese_remainder(
+                    combined_residues,
+                    combined_modulus,
+                    residues,
+                    modulus
+                )
+
+        free_values = reconstruct_fractions(
+            combined_residues,
+            combined_modulus
+        )
+
+        if free_values is None:
+            continue
+
+        rref_rows = [[Fraction(0)] * column_count for i in range(row_count)]
+
+        for i, pivot_column in enumerate(best_pivots):
+
+            rref_rows[i][pivot_column] = Fraction(1)
+
+            for j, free_column in enumerate(free_columns):
+                rref_rows[i][free_column] = free_values[i][j]
+
+        if reduced_rows_verified(integer_array, rref_rows, best_pivots,
+                                 free_columns):
+            return rref_rows, best_pivots
+
+    # This is only reached if the result could not be verified even with
+    # enough primes, which would mean the pivot columns found were wrong.
+    return None
+
+def reconstruct_fractions(residue_array, modulus):
+    '''
+    This function recovers the fraction each residue in an array stands for.
+    A common denominator is kept as the entries are recovered, so most entries
+    only need one multiplication rather than a full rational reconstruction.
+    Args:
+        residue_array: a 2d numpy array of ints between 0 and modulus - 1.
+        modulus: a positive int.
+    Returns:
+        a list of rows that are lists of Fractions, or None if any residue
+        does not stand for a small enough fraction.
+    '''
+
+    bound = isqrt(modulus // 2)
+
+    common_denominator = 1
+
+    fraction_rows = []
+
+    for residue_row in residue_array:
+
+        fraction_row = []
+
+        for residue in residue_row:
+
+            # Multiplying by the common denominator gives the numerator
+            # directly if the denominator of this entry divides it.
+            scaled_residue = int(residue) * common_denominator % modulus
+
+            if scaled_residue > modulus // 2:
+                scaled_residue -= modulus
+
+            if abs(scaled_residue) <= bound:
+                fraction_row.append(Fraction(scaled_residue,
+                                             common_denominator))
+                continue
+
+            fraction = rational_reconstruction(
+                scaled_residue % modulus,
+                modulus,
+                bound
+            )
+
+            if fraction is None:
+                return None
+
+            common_denominator *= fraction.denominator
+
+            if common_denominator > bound:
+                return None
+
+            fraction_row.append(Fraction(fraction.numerator,
+                                         common_denominator))
+
+        fraction_rows.append(fraction_row)
+
+    return fraction_rows
+
+def reduced_rows_verified(integer_array, rref_rows, pivot_columns,
+                          free_columns):
+    '''
+    This function checks exactly that a matrix in reduced row echelon form
+    is row equivalent to a matrix of ints. It checks that every column of the
+    input is the combination of its pivot columns given by the reduced row
+    echelon form. This shows the rows of the input are combinations of the
+    rows of the result, and since the result has as many rows as the input's
+    rank modulo a prime, the row spaces are the same.
+    Args:
+        integer_array: a 2d numpy object array of ints holding the input.
+        rref_rows: a list of rows that are lists of Fractions.
+        pivot_columns: a list of the pivot column indices.
+        free_columns: a list of the column indices that are not pivot columns.
+    Returns:
+        a boolean that is True if the result is verified.
+    '''
+
+    rank = len(pivot_columns)
+
+    # If no pivots were found, the input must be a zero matrix.
+    if rank == 0:
+        return not np.any(integer_array != 0)
+
+    # If every column is a pivot column, each column is trivially the
+    # combination of the pivot columns.
+    if len(free_columns) == 0:
+        return True
+
+    # The free column entries are written over a common denominator so that
+    # the check only uses ints.
+    common_denominator = 1
+
+    for row in rref_rows[:rank]:
+        for free_column in free_columns:
+            common_denominator = lcm(
+                common_denominator,
+                row[free_column].denominator
+            )
+
+    numerator_array = np.array(
+        [[int(row[free_column] * common_denominator)
+          for free_column in free_columns] for row in rref_rows[:rank]],
+        dtype = object
+    )
+
+    return np.array_equal(
+        integer_array[:, pivot_columns].dot(numerator_array),
+        integer_array[:, free_columns] * common_denominator
+    )
+
+def inverse_modulo_prime(integer_rows):
+    '''
+    This function inverts a square matrix of ints modulo a prime by bringing
+    it next to the identity matrix to reduced row echelon form. If it is
+    singular modulo a few different primes, it is almost certainly singular.
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+    Returns:
+        a tuple whose first item is the prime and whose second item is a 2d
+        numpy int64 array holding the inverse modulo it, or None if the
+        matrix is singular modulo every prime tried.
+    '''
+
+    dimension = len(integer_rows)
+
+    augmented_rows = [
+        row + [1 if j == i else 0 for j in range(dimension)]
+        for i, row in enumerate(integer_rows)
+    ]
+
+    for prime_index in range(LIFTING_PRIME_ATTEMPTS):
+
+        candidate = prime(prime_index, LIFTING_PRIME_LIMIT)
+
+        residue_stack, kept_moduli, pivot_columns = \
+            reduced_row_echelon_modulo(
+                reduce_modulo(augmented_rows, [candidate]),
+                [candidate]
+            )
+
+        if pivot_columns[:dimension] == list(range(dimension)):
+            return candidate, residue_stack[0][:, dimension:]
+
+    return None
+
+def dixon_solve(integer_rows, constants, modular_inverse = None):
+    '''
+    This function solves a square linear system with Dixon's p-adic lifting.
+    The coefficient matrix is inverted once modulo a prime p. Each step then
+    finds the next base p digit of the solution with a matrix-vector product
+    modulo p and removes it from the constants, which are then divided by p.
+    Once enough digits are found, the solution is recovered with rational
+    reconstruction and checked exactly.
+    Args:
+        integer_rows: a list of rows that are lists of ints holding the
+        coefficient matrix.
+        constants: a list of ints holding the constant column.
+        modular_inverse: the tuple inverse_modulo_prime returned for the
+        coefficient matrix, if it was already found. If it is None, it is
+        found here.
+    Returns:
+        a list of Fractions holding the solution, or None if the coefficient
+        matrix is singular.
+    '''
+
+    dimension = len(integer_rows)
+
+    # The solution is a ratio of minors of the augmented matrix, none of
+    # which is larger than the product of the lengths of its rows.
+    bound_squared = 1
+
+    for row, constant in zip(integer_rows, constants):
+        bound_squared *= sum(entry * entry for entry in row) + \
+            constant * constant
+
+    if modular_inverse is None:
+        modular_inverse = inverse_modulo_prime(integer_rows)
+
+    if modular_inverse is None:
+        return None
+
+    modulus, inverse_residues = modular_inverse
+
+    integer_array = np.array(integer_rows, dtype = object)
+
+    # When the coefficients are small enough, the product of the coefficient
+    # matrix and a vector of digits is done in int64.
+    largest_coefficient = max(abs(entry) for row in integer_rows
+                              for entry in row)
+
+    if largest_coefficient * modulus * dimension < 2 ** 62:
+        integer_array = integer_array.astype(np.int64)
+
+    remaining_constants = np.array(constants, dtype = object)
+
+    solution_residues = np.zeros(dimension, dtype = object)
+
+    digit_place = 1
+
+    step = 0
+
+    while digit_place <= 2 * bound_squared:
+
+        # The next digit of the solution is the solution modulo p of the
+        # system with the remaining constants.
+        digits = inverse_residues.dot(
+            (remaining_constants % modulus).astype(np.int64)
+        ) % modulus
+
+        solution_residues = solution_residues + \
+            digits.astype(object) * digit_place
+
+        # Subtracting the coefficient matrix times the digits makes every
+        # remaining constant divisible by p.
+        remaining_constants = (
+            remaining_constants - integer_array.dot(digits).astype(object)
+        ) // modulus
+
+        digit_place *= modulus
+
+        step += 1
+
+        # Small solutions are found long before the bound is reached, so
+        # the solution is checked each time the number of steps doubles.
+        if step & (step - 1) == 0 or digit_place > 2 * bound_squared:
+
+            solution = reconstruct_fractions(
+                [solution_residues],
+                digit_place
+            )
+
+            if solution is not None and \
+                solution_verified(integer_rows, constants, solution[0]):
+                return solution[0]
+
+    return None
+
+def solution_verified(integer_rows, constants, solution):
+    '''
+    This function checks exactly that a vector of Fractions solves a linear
+    system.
+    Args:
+        integer_rows: a list of rows that are lists of ints holding the
+        coefficient matrix.
+        constants: a list of ints holding the constant column.
+        solution: a list of Fractions.
+    Returns:
+        a boolean that is True if the vector solves the system.
+    '''
+
+    common_denominator = lcm(*[entry.denominator for entry in solution])
+
+    numerators = np.array(
+        [int(entry * common_denominator) for entry in solution],
+        dtype = object
+    )
+
+    return np.array_equal(
+        np.array(integer_rows, dtype = object).dot(numerators),
+        np.array(constants, dtype = object) * common_denominator
+    )
@@ -0,0 +1,489 @@
+'''
+This file contains the cache of calculation results shared by every session
+of the app. Students in the same course often enter the same matrices, so a
+result calculated for one of them is kept in memory and given to the next
+user who asks for it rather than calculated again.
+'''
+
+import hashlib
+import importlib.util
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+import elimination
+
+from collections import OrderedDict
+
+# The cache holds results until their estimated total size passes this many
+# bytes. Then the results used least recently are removed.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# The persistent cache keeps results on disk, so it can hold more of them.
+DEFAULT_PERSISTENT_MAX_BYTES = 512 * 1024 * 1024
+
+# These are the modules whose code the cached results depend on. A module
+# added to the calculations must be added here too.
+CALCULATION_MODULE_NAMES = [
+    "calculations",
+    "elimination",
+    "backends",
+    "float_engine",
+    "modular",
+    "sparse_engine",
+    "block_diagonal",
+    "structure",
+    "banded",
+    "linear_systems",
+    "subspaces",
+    "result_cache"
+]
+
+def calculation_version(module_names):
+    '''
+    This function finds a number that changes whenever the code of the
+    calculations changes. The modules are found without being imported, since
+    some of them import this module.
+    Args:
+        module_names: a list of the names of the modules.
+    Returns:
+        an int made from the first 60 bits of a hash of the source files of
+        the modules, so that it fits in a SQLite integer.
+    '''
+
+    source_hash = hashlib.sha256()
+
+    for module_name in module_names:
+        with open(importlib.util.find_spec(module_name).origin, "rb") as \
+            source_file:
+            source_hash.update(source_file.read())
+
+    return int(source_hash.hexdigest()[:15], 16)
+
+# This number is part of every persistent cache key. It is found from the
+# code of the calculations, so any change to them that could change a result
+# keeps the results saved by the old calculations from being used.
+CACHE_VERSION = calculation_version(CALCULATION_MODULE_NAMES)
+
+# This object is returned by lookups for keys that are not held. It is never
+# held itself, so a result of None, such as the inverse of a singular matrix,
+# can be held and told apart from a result that was never calculated.
+NOT_HELD = object()
+
+# If this environment variable is set, results are also saved in a SQLite
+# database in the directory it names so they are kept when the app restarts.
+PERSISTENT_CACHE_DIRECTORY_VARIABLE = "LINEAR_ALGEBRA_CACHE_DIRECTORY"
+
+# This is the name of the database file in that directory.
+PERSISTENT_CACHE_FILE_NAME = "result_cache.sqlite3"
+
+def scaled_matrix_hash(scaled_matrix, column_names = ()):
+    '''
+    This function finds a hash of a matrix read from user input that only
+    depends on the numbers in it and its column names, so the same matrix gets
+    the same hash however its entries were written. It is found from the
+    matrix once it has been read, so the input is not read again for it.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+        column_names: the column names of the matrix, which are part of the
+        hash since some outputs show them.
+    Returns:
+        a string holding the hash in hexadecimal.
+    '''
+
+    # Each row is held as ints divided by the least common multiple of the
+    # denominators in the row, which is the same for every way of writing the
+    # same numbers. Rows of Python ints that fit in int64 are put in an int64
+    # array so that they are hashed the same way as rows read into one, from
+    # the bytes of the array rather than from a string of every entry.
+    rows = scaled_matrix.rows
+
+    if not isinstance(rows, np.ndarray) and scaled_matrix.entry_bits() < 63:
+        rows = np.array(rows, dtype = np.int64).reshape(scaled_matrix.shape)
+
+    matrix_hash = hashlib.sha256(repr((
+        scaled_matrix.shape,
+        [str(column_name) for column_name in column_names],
+        list(scaled_matrix.row_scales)
+    )).encode())
+
+    if isinstance(rows, np.ndarray):
+        matrix_hash.update(np.ascontiguousarray(rows, dtype = np.int64).data)
+
+    else:
+        matrix_hash.update(repr(rows).encode())
+
+    return matrix_hash.hexdigest()
+
+def result_key(matrix_hash, function, output_decimal):
+    '''
+    Args:
+        matrix_hash: the string returned by scaled_matrix_hash for the input
+        matrix.
+        function: the function that calculates the result.
+        output_decimal: a boolean that is True if the result is outputted as
+        decimals.
+    Returns:
+        a tuple that identifies the result in the cache.
+    '''
+
+    return (
+        matrix_hash,
+        function.__module__ + "." + function.__qualname__,
+        "decimal" if output_decimal else "fraction"
+    )
+
+def result_size(result):
+    '''
+    This function estimates how many bytes of memory a result takes up.
+    Args:
+        result: a DataFrame, a number or a string returned by a calculation
+        function, or a numpy array, elimination.PLUFactorization or tuple of
+        them held for later calculations.
+    Returns:
+        an int that is the estimated number of bytes.
+    '''
+
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index = True, deep = True).sum()) + \
+            sum(sys.getsizeof(column_name) for column_name in result.columns)
+
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+
+    if isinstance(result, tuple):
+        return sum(result_size(item) for item in result)
+
+    if isinstance(result, elimination.PLUFactorization):
+        return result_size(result.packed_array)
+
+    return sys.getsizeof(result)
+
+def copy_result(result):
+    '''
+    Args:
+        result: a DataFrame, a number or a string returned by a calculation
+        function, or a numpy array, elimination.PLUFactorization or tuple of
+        them held for later calculations.
+    Returns:
+        a copy of the result if it can be changed, since the outputs change
+        the column names of the frames they display and results held for
+        later calculations are updated, and the result itself otherwise,
+        since numbers and strings cannot be changed.
+    '''
+
+    if isinstance(result, (pd.DataFrame, np.ndarray)):
+        return result.copy()
+
+    if isinstance(result, tuple):
+        return tuple(copy_result(item) for item in result)
+
+    if isinstance(result, elimination.PLUFactorization):
+        return elimination.PLUFactorization(
+            result.packed_array.copy(),
+            result.row_permutation.copy(),
+            result.pivot_columns.copy(),
+            result.row_swaps
+        )
+
+    return result
+
+class ResultCache:
+    '''
+    This class holds calculation results in least recently used order and
+    removes the least recently used results once their total size is larger
+    than its limit. A lock is held whenever the results are read or changed,
+    so the cache can be shared by sessions running on different threads.
+    '''
+
+    def __init__(self, max_bytes = DEFAULT_MAX_BYTES, persistent_cache = None):
+        '''
+        Args:
+            max_bytes: an int that is the largest total estimated size of the
+            results held.
+            persistent_cache: a PersistentResultCache that results not held in
+            memory are looked up in and that every new result is saved to, or
+            None.
+        '''
+        self.max_bytes = max_bytes
+        self.persistent_cache = persistent_cache
+        self.total_bytes = 0
+
+        # Each key maps to a tuple of the result and its estimated size. The
+        # most recently used results are at the end.
+        self.entries = OrderedDict()
+
+        self.lock = threading.Lock()
+
+    def get(self, key, default = None):
+        '''
+        Args:
+            key: a tuple returned by result_key.
+            default: the value returned if no result is held for the key.
+        Returns:
+            a copy of the result held for the key, or default if there is
+            none.
+        '''
+
+        with self.lock:
+            if key not in self.entries:
+                return default
+
+            self.entries.move_to_end(key)
+
+            return copy_result(self.entries[key][0])
+
+    def put(self, key, result):
+        '''
+        This method adds a result to the cache, then removes the least
+        recently used results until the cache is within its size limit.
+        Args:
+            key: a tuple returned by result_key.
+            result: the result to hold. A copy is held so that changes to the
+            result after it is added do not change the cache.
+        '''
+
+        size = result_size(result)
+
+        # A result larger than the whole cache would only remove every other
+        # result before being removed itself.
+        if size > self.max_bytes:
+            return
+
+        result = copy_result(result)
+
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+
+            self.entries[key] = (result, size)
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                self.total_bytes -= self.entries.popitem(last = False)[1][1]
+
+    def held_result(self, key, default = None):
+        '''
+        This method looks a result up in memory and then in the persistent
+        cache without calculating it.
+        Args:
+            key: a tuple returned by result_key.
+            default: the value returned if no result is held for the key.
+        Returns:
+            the result, or default if it is not held.
+        '''
+
+        result = self.get(key, NOT_HELD)
+
+        if result is not NOT_HELD:
+            return result
+
+        # A result saved before the app restarted is brought back into memory.
+        if self.persistent_cache is not None:
+            result = self.persistent_cache.get(key, NOT_HELD)
+
+            if result is not NOT_HELD:
+                self.put(key, result)
+
+                return result
+
+        return default
+
+    def result(self, key, calculate):
+        '''
+        This method returns a result from the cache, calculating and adding it
+        if it is not held.
+        Args:
+            key: a tuple returned by result_key.
+            calculate: a function that takes no arguments and returns the
+            result.
+        Returns:
+            the result.
+        '''
+
+        # A result of None is held like any other, so a calculation that
+        # returns None is not done again.
+        result = self.held_result(key, NOT_HELD)
+
+        if result is not NOT_HELD:
+            return result
+
+        result = calculate()
+
+        self.put(key, result)
+
+        if self.persistent_cache is not None:
+            self.persistent_cache.put(key, result)
+
+        return result
+
+    def clear(self):
+        '''
+        This method removes every result.
+        '''
+
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+class PersistentResultCache:
+    '''
+    This class saves calculation results in a SQLite database so that they
+    are kept when the app restarts. Results are pickled, and once their total
+    size is larger than its limit, the results used least recently are
+    deleted. Every key includes CACHE_VERSION, and results saved with another
+    version are deleted when the cache is opened.
+    '''
+
+    def __init__(self, directory, max_bytes = DEFAULT_PERSISTENT_MAX_BYTES):
+        '''
+        Args:
+            directory: a string holding the path of the directory the
+            database is kept in. It is created if it does not exist.
+            max_bytes: an int that is the largest total size of the pickled
+            results held.
+        '''
+        self.max_bytes = max_bytes
+
+        os.makedirs(directory, exist_ok = True)
+
+        # One connection is shared by every thread, and the lock makes sure
+        # only one of them uses it at a time.
+        self.connection = sqlite3.connect(
+            os.path.join(directory, PERSISTENT_CACHE_FILE_NAME),
+            check_same_thread = False
+        )
+
+        self.lock = threading.Lock()
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, "
+                "version INTEGER NOT NULL, "
+                "result BLOB NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_by_last_used "
+                "ON results (last_used)"
+            )
+
+            # Results saved by other versions of the calculations may be
+            # wrong now, so they are removed.
+            self.connection.execute(
+                "DELETE FROM results WHERE version != ?",
+                (CACHE_VERSION,)
+            )
+
+    def database_key(self, key):
+        '''
+        Args:
+            key: a tuple returned by result_key.
+        Returns:
+            a string holding the key with CACHE_VERSION in front of it.
+        '''
+
+        return "|".join([str(CACHE_VERSION)] + list(key))
+
+    def get(self, key, default = None):
+        '''
+        Args:
+            key: a tuple returned by result_key.
+            default: the value returned if no result is saved for the key.
+        Returns:
+            the result saved for the key, or default if there is none.
+        '''
+
+        database_key = self.database_key(key)
+
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT result FROM results WHERE key = ?",
+                (database_key,)
+            ).fetchone()
+
+            if row is None:
+                return default
+
+            self.connection.execute(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                (time.time(), database_key)
+            )
+
+        return pickle.loads(row[0])
+
+    def put(self, key, result):
+        '''
+        This method saves a result, then deletes the least recently used
+        results until the total size is within the limit.
+        Args:
+            key: a tuple returned by result_key.
+            result: the result to save.
+        '''
+
+        pickled_result = pickle.dumps(result)
+
+        if len(pickled_result) > self.max_bytes:
+            return
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (self.database_key(key), CACHE_VERSION, pickled_result,
+                 len(pickled_result), time.time())
+            )
+
+            total_bytes = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+
+            # The least recently used results are deleted one at a time until
+            # the rest fit.
+            while total_bytes > self.max_bytes:
+                key_to_delete, size = self.connection.execute(
+                    "SELECT key, size FROM results "
+                    "ORDER BY last_used LIMIT 1"
+                ).fetchone()
+
+                self.connection.execute(
+                    "DELETE FROM results WHERE key = ?",
+                    (key_to_delete,)
+                )
+
+                total_bytes -= size
+
+    def clear(self):
+        '''
+        This method deletes every saved result.
+        '''
+
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM results")
+
+def persistent_cache_from_environment():
+    '''
+    Returns:
+        a PersistentResultCache in the directory named by the environment
+        variable PERSISTENT_CACHE_DIRECTORY_VARIABLE, or None if it is not
+        set.
+    '''
+
+    directory = os.environ.get(PERSISTENT_CACHE_DIRECTORY_VARIABLE)
+
+    if not directory:
+        return None
+
+    return PersistentResultCache(directory)
+
+# This cache is created once when the module is first imported, so every
+# session of the app shares it.
+shared_cache = ResultCache(
+    persistent_cache = persistent_cache_from_environment()
+)
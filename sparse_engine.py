@@ -0,0 +1,228 @@
+'''
+This file contains the sparse exact engine used for matrices that are mostly
+zeros, such as incidence matrices and network flow systems. Each row is held
+as a dictionary from the columns of its nonzero entries to those entries as
+Fractions, so zeros take no memory and row operations only touch the
+nonzero entries. Each pivot row is chosen by the Markowitz rule to keep the
+number of zeros that become nonzero small.
+'''
+
+import numpy as np
+
+from fractions import Fraction
+
+# Matrices with at most this fraction of nonzero entries, and at most
+# SPARSE_MAX_ROW_ENTRIES nonzero entries in each row on average, are handled
+# by the sparse engine. Rows with more entries make so many zeros nonzero
+# during elimination that the matrix soon stops being sparse.
+SPARSE_MAX_DENSITY = 0.1
+SPARSE_MAX_ROW_ENTRIES = 5
+
+# Matrices with fewer entries than this are handled densely even if they are
+# mostly zeros, since there is too little work for the sparse engine to make
+# up for converting the matrix.
+SPARSE_MIN_ENTRIES = 400
+
+def sparse_rows(scaled_matrix):
+    '''
+    This function converts a matrix to sparse rows.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+    Returns:
+        a list holding, for each row, a dictionary from the column index of
+        each nonzero entry to that entry as a Fraction.
+    '''
+
+    rows = []
+
+    for row, row_scale in zip(scaled_matrix.rows, scaled_matrix.row_scales):
+
+        # Rows read into an int64 array are searched for nonzero entries
+        # with numpy rather than one entry at a time.
+        if isinstance(row, np.ndarray):
+            nonzero_columns = np.flatnonzero(row).tolist()
+
+            row = row.tolist()
+
+        else:
+            nonzero_columns = [j for j, entry in enumerate(row) if entry != 0]
+
+        rows.append({j: Fraction(row[j], row_scale) for j in nonzero_columns})
+
+    return rows
+
+def is_sparse(scaled_matrix):
+    '''
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+    Returns:
+        a boolean that is True if the matrix should be handled by the sparse
+        engine.
+    '''
+
+    row_count, column_count = scaled_matrix.shape
+
+    if row_count * column_count < SPARSE_MIN_ENTRIES:
+        return False
+
+    if isinstance(scaled_matrix.rows, np.ndarray):
+        nonzero_count = int(np.count_nonzero(scaled_matrix.rows))
+
+    else:
+        nonzero_count = sum(1 for row in scaled_matrix.rows for entry in row
+                            if entry != 0)
+
+    return nonzero_count <= SPARSE_MAX_DENSITY * row_count * column_count \
+        and nonzero_count <= SPARSE_MAX_ROW_ENTRIES * row_count
+
+def markowitz_row(rows, candidate_rows, column):
+    '''
+    This function chooses the pivot row for a column by the Markowitz rule.
+    The column is fixed, since the pivot columns of reduced row echelon form
+    must be found from left to right, so the rule picks the row with the
+    fewest nonzero entries. Adding a multiple of that row to the other rows
+    makes the fewest zeros nonzero. Ties are broken by the bit size of the
+    pivot, then by which row is highest.
+    Args:
+        rows: a list of sparse rows.
+        candidate_rows: a list of the indexes of the rows that can hold the
+        pivot and have a nonzero entry in the column.
+        column: an int that is the index of the pivot column.
+    Returns:
+        an int that is the index of the chosen row.
+    '''
+
+    def pivot_key(i):
+        entry = rows[i][column]
+
+        return (
+            len(rows[i]),
+            abs(entry.numerator).bit_length() + entry.denominator.bit_length(),
+            i
+        )
+
+    return min(candidate_rows, key = pivot_key)
+
+def subtract_multiple(row, pivot_row, multiple):
+    '''
+    This function subtracts a multiple of a sparse pivot row from a sparse
+    row. Entries that become 0 are removed.
+    Args:
+        row: a sparse row. This row is modified in place.
+        pivot_row: a sparse row.
+        multiple: a Fraction.
+    '''
+
+    for column, pivot_entry in pivot_row.items():
+
+        entry = row.get(column, 0) - multiple * pivot_entry
+
+        if entry == 0:
+            row.pop(column, None)
+
+        else:
+            row[column] = entry
+
+def reduced_row_echelon_form(rows, column_count):
+    '''
+    This function brings a matrix of sparse rows to reduced row echelon form.
+    Pivots are found column by column from the left. Each pivot row is chosen
+    by markowitz_row and divided by its pivot, and its multiples are only
+    subtracted from rows that have a nonzero entry in its pivot column. Once
+    every pivot is found, the entries above each pivot are eliminated from
+    the bottom up.
+    Args:
+        rows: a list of sparse rows. This list and its rows are modified in
+        place.
+        column_count: an int that is the number of columns of the matrix.
+    Returns:
+        a tuple whose first item is the list of rows in reduced row echelon
+        form, whose second item is a list of the column index of each pivot,
+        whose third item is a list holding, for each row, the index of the
+        row of the input matrix it started as, and whose fourth item is the
+        number of row swaps performed.
+    '''
+
+    row_count = len(rows)
+
+    pivot_columns = []
+
+    total_row_swaps = 0
+
+    row_permutation = list(range(row_count))
+
+    corner_row = 0
+
+    for column in range(column_count):
+
+        if corner_row == row_count:
+            break
+
+        candidate_rows = [i for i in range(corner_row, row_count)
+                          if column in rows[i]]
+
+        # A column without a nonzero entry left to eliminate has no pivot.
+        if not candidate_rows:
+            continue
+
+        max_row = markowitz_row(rows, candidate_rows, column)
+
+        if max_row != corner_row:
+            total_row_swaps += 1
+
+            rows[max_row], rows[corner_row] = rows[corner_row], rows[max_row]
+
+            row_permutation[max_row], row_permutation[corner_row] = \
+                row_permutation[corner_row], row_permutation[max_row]
+
+            # The two rows traded places, so their indexes are traded in the
+            # list of candidates too.
+            swapped_rows = {max_row: corner_row, corner_row: max_row}
+
+            candidate_rows = [swapped_rows.get(i, i) for i in candidate_rows]
+
+        pivot_row = rows[corner_row]
+        pivot = pivot_row[column]
+
+        for pivot_row_column in pivot_row:
+            pivot_row[pivot_row_column] /= pivot
+
+        # Only the rows with a nonzero entry in the pivot column change.
+        for i in candidate_rows:
+            if i != corner_row:
+                subtract_multiple(rows[i], pivot_row, rows[i][column])
+
+        pivot_columns.append(column)
+
+        corner_row += 1
+
+    # Starting from the bottom, the entries above each pivot are brought to
+    # zero, so each pivot row is subtracted after it is fully reduced.
+    for k in range(len(pivot_columns) - 1, -1, -1):
+
+        pivot_column = pivot_columns[k]
+
+        for i in range(k):
+            if pivot_column in rows[i]:
+                subtract_multiple(rows[i], rows[k], rows[i][pivot_column])
+
+    return rows, pivot_columns, row_permutation, total_row_swaps
+
+def dense_array(rows, column_count):
+    '''
+    This function converts sparse rows to a dense array to be outputted.
+    Args:
+        rows: a list of sparse rows.
+        column_count: an int that is the number of columns of the matrix.
+    Returns:
+        a 2d numpy object array of Fractions.
+    '''
+
+    matrix_array = np.full((len(rows), column_count), Fraction(0),
+                           dtype = object)
+
+    for i, row in enumerate(rows):
+        for j, entry in row.items():
+            matrix_array[i, j] = entry
+
+    return matrix_array
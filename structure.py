@@ -0,0 +1,350 @@
+'''
+This file contains the structure classifier and the calculations for square
+matrices whose structure makes elimination unnecessary. Diagonal,
+triangular and permutation matrices are common in coursework, and their
+determinants, inverses and LU factorizations can be read off of them or
+found by substitution. Each matrix is classified once, in O(n^2) time, when
+its backend is chosen.
+'''
+
+import numpy as np
+import elimination
+import block_diagonal
+
+from fractions import Fraction
+
+# These are the structures a matrix can be classified as. A matrix that is
+# both upper and lower triangular is diagonal, and the identity matrix is
+# classified as diagonal rather than as a permutation matrix.
+GENERAL = "general"
+DIAGONAL = "diagonal"
+UPPER_TRIANGULAR = "upper triangular"
+LOWER_TRIANGULAR = "lower triangular"
+PERMUTATION = "permutation"
+
+def row_nonzero_columns(scaled_matrix):
+    '''
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+    Returns:
+        a list holding, for each row, a list of the column indexes of its
+        nonzero entries in increasing order.
+    '''
+
+    # Rows read into an int64 array are searched for nonzero entries with
+    # numpy rather than one entry at a time.
+    if isinstance(scaled_matrix.rows, np.ndarray):
+        return [np.flatnonzero(row).tolist() for row in scaled_matrix.rows]
+
+    return [[j for j, entry in enumerate(row) if entry != 0]
+            for row in scaled_matrix.rows]
+
+def bandwidths(row_columns):
+    '''
+    Args:
+        row_columns: the list returned by row_nonzero_columns.
+    Returns:
+        a tuple whose first item is the lower bandwidth of the matrix, the
+        largest distance of a nonzero entry below the diagonal, and whose
+        second item is its upper bandwidth, the largest distance of a
+        nonzero entry above the diagonal.
+    '''
+
+    lower_bandwidth = 0
+    upper_bandwidth = 0
+
+    for i, columns in enumerate(row_columns):
+        if columns:
+            lower_bandwidth = max(lower_bandwidth, i - columns[0])
+            upper_bandwidth = max(upper_bandwidth, columns[-1] - i)
+
+    return lower_bandwidth, upper_bandwidth
+
+def matrix_bandwidths(scaled_matrix):
+    '''
+    This function finds the bandwidths bandwidths returns straight from a
+    matrix.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+    Returns:
+        a tuple whose first item is the lower bandwidth of the matrix and
+        whose second item is its upper bandwidth.
+    '''
+
+    # The nonzero entries of an int64 array are found all at once by numpy.
+    if isinstance(scaled_matrix.rows, np.ndarray):
+        row_indexes, column_indexes = np.nonzero(scaled_matrix.rows)
+
+        if len(row_indexes) == 0:
+            return 0, 0
+
+        return (
+            max(int((row_indexes - column_indexes).max()), 0),
+            max(int((column_indexes - row_indexes).max()), 0)
+        )
+
+    return bandwidths(row_nonzero_columns(scaled_matrix))
+
+def classify(scaled_matrix):
+    '''
+    This function finds the structure of a matrix.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the matrix.
+    Returns:
+        one of the structures defined at the top of this file. Matrices that
+        are not square are GENERAL.
+    '''
+
+    row_count, column_count = scaled_matrix.shape
+
+    if row_count != column_count or row_count == 0:
+        return GENERAL
+
+    row_columns = row_nonzero_columns(scaled_matrix)
+
+    lower_bandwidth, upper_bandwidth = bandwidths(row_columns)
+
+    if lower_bandwidth == 0 and upper_bandwidth == 0:
+        return DIAGONAL
+
+    if lower_bandwidth == 0:
+        return UPPER_TRIANGULAR
+
+    if upper_bandwidth == 0:
+        return LOWER_TRIANGULAR
+
+    # A permutation matrix has a single 1 in each row, which is held as an
+    # int equal to its row scale, and no two of them are in the same column.
+    if all(len(columns) == 1 for columns in row_columns) and \
+        len(set(columns[0] for columns in row_columns)) == row_count and \
+        all(scaled_matrix.rows[i][columns[0]] == scaled_matrix.row_scales[i]
+            for i, columns in enumerate(row_columns)):
+        return PERMUTATION
+
+    return GENERAL
+
+def diagonal_entries(scaled_matrix):
+    '''
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square matrix.
+    Returns:
+        a list of the entries on the diagonal as Fractions.
+    '''
+
+    return [Fraction(int(scaled_matrix.rows[i][i]), scaled_matrix.row_scales[i])
+            for i in range(scaled_matrix.shape[0])]
+
+def permutation_columns(scaled_matrix):
+    '''
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding a permutation
+        matrix.
+    Returns:
+        a list holding, for each row, the column index of its 1.
+    '''
+
+    return [columns[0] for columns in row_nonzero_columns(scaled_matrix)]
+
+def determinant(scaled_matrix, structure):
+    '''
+    This function finds the determinant of a structured matrix. The
+    determinant of a triangular matrix is the product of its diagonal
+    entries, and the determinant of a permutation matrix is the sign of its
+    permutation.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square matrix.
+        structure: the structure classify returned for the matrix, which is
+        not GENERAL.
+    Returns:
+        a Fraction that is the determinant.
+    '''
+
+    if structure == PERMUTATION:
+        return Fraction(block_diagonal.permutation_sign(
+            permutation_columns(scaled_matrix)
+        ))
+
+    determinant = Fraction(1)
+
+    for diagonal_entry in diagonal_entries(scaled_matrix):
+        determinant *= diagonal_entry
+
+    return determinant
+
+def upper_triangular_inverse(integer_rows, row_scales):
+    '''
+    This function inverts an upper triangular matrix by back substitution.
+    If M is the matrix of ints and S holds the row scales, the matrix is
+    S^-1 M, so its inverse is M^-1 S. Multiplied by the determinant of M,
+    which is the product of its diagonal, the inverse is the adjugate of M
+    times S, which holds only ints. So each row is found from the rows below
+    it with int operations and exact divisions, and Fractions are only made
+    at the end. The inverse is upper triangular too, so only the entries on
+    and right of the diagonal are found.
+    Args:
+        integer_rows: a list of rows of ints holding an upper triangular
+        matrix with no zeros on its diagonal.
+        row_scales: a list holding the positive int each row is divided by.
+    Returns:
+        a 2d numpy object array of Fractions holding the inverse.
+    '''
+
+    dimension = len(integer_rows)
+
+    integer_array = np.array(integer_rows, dtype = object).reshape(
+        (dimension, dimension)
+    )
+
+    denominator = 1
+
+    for i in range(dimension):
+        denominator *= integer_rows[i][i]
+
+    adjugate_array = np.zeros((dimension, dimension), dtype = object)
+
+    for k in range(dimension - 1, -1, -1):
+
+        adjugate_array[k, k] = denominator * row_scales[k]
+
+        if k + 1 < dimension:
+            adjugate_array[k, k + 1:] = -integer_array[k, k + 1:].dot(
+                adjugate_array[k + 1:, k + 1:]
+            )
+
+        adjugate_array[k, k:] //= integer_array[k, k]
+
+    inverse_array = np.full((dimension, dimension), Fraction(0),
+                            dtype = object)
+
+    for i in range(dimension):
+        for j in range(i, dimension):
+            inverse_array[i, j] = Fraction(adjugate_array[i, j], denominator)
+
+    return inverse_array
+
+def inverse(scaled_matrix, structure):
+    '''
+    This function finds the inverse of a structured matrix. A diagonal matrix
+    is inverted entry by entry, a triangular matrix by substitution, and a
+    permutation matrix by transposing it.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square matrix.
+        structure: the structure classify returned for the matrix, which is
+        not GENERAL.
+    Returns:
+        a 2d numpy object array of Fractions holding the inverse, or None if
+        the matrix is not invertible.
+    '''
+
+    if structure == PERMUTATION:
+        return scaled_matrix.fraction_array().T.copy()
+
+    diagonal = diagonal_entries(scaled_matrix)
+
+    # A triangular matrix is invertible if and only if its diagonal holds no
+    # zeros.
+    if any(diagonal_entry == 0 for diagonal_entry in diagonal):
+        return None
+
+    dimension = len(diagonal)
+
+    if structure == DIAGONAL:
+        inverse_array = np.full((dimension, dimension), Fraction(0),
+                                dtype = object)
+
+        for i, diagonal_entry in enumerate(diagonal):
+            inverse_array[i, i] = 1 / diagonal_entry
+
+        return inverse_array
+
+    integer_rows, row_scales = scaled_matrix.integer_rows()
+
+    if structure == UPPER_TRIANGULAR:
+        return upper_triangular_inverse(integer_rows, row_scales)
+
+    # Reversing the order of the rows and the columns of a lower triangular
+    # matrix makes it upper triangular. Its inverse is the inverse of that
+    # matrix with the order of its rows and columns reversed back.
+    return upper_triangular_inverse(
+        [row[::-1] for row in reversed(integer_rows)],
+        row_scales[::-1]
+    )[::-1, ::-1].copy()
+
+def LU_factorize(scaled_matrix, structure):
+    '''
+    This function finds the PLU factorization elimination would find for a
+    structured matrix without eliminating. An upper triangular matrix with no
+    zeros on its diagonal is its own U with L the identity matrix. A lower
+    triangular one has its diagonal as U, and L is found by dividing each
+    column by its diagonal entry. A permutation matrix is its own P with L
+    and U the identity matrix.
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding the square matrix.
+        structure: the structure classify returned for the matrix, which is
+        not GENERAL.
+    Returns:
+        an elimination.PLUFactorization of the matrix, or None if it is
+        triangular with a zero on its diagonal, since elimination then swaps
+        rows or skips columns.
+    '''
+
+    dimension = scaled_matrix.shape[0]
+
+    if structure == PERMUTATION:
+
+        # Row i of LU is the identity row with its 1 in column i, which is
+        # the row of the matrix with its 1 in column i.
+        row_permutation = [0] * dimension
+
+        for i, column in enumerate(permutation_columns(scaled_matrix)):
+            row_permutation[column] = i
+
+        # Elimination puts each row in place with one swap unless it is
+        # already in place, so it uses one swap fewer than the length of each
+        # cycle of the permutation.
+        visited = [False] * dimension
+
+        total_row_swaps = dimension
+
+        for start in range(dimension):
+            if not visited[start]:
+                total_row_swaps -= 1
+
+                i = start
+
+                while not visited[i]:
+                    visited[i] = True
+
+                    i = row_permutation[i]
+
+        packed_array = np.full((dimension, dimension), Fraction(0),
+                               dtype = object)
+
+        for i in range(dimension):
+            packed_array[i, i] = Fraction(1)
+
+        return elimination.PLUFactorization(
+            packed_array,
+            row_permutation,
+            list(range(dimension)),
+            total_row_swaps
+        )
+
+    diagonal = diagonal_entries(scaled_matrix)
+
+    if any(diagonal_entry == 0 for diagonal_entry in diagonal):
+        return None
+
+    packed_array = scaled_matrix.fraction_array()
+
+    # The entries of L below the diagonal are packed where they are in L.
+    if structure == LOWER_TRIANGULAR:
+        for j, diagonal_entry in enumerate(diagonal):
+            packed_array[j + 1:, j] /= diagonal_entry
+
+    return elimination.PLUFactorization(
+        packed_array,
+        list(range(dimension)),
+        list(range(dimension)),
+        0
+    )
@@ -1,253 +1,389 @@
-import linear_systems
 import calculations
+import backends
+import elimination
+import float_engine
 import pandas as pd
 import numpy as np
 
-def null_space_basis(matrix, output_decimal):
+# These are the names of the four fundamental subspaces of a matrix, which
+# are the keys of the dictionary fundamental_subspaces returns.
+NULL_SPACE = "null space"
+COLUMN_SPACE = "column space"
+LEFT_NULL_SPACE = "left null space"
+ROW_SPACE = "row space"
+
+def fundamental_subspaces(matrix, output_decimal, scaled_matrix = None):
     '''
-    This function is meant to calculate a basis for the null space of a user
-    inputted matrix.
+    This function is meant to calculate bases for all four fundamental
+    subspaces of a user inputted matrix from a single elimination.
     Args:
-        matrix: A pandas DataFrame holding the matrix of which the null space 
+        matrix: A pandas DataFrame holding the matrix of which the subspaces
         will be calculated.
-        output_decimal: A boolean that is True if the null space should be
+        output_decimal: A boolean that is True if the subspaces should be
         outputted as decimals and False otherwise.
+        scaled_matrix: the elimination.ScaledMatrix calculations.parse_matrix
+        returns for the matrix if it was already read, or None.
     Returns:
-        A pandas DataFrame with columns holding vectors that make up the null
-        space of the inputted matrix.
+        A dictionary whose keys are NULL_SPACE, COLUMN_SPACE, LEFT_NULL_SPACE
+        and ROW_SPACE and whose values are pandas DataFrames with columns
+        holding the basis vectors of each subspace, or the same error frame
+        for each subspace.
     '''
-    # When finding the null space of a matrix, a set vectors whose linear
-    # combinations represent all possible solutions to the homogenous equation
-    # constructed with vectors in the input matrix needs to be found. This can
-    # be done by adding an augmented column to the input_matrix and solving for
-    # the solution set of the linear system represented by that matrix in
-    # parametric vector form. Since multiple subspace functions are called on
-    # the same matrix, rather than modifying the original matrix it is copied.
-
-    homogenous_system_matrix = matrix.copy()
-
-    # A constant column with as many 0's as the number of rows in the original
-    # matrix is added at the end.
-    homogenous_system_matrix["Constant"] = [0] * matrix.shape[0]
-
-    # The vectors in the parametric_vector_solution_set represent a null space
-    # basis, since their linear combinations all lead to zero solutions and
-    # they are linearly independent. It is possible that this will only consist
-    # of one vector: a constant vector of zeros. This means the null space is
-    # the zero vector.
-    null_space_frame = linear_systems.parametric_vector_solution_set(
-        linear_system = homogenous_system_matrix,
-        output_decimal = output_decimal,
-        return_vectors = True
-    )
 
-    # This occurs when there was an error when calculating the solution to the
-    # homogeneous equation. So the error will be returned and displayed to the
-    # user.
-    if null_space_frame.empty:
-        return null_space_frame
+    if scaled_matrix is None:
+        scaled_matrix = calculations.parse_matrix(matrix)
+
+    # If not every entry is a valid number, each subspace gets the error
+    # frame.
+    if scaled_matrix is None:
+        error_frame = calculations.invalid_number_frame()
+
+        return {subspace_name: error_frame for subspace_name in
+                [NULL_SPACE, COLUMN_SPACE, LEFT_NULL_SPACE, ROW_SPACE]}
+
+    column_count = scaled_matrix.shape[1]
+
+    # The matrix is eliminated next to the identity matrix, [A | I]. The
+    # reduced row echelon form of that is [R | E] where R is the reduced row
+    # echelon form of A and E is the invertible matrix of row operations with
+    # EA = R. R gives the null space, the row space and the pivot columns for
+    # the column space. Since the rows of R that are all zeros are rows of E
+    # times A, those rows of E give the left null space. So no second
+    # elimination on the transpose is needed.
+    augmented_matrix = scaled_matrix.with_identity()
+
+    if output_decimal:
+        reduced_array, augmented_pivots = float_engine.eliminate(
+            augmented_matrix.float_array(),
+            reduce_above = True
+        )[:2]
+
+    else:
+        reduced_result = backends.select_backend(
+            augmented_matrix,
+            output_decimal
+        ).reduced_row_echelon_form(augmented_matrix)
+
+        reduced_array = reduced_result.matrix
+        augmented_pivots = reduced_result.pivot_columns
+
+    # The pivots of R are the pivots in the columns of A. The nonzero rows of
+    # R come before its zero rows.
+    pivot_columns = [pivot_column for pivot_column in augmented_pivots
+                     if pivot_column < column_count]
+
+    rank = len(pivot_columns)
+
+    return {
+        NULL_SPACE: null_space_frame(
+            reduced_array[:rank, :column_count],
+            pivot_columns,
+            output_decimal
+        ),
+        COLUMN_SPACE: column_space_frame(matrix, pivot_columns),
+        LEFT_NULL_SPACE: left_null_space_frame(
+            reduced_array[rank:, column_count:],
+            output_decimal
+        ),
+        ROW_SPACE: row_space_frame(
+            reduced_array[:rank, :column_count],
+            output_decimal
+        )
+    }
+
+def vector_frame(vectors, vector_length, output_decimal):
+    '''
+    This function puts basis vectors in a DataFrame to be displayed.
+    Args:
+        vectors: a list of vectors that are lists of numbers, or floats if
+        output_decimal is True.
+        vector_length: an int that is the number of entries in each vector.
+        output_decimal: A boolean that is True if the vectors should be
+        outputted as decimals.
+    Returns:
+        A pandas DataFrame with columns named Vector 1, Vector 2, ... holding
+        the vectors. If there are no vectors, the subspace is only the zero
+        vector, so it holds the zero vector.
+    '''
+
+    if len(vectors) == 0:
+        vectors = [[0] * vector_length]
+
+    # Since the vectors are held as inner lists, they are currently
+    # horizontal. But since vectors are displayed to the user vertically, they
+    # are transposed.
+    if output_decimal:
+        vector_array = float_engine.output_array(
+            np.transpose(np.array(vectors, dtype = np.float64))
+        )
+
+    else:
+        vector_array = np.transpose(np.array(vectors, dtype = object))
 
     # Column names are manually added here so that default Column 1, Column 2,
     # ... that is added in the calculation_output module is not used.
+    return pd.DataFrame(
+        data = vector_array,
+        columns = ["Vector " + str(i + 1) for i in range(len(vectors))]
+    )
+
+def null_space_frame(pivot_rows, pivot_columns, output_decimal):
+    '''
+    This function finds a basis for the null space from the nonzero rows of
+    the reduced row echelon form of a matrix.
+    Args:
+        pivot_rows: a 2d numpy array holding the nonzero rows of the reduced
+        row echelon form.
+        pivot_columns: a list holding the pivot column of each row.
+        output_decimal: A boolean that is True if the basis should be
+        outputted as decimals.
+    Returns:
+        A pandas DataFrame with columns holding the basis vectors.
+    '''
+
+    column_count = pivot_rows.shape[1]
+
+    # Solving the homogeneous equation in parametric vector form gives one
+    # vector for each free variable. It has a 1 for that free variable, a 0
+    # for every other free variable and, for each basic variable, the negative
+    # of the free variable's coefficient in the row with that basic variable's
+    # pivot.
+    vectors = []
 
-    column_names = []
+    for free_column in elimination.free_column_order(
+        pivot_rows, pivot_columns, column_count
+    ):
+        vector = [0] * column_count
 
-    for i in range(null_space_frame.shape[1]):
-        column_names.append("Vector " + str(i + 1))
+        vector[free_column] = 1
 
-    null_space_frame.columns = column_names
+        for i, pivot_column in enumerate(pivot_columns):
 
-    return null_space_frame
+            # Since the variable is brought to the other side of the
+            # equation, its coefficient is multiplied by negative 1.
+            if pivot_rows[i, free_column] != 0:
+                vector[pivot_column] = -pivot_rows[i, free_column]
 
-def column_space_basis(matrix, output_decimal):
+        vectors.append(vector)
+
+    return vector_frame(vectors, column_count, output_decimal)
+
+def column_space_frame(matrix, pivot_columns):
     '''
-    This function is meant to calculate a basis for the column space of a user
-    inputted matrix.
+    This function finds a basis for the column space from the pivot columns
+    of a matrix.
     Args:
-        matrix: A pandas DataFrame holding the matrix of which the column space 
-        will be calculated.
-        output_decimal: A boolean that is True if the column space should be
-        outputted as decimals and False otherwise.
+        matrix: A pandas DataFrame holding the user inputted matrix.
+        pivot_columns: a list holding the index of each pivot column.
     Returns:
-        A pandas DataFrame with columns holding vectors that make up the column
-        space of the inputted matrix.
+        A pandas DataFrame with columns holding the basis vectors.
     '''
 
-    # All that matters is the pivot columns so row echelon form of the input is
-    # found rather than the reduced row echelon form.
-    ref_matrix = calculations.row_echelon_form(matrix, output_decimal)
+    column_space_matrix = pd.DataFrame()
 
-    # If ref_matrix is empty an error occurred and ref_matrix holds a column
-    # title explaining the error. So the error is returned.
+    # Columns from the original matrix are used because the column space is
+    # composed of vectors from the original matrix.
+    for vector_number, j in enumerate(pivot_columns):
+        column_space_matrix["Vector " + str(vector_number + 1)] = \
+            matrix.iloc[:, j]
 
-    if ref_matrix.empty:
-        return ref_matrix
-    
-    # The order of column_names is the same as the order of columns in
-    # ref_matrix. So when a pivot column index is found in ref_matrix, the 
-    # column name corresponding to that index is added to pivot_column_names.
-    # Column names from the original matrix are used because the column space
-    # is composed of vectors from the original matrix.
-    column_names = matrix.columns
-    pivot_column_names = []
+    return column_space_matrix
 
-    # This loop finds pivot columns using the ref_matrix.
-    # It does so by finding the leftmost nonzero entry in each nonzero row.
+def left_null_space_frame(null_rows, output_decimal):
+    '''
+    This function finds a basis for the left null space from the rows of E
+    next to the zero rows of R in the reduced row echelon form [R | E] of a
+    matrix next to the identity matrix.
+    Args:
+        null_rows: a 2d numpy array holding those rows of E.
+        output_decimal: A boolean that is True if the basis should be
+        outputted as decimals.
+    Returns:
+        A pandas DataFrame with columns holding the basis vectors.
+    '''
 
-    zero_row_reached = False
-    i = 0
+    row_count = null_rows.shape[1]
 
-    while not zero_row_reached and i < ref_matrix.shape[0]:
+    if null_rows.shape[0] == 0:
+        return vector_frame([], row_count, output_decimal)
 
-        pivot_reached = False
-        j = 0
+    # The rows span the left null space but are not in the form the null space
+    # of the transpose would be given in, with a 1 for one free variable and
+    # 0 for the others. The free variables of the transpose are the entries
+    # that are not pivots when the transpose is eliminated from left to right,
+    # and those are the pivots of these rows when they are eliminated from
+    # right to left. So the rows are put into reduced row echelon form with
+    # their columns reversed.
+    reversed_rows = null_rows[:, ::-1]
 
-        # The entries in row i are looped through until either a pivot position
-        # is reached or the end of the row is reached.
-        while not pivot_reached and j < ref_matrix.shape[1]:
+    if output_decimal:
+        reversed_rows = float_engine.eliminate(
+            np.array(reversed_rows, dtype = np.float64),
+            reduce_above = True
+        )[0].tolist()
 
-            # When the first nonzero entry in a row is reached, that means
-            # position i, j is a pivot position. So column j is added to the
-            # list of pivot columns.
+    else:
+        reversed_matrix = elimination.ScaledMatrix(
+            *elimination.fractions_to_integer_rows(reversed_rows)
+        )
 
-            if ref_matrix.iat[i, j] != 0:
+        reversed_rows = backends.select_backend(
+            reversed_matrix,
+            output_decimal
+        ).reduced_row_echelon_form(reversed_matrix).matrix.tolist()
 
-                # The name of the column in the original matrix corresponding
-                # with column j is added to the list of pivot column names.
-                pivot_column_names.append(column_names[j])
-                pivot_reached = True
+    # Reversing the rows back and their order puts the vectors in the order
+    # of their free variables.
+    vectors = [row[::-1] for row in reversed(reversed_rows)]
 
-            j += 1
+    return vector_frame(vectors, row_count, output_decimal)
 
-        # If a pivot position was not reached in row i, row i must contain all
-        # zeros. So a zero_row has been reached in this case and
-        # zero_row_reached should be set to True.
-        if pivot_reached == False:
-            zero_row_reached = True
+def row_space_frame(pivot_rows, output_decimal):
+    '''
+    This function finds a basis for the row space from the nonzero rows of
+    the reduced row echelon form of a matrix.
+    Args:
+        pivot_rows: a 2d numpy array holding the nonzero rows of the reduced
+        row echelon form.
+        output_decimal: A boolean that is True if the basis should be
+        outputted as decimals.
+    Returns:
+        A pandas DataFrame with columns holding the basis vectors.
+    '''
 
-        i += 1  
+    # The nonzero rows of the reduced row echelon form are linearly
+    # independent because each has a 1 in a pivot column where the others
+    # have 0. Since vectors are displayed to the user vertically, the rows are
+    # transposed.
+    vertical_basis_vectors = np.transpose(pivot_rows)
 
-    vector_number = 1
+    # The row space of a matrix of zeros is only the zero vector, and no rows
+    # are displayed.
+    if pivot_rows.shape[0] == 0:
+        return pd.DataFrame(data = np.array([]))
 
-    column_space_matrix = pd.DataFrame()
+    if output_decimal:
+        vertical_basis_vectors = float_engine.output_array(
+            vertical_basis_vectors
+        )
 
-    # Each column that makes up the column space is added to the column space
-    # matrix.
-    for column_name in pivot_column_names:
-        column_space_matrix["Vector " + str(vector_number)] = \
-            matrix[column_name]
-        
-        vector_number += 1
+    return pd.DataFrame(data = vertical_basis_vectors)
 
-    return column_space_matrix
+def subspace_basis(matrix, output_decimal, factorization, subspace_name):
+    '''
+    This function returns the basis of one fundamental subspace of a matrix.
+    Args:
+        matrix: A pandas DataFrame holding the user inputted matrix.
+        output_decimal: A boolean that is True if the basis should be
+        outputted as decimals and False otherwise.
+        factorization: A calculations.Factorization of the matrix shared with
+        the other subspace outputs, or None.
+        subspace_name: one of the subspace names at the top of this file.
+    Returns:
+        A pandas DataFrame with columns holding the basis vectors, or an error
+        frame.
+    '''
+
+    # The four subspaces come from one elimination, so when the outputs share
+    # a factorization it is only done for the first of them.
+    if factorization is not None:
+        subspace_frames = factorization.shared_result(
+            "fundamental subspaces",
+            lambda: fundamental_subspaces(
+                factorization.matrix,
+                factorization.output_decimal,
+                factorization.scaled_matrix
+            )
+        )
+
+    else:
+        subspace_frames = fundamental_subspaces(matrix, output_decimal)
 
-def left_null_space_basis(matrix, output_decimal):
+    return subspace_frames[subspace_name].copy()
+
+def null_space_basis(matrix, output_decimal, factorization = None):
+    '''
+    This function is meant to calculate a basis for the null space of a user
+    inputted matrix.
+    Args:
+        matrix: A pandas DataFrame holding the matrix of which the null space
+        will be calculated.
+        output_decimal: A boolean that is True if the null space should be
+        outputted as decimals and False otherwise.
+        factorization: A calculations.Factorization of the matrix shared with
+        the other subspace outputs, or None.
+    Returns:
+        A pandas DataFrame with columns holding vectors that make up the null
+        space of the inputted matrix.
+    '''
+
+    # The vectors whose linear combinations are all the solutions to the
+    # homogeneous equation make up a basis. It is possible that this will
+    # only consist of one vector: a constant vector of zeros. This means the
+    # null space is the zero vector.
+    return subspace_basis(matrix, output_decimal, factorization, NULL_SPACE)
+
+def column_space_basis(matrix, output_decimal, factorization = None):
+    '''
+    This function is meant to calculate a basis for the column space of a user
+    inputted matrix.
+    Args:
+        matrix: A pandas DataFrame holding the matrix of which the column space
+        will be calculated.
+        output_decimal: A boolean that is True if the column space should be
+        outputted as decimals and False otherwise.
+        factorization: A calculations.Factorization of the matrix shared with
+        the other subspace outputs, or None.
+    Returns:
+        A pandas DataFrame with columns holding vectors that make up the column
+        space of the inputted matrix.
+    '''
+
+    # The pivot columns of the original matrix make up a basis.
+    return subspace_basis(matrix, output_decimal, factorization, COLUMN_SPACE)
+
+def left_null_space_basis(matrix, output_decimal, factorization = None):
     '''
     This function is meant to calculate a bass for the left null space, the
     null space for row vectors left multiplied by the user inputted matrix.
     Args:
-        matrix: A pandas DataFrame holding the matrix of which the row space 
+        matrix: A pandas DataFrame holding the matrix of which the row space
         will be calculated.
         output_decimal: A boolean that is True if the row space should be
         outputted as decimals and False otherwise.
+        factorization: A calculations.Factorization of the matrix shared with
+        the other subspace outputs, or None.
     Returns:
         A pandas DataFrame with columns holding vectors that make up the left
         null space of the user inputted matrix.
     '''
 
-    # The left_null_space is found by calculating the null space of the
-    # input matrix transposed. This works because left multiplying by a row
-    # vector multiplies each entry in a column by each element of the vector
-    # and adding them up for each column. Similarly right multiplying the
-    # tranpose of a matrix by a column vector is like multiplying each entry
-    # in the vector by what was each entry in each column of the original
-    # matrix but is now each entry in each row, and adding them up. So in
-    # each scenario, the same input vectors will lead to an output of the zero
-    # vector.
-
-    # Entry matrix is tranposed as an array
-    matrix_array = matrix.to_numpy()
-
-    transposed_array = np.transpose(matrix_array)
-
-    transposed_matrix = pd.DataFrame(data = transposed_array)
-
-    # The null space basis matrix of the transposed matrix or an error matrix
-    # is returned.
-    return null_space_basis(transposed_matrix, output_decimal)
+    # The left null space is the null space of the transpose of the matrix,
+    # and the basis is given in the same form as the null space of the
+    # transpose would be.
+    return subspace_basis(
+        matrix,
+        output_decimal,
+        factorization,
+        LEFT_NULL_SPACE
+    )
 
-def row_space_basis(matrix, output_decimal):
+def row_space_basis(matrix, output_decimal, factorization = None):
     '''
     This function is meant to calculate a basis for the row space of a user
     inputted matrix.
     Args:
-        matrix: A pandas DataFrame holding the matrix of which the row space 
+        matrix: A pandas DataFrame holding the matrix of which the row space
         will be calculated.
         output_decimal: A boolean that is True if the row space should be
         outputted as decimals and False otherwise.
+        factorization: A calculations.Factorization of the matrix shared with
+        the other subspace outputs, or None.
     Returns:
         A pandas DataFrame with columns holding vectors that make up the row
         space of the inputted matrix.
     '''
 
-    # The row space consists of all nonzero rows when the matrix is in row
-    # echelon or reduced row echelon form. To make it easier to see that the
-    # row vectors are linearly independent, the reduced row echelon form of
-    # the input matrix will be used to find the row space.
-
-    rref_matrix = calculations.reduced_row_echelon_form(matrix, output_decimal)
-
-    # If rref_matrix is empty an error occurred and rref_matrix holds a column
-    # title explaining the error. So the error is returned.
-
-    if rref_matrix.empty:
-        return rref_matrix
-    
-    rref_array = rref_matrix.to_numpy()
-
-    # Nonzero rows will be added to this list. A list is used rather than a
-    # numpy array so that append can be used rather than resize.
-    basis_vectors = []
-
-    zero_row_reached = False
-
-    i = 0
-
-    # Rows are added to the basis_vectors list until a zero row is reached or
-    # the last row of rref_array is reached.
-    while not zero_row_reached and i < rref_array.shape[0]:
-
-        all_zeros = True
-
-        j = 0
-
-        # Each entry in row i is checked to see if it is equal to zero until a
-        # nonzero entry has been found or the end of the row has been reached.
-        while all_zeros and j < rref_array.shape[1]:
-
-            # If a nonzero entry is found, all zeros is set to False.
-            if rref_array[i, j] != 0:
-                all_zeros = False
-
-            j += 1
-
-        # If row i is not a zero row, it will be converted to a list then
-        # appended to the basis vectors list.
-        if not all_zeros:
-            basis_vectors.append(rref_array[i].tolist())
-        
-        else:
-            zero_row_reached = True
-
-        i += 1
-
-    # Since the row space basis vectors are held as inner lists in the 
-    # basis_vectors list, they are currently horizontal. But since vectors are
-    # displayed to the user vertically, basis_vectors will be converted to a
-    # numpy array and transposed.
-
-    vertical_basis_vectors = np.transpose(np.array(basis_vectors))
-
-    # A DataFrame holding the vertical basis vectors is returned. 
-
-    return pd.DataFrame(data = vertical_basis_vectors)
\ No newline at end of file
+    # The row space consists of all nonzero rows when the matrix is in
+    # reduced row echelon form.
+    return subspace_basis(matrix, output_decimal, factorization, ROW_SPACE)
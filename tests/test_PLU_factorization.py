@@ -0,0 +1,113 @@
+'''
+This file contains tests of PLU factorization with L and U packed into one
+array. P, L and U must multiply back to the input, and LU_factorize must
+only show P when rows were swapped.
+'''
+
+import random
+import backends
+import calculations
+import elimination
+import numpy as np
+import pandas as pd
+
+from fractions import Fraction
+
+def random_scaled_matrix(generator, row_count, column_count):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+    Returns:
+        an elimination.ScaledMatrix holding random Fractions, many of them 0.
+    '''
+
+    return elimination.ScaledMatrix(*elimination.fractions_to_integer_rows([
+        [Fraction(0) if generator.random() < 0.35 else
+         Fraction(generator.randint(-6, 6), generator.choice([1, 2, 3]))
+         for j in range(column_count)] for i in range(row_count)
+    ]))
+
+def test_factors_multiply_back_to_the_input():
+    generator = random.Random(24)
+
+    for trial in range(100):
+        row_count = generator.randint(1, 5)
+        column_count = generator.randint(1, 5)
+
+        scaled_matrix = random_scaled_matrix(generator, row_count,
+                                             column_count)
+
+        for backend in [backends.FractionBackend(),
+                        backends.ScaledIntegerBackend()]:
+            factorization = backend.LU_factorize(scaled_matrix)
+
+            # The packed array is the same size as the input.
+            assert factorization.packed_array.shape == scaled_matrix.shape
+
+            L_array = factorization.L_array()
+            U_array = factorization.U_array()
+
+            assert not np.triu(L_array, 1).any()
+            assert all(L_array[i, i] == 1 for i in range(row_count))
+
+            for i, pivot_column in enumerate(factorization.pivot_columns):
+                assert not U_array[i, :pivot_column].any()
+                assert U_array[i, pivot_column] != 0
+
+            assert not U_array[factorization.rank:].any()
+
+            assert factorization.P_array().dot(L_array).dot(U_array) \
+                .tolist() == scaled_matrix.fraction_array().tolist()
+
+def test_float64_factors_multiply_back_to_the_input():
+    generator = random.Random(25)
+
+    for trial in range(60):
+        dimension = generator.randint(1, 5)
+
+        scaled_matrix = random_scaled_matrix(generator, dimension, dimension)
+
+        factorization = backends.Float64Backend().LU_factorize(scaled_matrix)
+
+        product = factorization.P_array().dot(factorization.L_array()) \
+            .dot(factorization.U_array())
+
+        assert np.allclose(np.array(product, dtype = np.float64),
+                           scaled_matrix.float_array(), atol = 1e-9)
+
+def test_determinant_from_the_factorization():
+    generator = random.Random(26)
+
+    for trial in range(60):
+        dimension = generator.randint(1, 5)
+
+        scaled_matrix = random_scaled_matrix(generator, dimension, dimension)
+
+        assert backends.ScaledIntegerBackend().LU_factorize(
+            scaled_matrix
+        ).determinant() == backends.FractionBackend().determinant(
+            scaled_matrix
+        )
+
+def test_P_is_only_shown_when_rows_are_swapped():
+    without_swaps = calculations.LU_factorize(
+        pd.DataFrame([["2", "1"], ["4", "5"]]),
+        False
+    )
+
+    assert list(without_swaps.columns) == ["L1", "L2", "Multiplied By", "U1",
+                                           "U2"]
+    assert without_swaps.values.tolist() == [[1, 0, "", 2, 1],
+                                             [2, 1, "*", 0, 3]]
+
+    with_swaps = calculations.LU_factorize(
+        pd.DataFrame([["0", "1"], ["1", "0"]]),
+        False
+    )
+
+    assert list(with_swaps.columns) == ["P1", "P2", "Multiplied By L", "L1",
+                                        "L2", "Multiplied By", "U1", "U2"]
+    assert with_swaps.values.tolist() == [[0, 1, "", 1, 0, "", 1, 0],
+                                          [1, 0, "*", 0, 1, "*", 0, 1]]
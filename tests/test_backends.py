@@ -0,0 +1,196 @@
+'''
+This file contains tests of the arithmetic backends. Every exact backend
+must give the same reduced row echelon form, determinant and inverse, a
+row echelon form and LU factorization that give back the input, and the
+float64 backend must agree with them to the digits it outputs.
+'''
+
+import random
+import backends
+import elimination
+import numpy as np
+
+from fractions import Fraction
+
+def exact_backends():
+    '''
+    Returns:
+        a list holding one of each exact backend.
+    '''
+
+    return [
+        backends.FractionBackend(),
+        backends.ScaledIntegerBackend(),
+        backends.ModularBackend(),
+        backends.SparseBackend(backends.ScaledIntegerBackend())
+    ]
+
+def random_scaled_matrix(generator, row_count, column_count):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+    Returns:
+        an elimination.ScaledMatrix holding a random matrix of Fractions
+        with many zeros and, in about a third of the matrices, a row that is
+        the sum of two others.
+    '''
+
+    rows = [
+        [0 if generator.random() < 0.3 else
+         Fraction(generator.randint(-9, 9), generator.choice([1, 1, 2, 5]))
+         for j in range(column_count)]
+        for i in range(row_count)
+    ]
+
+    if row_count > 2 and generator.random() < 0.3:
+        rows[-1] = [first + second for first, second in zip(rows[0], rows[1])]
+
+    return elimination.ScaledMatrix(
+        *elimination.fractions_to_integer_rows(
+            [[Fraction(entry) for entry in row] for row in rows]
+        )
+    )
+
+def close(first_array, second_array):
+    '''
+    Args:
+        first_array: a 2d numpy array of numbers.
+        second_array: a 2d numpy array of numbers with the same shape.
+    Returns:
+        a boolean that is True if the entries are equal to about the twelve
+        significant digits the float64 backend outputs.
+    '''
+
+    return np.allclose(np.array(first_array, dtype = np.float64),
+                       np.array(second_array, dtype = np.float64),
+                       rtol = 1e-9, atol = 1e-9)
+
+def test_exact_backends_agree():
+    generator = random.Random(13)
+
+    for trial in range(60):
+        row_count = generator.randint(1, 5)
+        column_count = generator.randint(1, 5)
+
+        scaled_matrix = random_scaled_matrix(generator, row_count,
+                                             column_count)
+
+        input_array = scaled_matrix.fraction_array()
+
+        reduced_results = [backend.reduced_row_echelon_form(scaled_matrix)
+                           for backend in exact_backends()]
+
+        for reduced_result in reduced_results[1:]:
+            assert reduced_result.matrix.tolist() == \
+                reduced_results[0].matrix.tolist()
+            assert reduced_result.pivot_columns == \
+                reduced_results[0].pivot_columns
+
+        for backend in exact_backends():
+
+            # Row echelon form is not unique, but it must have the same
+            # reduced row echelon form as the input.
+            echelon_array = backend.row_echelon_form(scaled_matrix)[0]
+
+            echelon_matrix = elimination.ScaledMatrix(
+                *elimination.fractions_to_integer_rows(echelon_array)
+            )
+
+            assert backends.FractionBackend().reduced_row_echelon_form(
+                echelon_matrix
+            ).matrix.tolist() == reduced_results[0].matrix.tolist()
+
+            factorization = backend.LU_factorize(scaled_matrix)
+
+            assert (factorization.P_array().dot(factorization.L_array())
+                    .dot(factorization.U_array())).tolist() == \
+                input_array.tolist()
+
+        # The input must not be changed by any backend.
+        assert scaled_matrix.fraction_array().tolist() == input_array.tolist()
+
+def test_exact_backends_agree_on_square_matrices():
+    generator = random.Random(14)
+
+    for trial in range(60):
+        dimension = generator.randint(1, 5)
+
+        scaled_matrix = random_scaled_matrix(generator, dimension, dimension)
+
+        determinants = [backend.determinant(scaled_matrix) for backend in
+                        exact_backends()]
+
+        assert determinants == [determinants[0]] * len(determinants)
+
+        for backend in exact_backends():
+            inverse_array = backend.inverse(scaled_matrix)
+
+            if determinants[0] == 0:
+                assert inverse_array is None
+                continue
+
+            assert scaled_matrix.fraction_array().dot(inverse_array) \
+                .tolist() == np.identity(dimension, dtype = int).tolist()
+
+def test_float64_backend_agrees_with_exact_results():
+    generator = random.Random(15)
+
+    float_backend = backends.Float64Backend()
+
+    exact_backend = backends.FractionBackend()
+
+    for trial in range(60):
+        dimension = generator.randint(1, 5)
+
+        scaled_matrix = random_scaled_matrix(generator, dimension, dimension)
+
+        reduced_result = float_backend.reduced_row_echelon_form(
+            scaled_matrix
+        )
+
+        assert reduced_result.pivot_columns == \
+            exact_backend.reduced_row_echelon_form(scaled_matrix) \
+            .pivot_columns
+        assert close(reduced_result.matrix,
+                     exact_backend.reduced_row_echelon_form(scaled_matrix)
+                     .matrix)
+
+        determinant = exact_backend.determinant(scaled_matrix)
+
+        assert close([[float_backend.determinant(scaled_matrix)]],
+                     [[determinant]])
+
+        if determinant != 0:
+            assert close(float_backend.inverse(scaled_matrix),
+                         exact_backend.inverse(scaled_matrix))
+
+def test_select_backend():
+    small_matrix = elimination.ScaledMatrix([[1, 2], [3, 4]], [1, 1])
+
+    assert isinstance(backends.select_backend(small_matrix, False),
+                      backends.FractionBackend)
+    assert isinstance(backends.select_backend(small_matrix, True),
+                      backends.Float64Backend)
+
+    generator = random.Random(16)
+
+    medium_matrix = elimination.ScaledMatrix(
+        [[generator.randint(1, 9) for j in range(6)] for i in range(6)],
+        [1] * 6
+    )
+
+    assert isinstance(backends.select_backend(medium_matrix, False),
+                      backends.ScaledIntegerBackend)
+
+    dimension = backends.MULTI_MODULAR_MIN_DIMENSION
+
+    large_matrix = elimination.ScaledMatrix(
+        [[generator.randint(1, 9) for j in range(dimension)]
+         for i in range(dimension)],
+        [1] * dimension
+    )
+
+    assert isinstance(backends.select_backend(large_matrix, False),
+                      backends.ModularBackend)
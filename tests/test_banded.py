@@ -0,0 +1,179 @@
+'''
+This file contains tests of the banded solver used for square linear systems
+whose coefficients lie in a narrow band around the diagonal, with fraction
+and decimal outputs.
+'''
+
+import random
+import banded
+import calculations
+import elimination
+import linear_systems
+import structure
+import numpy as np
+import pandas as pd
+
+from decimal import Decimal
+from fractions import Fraction
+
+def banded_system(generator, dimension, lower_bandwidth, upper_bandwidth):
+    '''
+    Args:
+        generator: a random.Random.
+        dimension: an int that is the number of equations and variables.
+        lower_bandwidth: an int that is the largest distance of a nonzero
+        coefficient below the diagonal.
+        upper_bandwidth: an int that is the largest distance of a nonzero
+        coefficient above the diagonal.
+    Returns:
+        a pandas DataFrame holding the augmented matrix of a random system
+        whose diagonal is 0 in about a third of its rows, so rows must be
+        swapped.
+    '''
+
+    rows = []
+
+    for i in range(dimension):
+        row = ["0"] * (dimension + 1)
+
+        for j in range(max(0, i - lower_bandwidth),
+                       min(dimension, i + upper_bandwidth + 1)):
+            if j != i or generator.random() < 0.7:
+                row[j] = str(Fraction(generator.randint(-9, 9),
+                                      generator.choice([1, 2, 10])))
+
+        row[dimension] = str(generator.randint(-9, 9))
+
+        rows.append(row)
+
+    return pd.DataFrame(
+        rows,
+        columns = ["x" + str(j + 1) for j in range(dimension)] + ["b"]
+    )
+
+def solution_column(linear_system, output_decimal):
+    '''
+    Args:
+        linear_system: a pandas DataFrame holding an augmented matrix.
+        output_decimal: a boolean that is True for decimal outputs.
+    Returns:
+        a list of the constant column of the reduced row echelon form.
+    '''
+
+    reduced_result = linear_systems.reduced_augmented_elimination(
+        linear_system,
+        output_decimal
+    )
+
+    return list(reduced_result.matrix[:, -1])
+
+def test_decimal_banded_solution_matches_exact_solution():
+    generator = random.Random(7)
+
+    for trial in range(30):
+        linear_system = banded_system(generator, 40, generator.randint(1, 3),
+                                      generator.randint(1, 3))
+
+        exact_solution = solution_column(linear_system, False)
+
+        # A singular system falls back to row reduction either way.
+        if any(entry == 0 for entry in
+               calculations.reduced_row_echelon_elimination(
+                   linear_system.iloc[:, :-1]
+               ).matrix.diagonal()):
+            continue
+
+        decimal_solution = solution_column(linear_system, True)
+
+        for exact_value, decimal_value in zip(exact_solution,
+                                              decimal_solution):
+            assert isinstance(decimal_value, Decimal)
+            assert abs(float(exact_value) - float(decimal_value)) <= \
+                1e-9 * max(1.0, abs(float(exact_value)))
+
+def test_float_banded_solver_finds_singular_systems():
+    generator = random.Random(13)
+
+    for trial in range(100):
+        linear_system = banded_system(generator, 30, 2, 1)
+
+        coefficient_matrix = calculations.parse_matrix(
+            linear_system.iloc[:, :-1]
+        )
+
+        constants = [Fraction(entry) for entry in linear_system.iloc[:, -1]]
+
+        lower_bandwidth, upper_bandwidth = structure.matrix_bandwidths(
+            coefficient_matrix
+        )
+
+        exact_solution = banded.solve(coefficient_matrix, constants,
+                                      lower_bandwidth, upper_bandwidth)
+
+        float_solution = banded.float_solve(coefficient_matrix, constants,
+                                            lower_bandwidth, upper_bandwidth)
+
+        assert (exact_solution is None) == (float_solution is None)
+
+def test_only_entries_not_written_as_zero_are_read(monkeypatch):
+    reads = []
+
+    parse_entry = calculations.parse_entry
+
+    def counted_parse_entry(entry):
+        reads.append(entry)
+
+        return parse_entry(entry)
+
+    monkeypatch.setattr(calculations, "parse_entry", counted_parse_entry)
+
+    linear_system = banded_system(random.Random(5), 60, 1, 2)
+
+    scaled_system = calculations.parse_matrix(linear_system)
+
+    assert len(reads) == int((linear_system.to_numpy() != "0").sum())
+
+    # Every entry still equals the number written.
+    assert scaled_system.fraction_array().tolist() == [
+        [Fraction(entry) for entry in row]
+        for row in linear_system.to_numpy().tolist()
+    ]
+
+def test_band_is_the_same_for_arrays_and_lists():
+    generator = random.Random(11)
+
+    for trial in range(20):
+        linear_system = banded_system(generator, 25, generator.randint(1, 3),
+                                      generator.randint(1, 3))
+
+        coefficient_matrix = calculations.parse_matrix(
+            linear_system.iloc[:, :-1]
+        )
+
+        assert isinstance(coefficient_matrix.rows, np.ndarray)
+
+        list_matrix = elimination.ScaledMatrix(
+            coefficient_matrix.rows.tolist(),
+            coefficient_matrix.row_scales
+        )
+
+        constants = [Fraction(entry) for entry in linear_system.iloc[:, -1]]
+
+        lower_bandwidth, upper_bandwidth = structure.matrix_bandwidths(
+            coefficient_matrix
+        )
+
+        assert banded.integer_band(
+            coefficient_matrix,
+            lower_bandwidth,
+            upper_bandwidth
+        ).tolist() == banded.integer_band(
+            list_matrix,
+            lower_bandwidth,
+            upper_bandwidth
+        ).tolist()
+
+        assert banded.solve(coefficient_matrix, constants, lower_bandwidth,
+                            upper_bandwidth) == \
+            banded.solve(list_matrix, constants, lower_bandwidth,
+                         upper_bandwidth)
@@ -0,0 +1,161 @@
+'''
+This file contains tests of solving square linear systems that share a
+coefficient matrix, one for each constant column.
+'''
+
+import random
+import linear_systems
+import modular
+import pandas as pd
+
+from decimal import Decimal
+from fractions import Fraction
+
+NOT_INVERTIBLE_MESSAGE = (
+    "The coefficient matrix is not invertible, so no system has exactly one "
+    "solution. Please solve each system with the linear system solver."
+)
+
+def batch_frame(coefficient_rows, constant_rows):
+    '''
+    Args:
+        coefficient_rows: a list of rows that are lists of numbers holding
+        the coefficient matrix.
+        constant_rows: a list of rows that are lists of numbers holding the
+        constant columns.
+    Returns:
+        a pandas DataFrame holding the coefficients followed by the constant
+        columns as strings.
+    '''
+
+    return pd.DataFrame(
+        [[str(entry) for entry in coefficient_row + constant_row]
+         for coefficient_row, constant_row in zip(coefficient_rows,
+                                                  constant_rows)],
+        columns = (["x" + str(j + 1) for j in range(len(coefficient_rows))] +
+                   ["b" + str(j + 1) for j in range(len(constant_rows[0]))])
+    )
+
+def solution_rows(solutions):
+    '''
+    Args:
+        solutions: a pandas DataFrame returned by batch_solutions.
+    Returns:
+        a list of rows that are lists of the solutions without the Variable
+        column.
+    '''
+
+    return solutions.drop(columns = "Variable").values.tolist()
+
+def test_invertible_matrix_singular_modulo_the_lifting_primes():
+    # The determinant is the product of the primes the modular inverse is
+    # tried with, so the matrix is singular modulo each of them.
+    determinant = 1
+
+    for i in range(3):
+        determinant *= modular.prime(i, modular.LIFTING_PRIME_LIMIT)
+
+    systems = batch_frame([[determinant, 0], [0, 1]], [[1, 2], [3, 4]])
+
+    solutions = solution_rows(linear_systems.batch_solutions(systems, False))
+
+    assert solutions == [
+        [Fraction(1, determinant), Fraction(2, determinant)],
+        [Fraction(3), Fraction(4)]
+    ]
+
+    decimal_solutions = solution_rows(
+        linear_systems.batch_solutions(systems, True)
+    )
+
+    assert decimal_solutions[1] == [Decimal(3), Decimal(4)]
+    assert abs(decimal_solutions[0][0] * determinant - 1) < Decimal("1e-20")
+
+def test_singular_matrix():
+    systems = batch_frame([[1, 2], [2, 4]], [[1], [3]])
+
+    solutions = linear_systems.batch_solutions(systems, False)
+
+    assert solutions["Solutions"].tolist() == [NOT_INVERTIBLE_MESSAGE]
+
+def test_solutions_satisfy_every_system():
+    coefficient_rows = [[2, -1, 0], [Fraction(1, 2), 3, 1], [0, 4, -5]]
+    constant_rows = [[1, 0], [0, Fraction(7, 3)], [2, -1]]
+
+    solutions = solution_rows(linear_systems.batch_solutions(
+        batch_frame(coefficient_rows, constant_rows),
+        False
+    ))
+
+    for i, coefficient_row in enumerate(coefficient_rows):
+        for j in range(len(constant_rows[0])):
+            assert sum(
+                coefficient * Fraction(solution_row[j])
+                for coefficient, solution_row in zip(coefficient_row,
+                                                     solutions)
+            ) == constant_rows[i][j]
+
+def test_each_column_matches_solving_its_system_alone():
+    generator = random.Random(23)
+
+    for trial in range(30):
+        dimension = generator.randint(1, 4)
+
+        coefficient_rows = [[generator.choice([0, 1, -2, 3, "1/2", "0.25"])
+                             for j in range(dimension)]
+                            for i in range(dimension)]
+        constant_rows = [[generator.randint(-5, 5) for k in range(3)]
+                         for i in range(dimension)]
+
+        systems = batch_frame(coefficient_rows, constant_rows)
+
+        for output_decimal in [False, True]:
+            solutions = linear_systems.batch_solutions(systems,
+                                                       output_decimal)
+
+            if "Solutions" in solutions.columns:
+                assert solutions["Solutions"].tolist() == \
+                    [NOT_INVERTIBLE_MESSAGE]
+                continue
+
+            for k in range(3):
+                single_system = systems.iloc[:, list(range(dimension)) +
+                                             [dimension + k]].copy()
+
+                single_solutions = [
+                    line.split(" = ") for line in linear_systems.solution_set(
+                        single_system,
+                        output_decimal
+                    )["Solution Set"]
+                ]
+
+                assert [variable for variable, solution in
+                        single_solutions] == solutions["Variable"].tolist()
+
+                # The batch solver rounds exact solutions to decimals, so in
+                # decimal mode they hold more digits than the float64
+                # solution of one system.
+                for (variable, single_solution), solution in zip(
+                    single_solutions,
+                    solutions["b" + str(k + 1)]
+                ):
+                    if output_decimal:
+                        assert abs(Decimal(single_solution) - solution) <= \
+                            Decimal("1e-10") * max(1, abs(solution))
+
+                    else:
+                        assert single_solution == str(solution)
+
+def test_badly_formed_systems():
+    systems = batch_frame([[2, 1], [1, 3]], [[3], [1]])
+
+    assert linear_systems.batch_solutions(systems.iloc[:, :2], False) \
+        .columns.tolist() == [
+            "Your matrix must have one column of coefficients for each "
+            "equation, followed by at least one column of constants."
+        ]
+
+    systems.iat[0, 0] = "two"
+
+    assert linear_systems.batch_solutions(systems, False).columns[0] \
+        .startswith("At least one of the entries")
@@ -0,0 +1,228 @@
+'''
+This file contains tests of the block diagonal decomposition. Reduced row
+echelon forms and determinants found block by block must be the same as
+the ones found for the whole matrix, including for augmented matrices where
+some of the independent systems are inconsistent.
+'''
+
+import random
+import backends
+import block_diagonal
+import calculations
+import elimination
+import linear_systems
+import pandas as pd
+
+from fractions import Fraction
+
+def shuffled_block_rows(generator, block_shapes, constant_column = False,
+                        inconsistent_blocks = ()):
+    '''
+    Args:
+        generator: a random.Random.
+        block_shapes: a list of tuples holding the number of rows and columns
+        of each block.
+        constant_column: a boolean that is True if a constant column should
+        be added at the end.
+        inconsistent_blocks: the indexes of the blocks whose last row should
+        be the sum of two of its other rows with a different constant.
+    Returns:
+        a list of rows that are lists of Fractions holding a block diagonal
+        matrix whose rows and columns have been shuffled.
+    '''
+
+    row_count = sum(shape[0] for shape in block_shapes)
+    column_count = sum(shape[1] for shape in block_shapes)
+
+    rows = []
+
+    first_column = 0
+
+    for block_index, (block_row_count, block_column_count) in \
+        enumerate(block_shapes):
+
+        block_rows = []
+
+        for i in range(block_row_count):
+            row = [Fraction(0)] * column_count
+
+            for j in range(first_column, first_column + block_column_count):
+                if generator.random() < 0.7:
+                    row[j] = Fraction(generator.randint(-6, 6),
+                                      generator.choice([1, 2, 3]))
+
+            block_rows.append(row + [Fraction(generator.randint(-5, 5))])
+
+        if block_index in inconsistent_blocks and block_row_count >= 3:
+            block_rows[-1] = [first + second for first, second in
+                              zip(block_rows[0], block_rows[1])]
+
+            block_rows[-1][-1] += 1
+
+        rows.extend(block_rows)
+
+        first_column += block_column_count
+
+    row_order = generator.sample(range(row_count), row_count)
+    column_order = generator.sample(range(column_count), column_count)
+
+    if constant_column:
+        column_order.append(column_count)
+
+    return [[rows[i][j] for j in column_order] for i in row_order]
+
+def scaled(rows):
+    '''
+    Args:
+        rows: a list of rows that are lists of Fractions.
+    Returns:
+        an elimination.ScaledMatrix holding the rows.
+    '''
+
+    return elimination.ScaledMatrix(
+        *elimination.fractions_to_integer_rows(rows)
+    )
+
+def test_matrix_blocks():
+    scaled_matrix = elimination.ScaledMatrix(
+        [[0, 2, 0, 0, 1],
+         [1, 0, 0, 3, 1],
+         [0, 0, 0, 0, 1],
+         [0, 4, 5, 0, 1],
+         [6, 0, 0, 0, 1]],
+        [1] * 5
+    )
+
+    # The constant column would link every row, so it is left out.
+    assert block_diagonal.matrix_blocks(scaled_matrix, 4) == [
+        ([1, 4], [0, 3]),
+        ([0, 3], [1, 2])
+    ]
+
+    assert block_diagonal.matrix_blocks(scaled_matrix) == \
+        [([0, 1, 2, 3, 4], [0, 1, 2, 3, 4])]
+
+def test_permutation_sign():
+    assert block_diagonal.permutation_sign([0, 1, 2]) == 1
+    assert block_diagonal.permutation_sign([1, 0, 2]) == -1
+    assert block_diagonal.permutation_sign([1, 2, 0]) == 1
+    assert block_diagonal.permutation_sign([3, 2, 1, 0]) == 1
+
+def test_blocks_match_the_whole_matrix():
+    generator = random.Random(31)
+
+    for trial in range(40):
+        block_shapes = [(generator.randint(1, 4), generator.randint(1, 4))
+                        for k in range(generator.randint(2, 4))]
+
+        scaled_matrix = scaled(shuffled_block_rows(generator, block_shapes))
+
+        blocks = block_diagonal.matrix_blocks(scaled_matrix)
+
+        block_backend = backends.BlockDiagonalBackend(
+            backends.FractionBackend(),
+            blocks
+        )
+
+        whole_result = backends.FractionBackend().reduced_row_echelon_form(
+            scaled_matrix
+        )
+
+        block_result = block_backend.reduced_row_echelon_form(scaled_matrix)
+
+        assert block_result.matrix.tolist() == whole_result.matrix.tolist()
+        assert block_result.pivot_columns == whole_result.pivot_columns
+
+def test_determinants_match_the_whole_matrix():
+    generator = random.Random(32)
+
+    for trial in range(40):
+        block_shapes = []
+
+        for k in range(generator.randint(2, 4)):
+            dimension = generator.randint(1, 4)
+
+            block_shapes.append((dimension, dimension))
+
+        # Some matrices get a block with more rows than columns and one with
+        # more columns than rows, which makes them singular.
+        if trial % 4 == 0:
+            block_shapes[0] = (block_shapes[0][0] + 1, block_shapes[0][1])
+            block_shapes[1] = (block_shapes[1][0], block_shapes[1][1] + 1)
+
+        scaled_matrix = scaled(shuffled_block_rows(generator, block_shapes))
+
+        block_backend = backends.BlockDiagonalBackend(
+            backends.FractionBackend(),
+            block_diagonal.matrix_blocks(scaled_matrix)
+        )
+
+        assert block_backend.determinant(scaled_matrix) == \
+            backends.FractionBackend().determinant(scaled_matrix)
+
+def test_inconsistent_systems_are_stitched_like_the_whole_matrix():
+    generator = random.Random(33)
+
+    for trial in range(60):
+        block_shapes = [(generator.randint(1, 4), generator.randint(1, 4))
+                        for k in range(generator.randint(2, 4))]
+
+        inconsistent_blocks = set(
+            k for k in range(len(block_shapes)) if generator.random() < 0.3
+        )
+
+        rows = shuffled_block_rows(generator, block_shapes, True,
+                                   inconsistent_blocks)
+
+        # Some systems get an equation with no variables, which is
+        # inconsistent when its constant is not zero.
+        if trial % 3 == 0:
+            rows.append([Fraction(0)] * (len(rows[0]) - 1) +
+                        [Fraction(generator.randint(0, 2))])
+
+        scaled_matrix = scaled(rows)
+
+        column_count = scaled_matrix.shape[1]
+
+        block_backend = backends.BlockDiagonalBackend(
+            backends.FractionBackend(),
+            block_diagonal.matrix_blocks(scaled_matrix, column_count - 1),
+            augmented = True
+        )
+
+        whole_result = backends.FractionBackend().reduced_row_echelon_form(
+            scaled_matrix
+        )
+
+        block_result = block_backend.reduced_row_echelon_form(scaled_matrix)
+
+        assert block_result.matrix.tolist() == whole_result.matrix.tolist()
+        assert block_result.pivot_columns == whole_result.pivot_columns
+        assert block_result.inconsistent == whole_result.inconsistent
+
+def test_large_systems_are_split_into_blocks():
+    generator = random.Random(34)
+
+    for inconsistent_blocks in [(), (1,)]:
+        rows = shuffled_block_rows(generator, [(4, 4), (4, 4), (4, 4)], True,
+                                   inconsistent_blocks)
+
+        system = pd.DataFrame([[str(entry) for entry in row]
+                               for row in rows])
+
+        scaled_matrix = calculations.parse_matrix(system)
+
+        assert isinstance(
+            backends.select_backend(scaled_matrix, False, augmented = True),
+            backends.BlockDiagonalBackend
+        )
+
+        reduced_result = linear_systems.reduced_augmented_elimination(
+            system,
+            False
+        )
+
+        assert reduced_result.inconsistent == bool(inconsistent_blocks)
+
+        assert reduced_result.matrix.tolist() == backends.FractionBackend() \
+            .reduced_row_echelon_form(scaled_matrix).matrix.tolist()
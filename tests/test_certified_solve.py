@@ -0,0 +1,118 @@
+'''
+This file contains tests of the certified float64 solve, which rounds a
+float64 solution to fractions and only returns them once they are checked
+exactly. It must either give the exact solution or give up.
+'''
+
+import random
+import elimination
+import float_engine
+import linear_systems
+
+from fractions import Fraction
+from math import lcm
+
+def exact_solution_rows(integer_rows, constant_rows):
+    '''
+    Args:
+        integer_rows: a list of rows that are lists of ints holding a
+        nonsingular coefficient matrix.
+        constant_rows: a list of rows that are lists of ints holding one or
+        more constant columns.
+    Returns:
+        a list of rows that are lists of Fractions holding the solution for
+        each constant column, found by Gauss-Jordan elimination.
+    '''
+
+    dimension = len(integer_rows)
+
+    eliminated = elimination.fraction_free_eliminate(
+        [row + constants for row, constants in
+         zip(integer_rows, constant_rows)],
+        [1] * dimension,
+        reduce_above = True
+    )
+
+    return [row[dimension:] for row in
+            elimination.reduced_rows_to_fractions(eliminated)]
+
+def hilbert_rows(dimension):
+    '''
+    Args:
+        dimension: an int that is the number of rows and columns.
+    Returns:
+        a list of rows that are lists of ints holding the Hilbert matrix
+        multiplied by the lcm of its denominators, which is badly conditioned.
+    '''
+
+    common_denominator = lcm(*range(1, 2 * dimension))
+
+    return [[common_denominator // (i + j + 1) for j in range(dimension)]
+            for i in range(dimension)]
+
+def test_random_systems_are_certified():
+    generator = random.Random(12)
+
+    for trial in range(100):
+        dimension = generator.randint(1, 5)
+
+        integer_rows = [[generator.randint(-5, 5) for j in range(dimension)]
+                        for i in range(dimension)]
+        constant_rows = [[generator.randint(-9, 9) for k in range(3)]
+                         for i in range(dimension)]
+
+        solution_rows = float_engine.certified_solve(integer_rows,
+                                                     constant_rows)
+
+        if float_engine.float_inverse(integer_rows) is None:
+            assert solution_rows is None
+            continue
+
+        # With entries this small, the Hadamard bound keeps the determinant,
+        # and so every denominator, below RATIONAL_DENOMINATOR_LIMIT, so the
+        # solution is always certified.
+        assert solution_rows == exact_solution_rows(integer_rows,
+                                                    constant_rows)
+
+def test_large_denominators_are_never_rounded_wrongly():
+    # The solution 1/1000003 is within round-off of 1/1000000, the nearest
+    # fraction with a small denominator, so only the exact check catches it.
+    assert float_engine.certified_solve([[1000003]], [[1]]) is None
+
+    # Every solution returned for a badly conditioned matrix must be exact.
+    for dimension in range(2, 13):
+        integer_rows = hilbert_rows(dimension)
+        constant_rows = [[1] for i in range(dimension)]
+
+        solution_rows = float_engine.certified_solve(integer_rows,
+                                                     constant_rows)
+
+        if solution_rows is not None:
+            assert solution_rows == exact_solution_rows(integer_rows,
+                                                        constant_rows)
+
+def test_singular_and_huge_systems_give_up():
+    assert float_engine.float_inverse([[1, 2], [2, 4]]) is None
+    assert float_engine.certified_solve([[1, 2], [2, 4]], [[1], [2]]) is None
+
+    assert float_engine.float_inverse([[10 ** 400, 1], [0, 1]]) is None
+    assert float_engine.certified_solve([[10 ** 400, 1], [0, 1]],
+                                        [[1], [1]]) is None
+
+def test_square_solve_falls_back_when_certifying_fails():
+    # The certified solve gives up on these, so the answer comes from p-adic
+    # lifting.
+    for integer_rows, constant_rows in [
+        ([[1000003]], [[1]]),
+        (hilbert_rows(12), [[1] for i in range(12)])
+    ]:
+        coefficient_matrix = elimination.ScaledMatrix(
+            integer_rows,
+            [1] * len(integer_rows)
+        )
+
+        assert linear_systems.square_system_solutions(
+            coefficient_matrix,
+            [[Fraction(constant) for constant in row]
+             for row in constant_rows]
+        ) == exact_solution_rows(integer_rows, constant_rows)
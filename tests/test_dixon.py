@@ -0,0 +1,127 @@
+'''
+This file contains tests of the p-adic lifting solver for square linear
+systems. Its solutions are compared to the ones Gaussian elimination on
+Fractions gives.
+'''
+
+import random
+import elimination
+import linear_systems
+import modular
+import pandas as pd
+
+from fractions import Fraction
+from math import lcm
+
+def gaussian_solution(integer_rows, constants):
+    '''
+    Args:
+        integer_rows: a list of rows that are lists of ints holding a
+        nonsingular coefficient matrix.
+        constants: a list of ints holding the constant column.
+    Returns:
+        a list of Fractions holding the solution found by Gauss-Jordan
+        elimination.
+    '''
+
+    augmented_rows = [[Fraction(entry) for entry in row] + [Fraction(constant)]
+                      for row, constant in zip(integer_rows, constants)]
+
+    eliminated = elimination.fraction_free_eliminate(
+        *elimination.fractions_to_integer_rows(augmented_rows),
+        reduce_above = True
+    )
+
+    return [row[-1] for row in
+            elimination.reduced_rows_to_fractions(eliminated)]
+
+def test_random_systems_match_elimination():
+    generator = random.Random(10)
+
+    solved_count = 0
+
+    for trial in range(100):
+        dimension = generator.randint(1, 8)
+
+        integer_rows = [[generator.randint(-20, 20) for j in range(dimension)]
+                        for i in range(dimension)]
+        constants = [generator.randint(-20, 20) for i in range(dimension)]
+
+        solution = modular.dixon_solve(integer_rows, constants)
+
+        if elimination.fraction_free_determinant(
+            [list(row) for row in integer_rows], [1] * dimension
+        ) == 0:
+            assert solution is None
+            continue
+
+        assert solution == gaussian_solution(integer_rows, constants)
+
+        solved_count += 1
+
+    assert solved_count > 90
+
+def test_large_entries_are_lifted_without_int64():
+    # The coefficients are too large for the products to be done in int64,
+    # and the solution needs many digits.
+    generator = random.Random(11)
+
+    integer_rows = [[generator.randint(-10 ** 25, 10 ** 25) for j in range(5)]
+                    for i in range(5)]
+    constants = [generator.randint(-10 ** 25, 10 ** 25) for i in range(5)]
+
+    solution = modular.dixon_solve(integer_rows, constants)
+
+    assert solution == gaussian_solution(integer_rows, constants)
+    assert modular.solution_verified(integer_rows, constants, solution)
+
+def test_large_denominators():
+    # The inverse of a Hilbert matrix has large entries, so its solutions
+    # have large numerators and denominators.
+    dimension = 7
+
+    hilbert_lcm = lcm(*range(1, 2 * dimension))
+
+    integer_rows = [[hilbert_lcm // (i + j + 1) for j in range(dimension)]
+                    for i in range(dimension)]
+    constants = [1] * dimension
+
+    assert modular.dixon_solve(integer_rows, constants) == \
+        gaussian_solution(integer_rows, constants)
+
+def test_matrix_singular_modulo_the_first_prime():
+    first_prime = modular.prime(0, modular.LIFTING_PRIME_LIMIT)
+
+    integer_rows = [[first_prime, 1], [0, 1]]
+
+    modulus, inverse_residues = modular.inverse_modulo_prime(integer_rows)
+
+    assert modulus == modular.prime(1, modular.LIFTING_PRIME_LIMIT)
+
+    assert modular.dixon_solve(integer_rows, [1, 2]) == \
+        [Fraction(-1, first_prime), Fraction(2)]
+
+def test_singular_systems_and_wrong_solutions():
+    assert modular.inverse_modulo_prime([[1, 2], [2, 4]]) is None
+    assert modular.dixon_solve([[1, 2], [2, 4]], [1, 2]) is None
+
+    assert modular.solution_verified([[1, 2], [3, 4]], [5, 6],
+                                     [Fraction(-4), Fraction(9, 2)])
+    assert not modular.solution_verified([[1, 2], [3, 4]], [5, 6],
+                                         [Fraction(-4), Fraction(9, 4)])
+
+def test_solution_set_without_the_float_solve():
+    coefficient_matrix = elimination.ScaledMatrix([[2, 1], [1, 3]], [1, 2])
+
+    # The second row stands for [1/2, 3/2], and its constant is 1/4.
+    assert linear_systems.square_system_solutions(
+        coefficient_matrix,
+        [[Fraction(3)], [Fraction(1, 4)]],
+        hybrid = False
+    ) == [[Fraction(17, 10)], [Fraction(-2, 5)]]
+
+    system = pd.DataFrame([["2", "1", "3"], ["1", "3", "1/2"]],
+                          columns = ["x", "y", "C"])
+
+    assert linear_systems.solution_set(system, False).values.tolist() == \
+        [["x = 17/10"], ["y = -2/5"]]
@@ -0,0 +1,85 @@
+'''
+This file contains tests of eliminate_pivot_column, the elimination step
+row echelon form, reduced row echelon form and LU factorization share on
+numpy arrays of numbers.
+'''
+
+import random
+import backends
+import elimination
+import numpy as np
+
+from fractions import Fraction
+
+def fraction_array(rows):
+    '''
+    Args:
+        rows: a list of rows of numbers.
+    Returns:
+        a 2d numpy object array holding the numbers as Fractions.
+    '''
+
+    return np.array([[Fraction(entry) for entry in row] for row in rows],
+                    dtype = object)
+
+def test_rows_below_the_pivot():
+    matrix_array = fraction_array([[2, 4, 6], [1, 5, 3], [0, 7, 8],
+                                   [3, 0, 1]])
+
+    elimination.eliminate_pivot_column(matrix_array, 0, 0, range(1, 4))
+
+    assert matrix_array.tolist() == [[2, 4, 6], [0, 3, 0], [0, 7, 8],
+                                     [0, -6, -8]]
+
+def test_rows_above_and_below_the_pivot():
+    matrix_array = fraction_array([[1, 2, 3], [0, 2, 4], [0, 3, 1]])
+
+    elimination.eliminate_pivot_column(matrix_array, 1, 1, [0, 2])
+
+    assert matrix_array.tolist() == [[1, 0, -1], [0, 2, 4], [0, 0, -5]]
+
+def test_multipliers_are_kept_for_LU():
+    matrix_array = fraction_array([[4, 2], [2, 5], [0, 1]])
+
+    elimination.eliminate_pivot_column(matrix_array, 0, 0, range(1, 3),
+                                       keep_multipliers = True)
+
+    assert matrix_array.tolist() == [[4, 2], [Fraction(1, 2), 4], [0, 1]]
+    assert isinstance(matrix_array[2, 0], Fraction)
+
+def test_float_arrays():
+    matrix_array = np.array([[2.0, 1.0], [1.0, 3.0]])
+
+    elimination.eliminate_pivot_column(matrix_array, 0, 0, range(1, 2))
+
+    assert matrix_array.tolist() == [[2.0, 1.0], [0.0, 2.5]]
+
+def test_kernel_gives_the_same_row_echelon_form_as_bareiss():
+    generator = random.Random(28)
+
+    for trial in range(60):
+        row_count = generator.randint(1, 5)
+        column_count = generator.randint(1, 5)
+
+        scaled_matrix = elimination.ScaledMatrix(
+            *elimination.fractions_to_integer_rows([
+                [Fraction(0) if generator.random() < 0.3 else
+                 Fraction(generator.randint(-9, 9), generator.choice([1, 4]))
+                 for j in range(column_count)] for i in range(row_count)
+            ])
+        )
+
+        # The entries the other rules compare are held differently by the
+        # two backends partway through elimination, so they can choose
+        # different pivots. Choosing the first nonzero entry does not depend
+        # on how entries are held.
+        kernel_result = backends.FractionBackend(
+            elimination.FIRST_NONZERO_PIVOT
+        ).row_echelon_form(scaled_matrix)
+
+        bareiss_result = backends.ScaledIntegerBackend(
+            elimination.FIRST_NONZERO_PIVOT
+        ).row_echelon_form(scaled_matrix)
+
+        assert kernel_result[0].tolist() == bareiss_result[0].tolist()
+        assert kernel_result[1] == bareiss_result[1]
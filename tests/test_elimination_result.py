@@ -0,0 +1,129 @@
+'''
+This file contains tests of the EliminationResult reduced row echelon form
+is returned as. What it holds about the elimination must agree with the
+matrix it holds.
+'''
+
+import random
+import backends
+import calculations
+import pandas as pd
+
+def random_frame(generator, row_count, column_count):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+    Returns:
+        a pandas DataFrame of strings holding random ints and fractions, many
+        of them 0, with a dependent last row in about a third of the frames.
+    '''
+
+    rows = [[generator.choice(["0", "0", "0", "1", "-2", "1/2", "5", "-3/4"])
+             for j in range(column_count)] for i in range(row_count)]
+
+    if row_count > 1 and generator.random() < 0.3:
+        rows[-1] = list(rows[0])
+
+    return pd.DataFrame(rows)
+
+def permutation_parity(order):
+    '''
+    Args:
+        order: a list holding a permutation of range(len(order)).
+    Returns:
+        0 if the permutation is made of an even number of swaps and 1
+        otherwise.
+    '''
+
+    order = list(order)
+
+    swaps = 0
+
+    for i in range(len(order)):
+        while order[i] != i:
+            target = order[i]
+            order[i], order[target] = order[target], order[i]
+            swaps += 1
+
+    return swaps % 2
+
+def test_pivots_rank_and_row_order_agree_with_the_matrix():
+    generator = random.Random(22)
+
+    for trial in range(80):
+        row_count = generator.randint(1, 5)
+        column_count = generator.randint(1, 5)
+
+        matrix = random_frame(generator, row_count, column_count)
+
+        scaled_matrix = calculations.parse_matrix(matrix)
+
+        for output_decimal in [False, True]:
+            for backend in [None, backends.FractionBackend(),
+                            backends.ScaledIntegerBackend(),
+                            backends.ModularBackend(),
+                            backends.Float64Backend()]:
+
+                if output_decimal and backend is not None and \
+                    not backend.outputs_decimal:
+                    continue
+
+                reduced_result = calculations.reduced_row_echelon_elimination(
+                    matrix,
+                    output_decimal,
+                    backend
+                )
+
+                reduced_array = reduced_result.matrix
+
+                # Each pivot is a 1 whose column is otherwise 0, and the
+                # rows after the rank are zero rows.
+                for i, pivot_column in enumerate(reduced_result.pivot_columns):
+                    assert reduced_array[i, pivot_column] == 1
+                    assert all(reduced_array[k, pivot_column] == 0 for k in
+                               range(row_count) if k != i)
+                    assert all(reduced_array[i, j] == 0 for j in
+                               range(pivot_column))
+
+                assert reduced_result.rank == \
+                    len(reduced_result.pivot_columns)
+                assert not reduced_array[reduced_result.rank:].any()
+
+                assert reduced_result.pivot_columns == \
+                    backends.FractionBackend().reduced_row_echelon_form(
+                        scaled_matrix
+                    ).pivot_columns
+
+                if reduced_result.row_permutation is not None:
+                    assert sorted(reduced_result.row_permutation) == \
+                        list(range(row_count))
+                    assert permutation_parity(
+                        reduced_result.row_permutation
+                    ) == reduced_result.row_swaps % 2
+
+def test_inconsistent_systems():
+    inconsistent_system = pd.DataFrame([["1", "2", "3"], ["2", "4", "5"]])
+
+    consistent_system = pd.DataFrame([["1", "2", "3"], ["2", "4", "6"]])
+
+    for output_decimal in [False, True]:
+        assert calculations.reduced_row_echelon_elimination(
+            inconsistent_system,
+            output_decimal,
+            augmented = True
+        ).inconsistent
+
+        reduced_result = calculations.reduced_row_echelon_elimination(
+            consistent_system,
+            output_decimal,
+            augmented = True
+        )
+
+        assert not reduced_result.inconsistent
+        assert reduced_result.rank == 1
+
+    assert calculations.reduced_row_echelon_elimination(
+        pd.DataFrame([["1", "x"]])
+    ) is None
@@ -0,0 +1,278 @@
+'''
+This file contains tests of how a Factorization is updated from the
+Factorization of the previous click when the user edits one entry, both when
+the previous outputs were calculated and when they were taken from the
+result cache.
+'''
+
+import random
+import backends
+import calculations
+import elimination
+import linear_systems
+import result_cache
+import subspaces
+import pandas as pd
+
+from fractions import Fraction
+
+class UnusedBackend:
+    '''
+    This backend fails the test if a calculation is done with it, so a
+    result must have come from an update.
+    '''
+
+    outputs_decimal = False
+
+    def LU_factorize(self, scaled_matrix, stop_when_singular = False):
+        raise AssertionError("the matrix was factored again")
+
+    def inverse(self, scaled_matrix, hybrid = True):
+        raise AssertionError("the matrix was inverted again")
+
+def matrix_frame(rows):
+    '''
+    Args:
+        rows: a list of rows of numbers.
+    Returns:
+        a pandas DataFrame holding the entries as strings, the way the app
+        passes them in.
+    '''
+
+    return pd.DataFrame(
+        [[str(entry) for entry in row] for row in rows],
+        columns = ["x" + str(j + 1) for j in range(len(rows[0]))]
+    )
+
+def exact_determinant(matrix):
+    '''
+    Args:
+        matrix: a pandas DataFrame holding a square matrix.
+    Returns:
+        the determinant found by elimination, without a Factorization.
+    '''
+
+    scaled_matrix = calculations.parse_matrix(matrix)
+
+    return backends.select_backend(scaled_matrix, False).determinant(
+        scaled_matrix
+    )
+
+def panel_click(cache, matrix, previous, inner_function):
+    '''
+    This function does what a calculator panel does when the user clicks its
+    calculate button, for one output that shares the Factorization.
+    Args:
+        cache: the result_cache.ResultCache the panel uses.
+        matrix: a pandas DataFrame holding the user-entered matrix.
+        previous: the Factorization of the previous click, or None.
+        inner_function: the function of the output.
+    Returns:
+        a tuple whose first item is the output and whose second item is the
+        Factorization of this click.
+    '''
+
+    factorization = calculations.Factorization(matrix, False, cache = cache)
+
+    factorization.update_from(previous)
+
+    output = cache.result(
+        result_cache.result_key(factorization.matrix_hash, inner_function,
+                                False),
+        lambda: inner_function(matrix, False, factorization = factorization)
+    )
+
+    return output, factorization
+
+def test_matrix_is_read_once_per_click(monkeypatch):
+    reads = []
+
+    parse_matrix = calculations.parse_matrix
+
+    def counted_parse_matrix(matrix):
+        reads.append(matrix.shape)
+
+        return parse_matrix(matrix)
+
+    monkeypatch.setattr(calculations, "parse_matrix", counted_parse_matrix)
+
+    matrix = matrix_frame([[2, Fraction(1, 2), 0], [1, 3, 1], [0, 1, "0.4"]])
+
+    for output_decimal in [False, True]:
+        factorization = calculations.Factorization(
+            matrix,
+            output_decimal,
+            cache = result_cache.ResultCache()
+        )
+
+        for inner_function in [
+            calculations.row_echelon_form,
+            calculations.reduced_row_echelon_form,
+            calculations.LU_factorize,
+            calculations.determinant,
+            calculations.inverse,
+            linear_systems.solution_set,
+            linear_systems.parametric_vector_solution_set,
+            linear_systems.batch_solutions,
+            subspaces.null_space_basis,
+            subspaces.row_space_basis
+        ]:
+            inner_function(matrix, output_decimal,
+                           factorization = factorization)
+
+    assert reads == [(3, 3), (3, 3)]
+
+def test_determinant_follows_edits():
+    generator = random.Random(3)
+
+    rows = [[generator.randint(-5, 5) for j in range(6)] for i in range(6)]
+
+    factorization = calculations.Factorization(matrix_frame(rows), False)
+
+    calculations.determinant(factorization.matrix,
+                             factorization = factorization)
+
+    for step in range(20):
+        rows[generator.randrange(6)][generator.randrange(6)] = \
+            Fraction(generator.randint(-9, 9), generator.randint(1, 3))
+
+        matrix = matrix_frame(rows)
+
+        previous = factorization
+
+        factorization = calculations.Factorization(matrix, False)
+
+        factorization.update_from(previous)
+
+        assert calculations.determinant(
+            matrix,
+            factorization = factorization
+        ) == exact_determinant(matrix)
+
+def test_determinant_panel_updates_without_factoring():
+    cache = result_cache.ResultCache()
+
+    first_matrix = matrix_frame([[2, 1, 0], [1, 3, 1], [0, 1, 4]])
+    second_matrix = matrix_frame([[2, 1, 0], [1, 5, 1], [0, 1, 4]])
+
+    determinant, factorization = panel_click(cache, first_matrix, None,
+                                             calculations.determinant)
+
+    assert determinant == exact_determinant(first_matrix)
+
+    updated = calculations.Factorization(second_matrix, False)
+    updated.update_from(factorization)
+
+    assert calculations.determinant(
+        second_matrix,
+        backend = UnusedBackend(),
+        factorization = updated
+    ) == exact_determinant(second_matrix)
+
+def test_update_after_cache_hit():
+    cache = result_cache.ResultCache()
+
+    first_matrix = matrix_frame([[4, 1, 2], [1, 3, 0], [2, 0, 5]])
+    second_matrix = matrix_frame([[4, 1, 2], [1, 3, 0], [2, 7, 5]])
+
+    # Another session calculates the outputs for the first matrix.
+    for inner_function in [calculations.determinant, calculations.inverse]:
+        panel_click(cache, first_matrix, None, inner_function)
+
+    # This session's first click takes them from the cache, so nothing is
+    # calculated for its Factorization.
+    for inner_function in [calculations.determinant, calculations.inverse]:
+        output, factorization = panel_click(cache, first_matrix, None,
+                                            inner_function)
+
+        assert factorization.results == {}
+
+        # The edit is still updated from the exact results in the cache.
+        updated = calculations.Factorization(second_matrix, False)
+        updated.update_from(factorization)
+
+        output = inner_function(second_matrix, False,
+                                backend = UnusedBackend(),
+                                factorization = updated)
+
+        if inner_function is calculations.determinant:
+            assert output == exact_determinant(second_matrix)
+
+        else:
+            assert output.equals(calculations.inverse(second_matrix))
+
+def test_edit_making_matrix_singular():
+    first_matrix = matrix_frame([[1, 2], [3, 4]])
+    second_matrix = matrix_frame([[1, 2], [3, 6]])
+
+    factorization = calculations.Factorization(first_matrix, False)
+
+    calculations.determinant(first_matrix, factorization = factorization)
+    calculations.inverse(first_matrix, factorization = factorization)
+
+    updated = calculations.Factorization(second_matrix, False)
+    updated.update_from(factorization)
+
+    assert calculations.determinant(second_matrix,
+                                    factorization = updated) == 0
+    assert calculations.inverse(second_matrix, factorization = updated) \
+        .columns[0] == "The matrix you entered is not invertible."
+
+def test_inverse_follows_edits():
+    generator = random.Random(4)
+
+    rows = [[generator.randint(-5, 5) for j in range(5)] for i in range(5)]
+
+    factorization = calculations.Factorization(matrix_frame(rows), False)
+
+    calculations.inverse(factorization.matrix, factorization = factorization)
+
+    for step in range(20):
+        rows[generator.randrange(5)][generator.randrange(5)] = \
+            Fraction(generator.randint(-9, 9), generator.randint(1, 3))
+
+        matrix = matrix_frame(rows)
+
+        previous = factorization
+
+        factorization = calculations.Factorization(matrix, False)
+
+        factorization.update_from(previous)
+
+        assert calculations.inverse(
+            matrix,
+            factorization = factorization
+        ).equals(calculations.inverse(matrix))
+
+def test_rank_one_update_matches_the_edited_matrix():
+    generator = random.Random(5)
+
+    for trial in range(60):
+        dimension = generator.randint(1, 5)
+
+        rows = [[Fraction(generator.randint(-5, 5)) for j in
+                 range(dimension)] for i in range(dimension)]
+
+        factorization = elimination.fraction_free_PLU(
+            *elimination.fractions_to_integer_rows(rows)
+        )
+
+        i = generator.randrange(dimension)
+        j = generator.randrange(dimension)
+
+        delta = Fraction(generator.randint(-5, 5), generator.randint(1, 3))
+
+        updated = factorization.rank_one_update(i, j, delta)
+
+        rows[i][j] += delta
+
+        # The update gives up when a pivot of the edited matrix would be 0,
+        # and the matrix is factored again instead.
+        if updated is None:
+            continue
+
+        assert updated.P_array().dot(updated.L_array()) \
+            .dot(updated.U_array()).tolist() == rows
+        assert updated.determinant() == elimination.fraction_free_determinant(
+            *elimination.fractions_to_integer_rows(rows)
+        )
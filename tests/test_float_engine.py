@@ -0,0 +1,130 @@
+'''
+This file contains tests of the float64 engine's test for entries that are
+treated as 0, which is relative to the numbers each entry was calculated
+from, and of its determinants, inverses and LU factorizations, which must
+be close to the exact ones.
+'''
+
+import random
+import backends
+import float_engine
+import elimination
+import numpy as np
+
+from fractions import Fraction
+
+def low_rank_matrix(generator, row_count, column_count, rank):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+        rank: an int that is at most the rank of the matrix.
+    Returns:
+        an elimination.ScaledMatrix holding the product of a random
+        row_count x rank matrix of Fractions and a random rank x column_count
+        matrix of ints, about half of whose entries are 0.
+    '''
+
+    left_rows = [[Fraction(generator.randint(-9, 9), generator.choice([1, 3]))
+                  if generator.random() < 0.5 else Fraction(0)
+                  for k in range(rank)] for i in range(row_count)]
+
+    right_rows = [[generator.randint(-5, 5) if generator.random() < 0.5
+                   else 0 for j in range(column_count)] for k in range(rank)]
+
+    product_rows = [[sum(left_rows[i][k] * right_rows[k][j]
+                         for k in range(rank))
+                     for j in range(column_count)] for i in range(row_count)]
+
+    return elimination.ScaledMatrix(*elimination.fractions_to_integer_rows(
+        product_rows
+    ))
+
+def test_rank_matches_exact_rank():
+    generator = random.Random(11)
+
+    for trial in range(300):
+        row_count = generator.randint(2, 10)
+        column_count = generator.randint(2, 10)
+
+        scaled_matrix = low_rank_matrix(
+            generator,
+            row_count,
+            column_count,
+            generator.randint(1, min(row_count, column_count))
+        )
+
+        exact_rank = backends.select_backend(
+            scaled_matrix,
+            False
+        ).LU_factorize(scaled_matrix).rank
+
+        for scale in [1.0, 1e10, 1e-11]:
+            pivot_columns = float_engine.eliminate(
+                scaled_matrix.float_array() * scale,
+                reduce_above = True
+            )[1]
+
+            assert len(pivot_columns) == exact_rank
+
+def test_determinant_inverse_and_LU_match_exact_results():
+    generator = random.Random(12)
+
+    for trial in range(100):
+        dimension = generator.randint(1, 6)
+
+        # Some of the matrices have a lower rank, so they are singular.
+        scaled_matrix = low_rank_matrix(
+            generator,
+            dimension,
+            dimension,
+            generator.choice([dimension, dimension, max(dimension - 1, 1)])
+        )
+
+        float_array = scaled_matrix.float_array()
+
+        exact_backend = backends.FractionBackend()
+
+        exact_determinant = exact_backend.determinant(scaled_matrix)
+
+        float_determinant = float_engine.determinant(float_array)
+
+        if exact_determinant == 0:
+            assert float_determinant == 0
+
+        else:
+            assert abs(float(float_determinant) - float(exact_determinant)) \
+                <= 1e-9 * abs(float(exact_determinant))
+
+        exact_inverse = exact_backend.inverse(scaled_matrix, hybrid = False)
+
+        inverse_array = float_engine.inverse(float_array)
+
+        if exact_inverse is None:
+            assert inverse_array is None
+
+        else:
+            assert np.allclose(inverse_array,
+                               exact_inverse.astype(np.float64),
+                               rtol = 1e-9, atol = 1e-9)
+
+        factorization = float_engine.LU_factorize(float_array.copy())
+
+        assert factorization.rank == exact_backend.LU_factorize(
+            scaled_matrix
+        ).rank
+
+        assert np.allclose(
+            factorization.P_array().astype(np.float64) @
+            factorization.L_array().astype(np.float64) @
+            factorization.U_array().astype(np.float64),
+            float_array
+        )
+
+def test_output_decimals():
+    assert str(float_engine.output_decimal(1 / 3)) == "0.333333333333"
+    assert str(float_engine.output_decimal(0.1 + 0.2)) == "0.3"
+
+    # -0.0 is displayed without a negative sign.
+    assert str(float_engine.output_decimal(-0.0)) == "0"
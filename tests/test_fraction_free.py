@@ -0,0 +1,137 @@
+'''
+This file contains tests of the fraction-free (Bareiss) elimination engine.
+Its row echelon form and determinant are compared to the ones ordinary
+Gaussian elimination on Fractions gives.
+'''
+
+import random
+import calculations
+import elimination
+import pandas as pd
+
+from fractions import Fraction
+
+def random_rows(generator, row_count, column_count):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+    Returns:
+        a list of rows that are lists of Fractions, with many zeros so that
+        rows must be swapped and some matrices are singular.
+    '''
+
+    return [
+        [0 if generator.random() < 0.3 else
+         Fraction(generator.randint(-9, 9), generator.choice([1, 1, 2, 3]))
+         for j in range(column_count)]
+        for i in range(row_count)
+    ]
+
+def gaussian_row_echelon_form(rows):
+    '''
+    Args:
+        rows: a list of rows that are lists of Fractions.
+    Returns:
+        a tuple whose first item is the row echelon form ordinary Gaussian
+        elimination gives when the first nonzero entry of each column is
+        used as the pivot, and whose second item is the determinant if the
+        matrix is square.
+    '''
+
+    rows = [list(row) for row in rows]
+
+    determinant = Fraction(1)
+
+    pivot_row = 0
+
+    for j in range(len(rows[0])):
+        if pivot_row == len(rows):
+            break
+
+        nonzero_rows = [i for i in range(pivot_row, len(rows))
+                        if rows[i][j] != 0]
+
+        if len(nonzero_rows) == 0:
+            determinant = Fraction(0)
+            continue
+
+        if nonzero_rows[0] != pivot_row:
+            rows[pivot_row], rows[nonzero_rows[0]] = \
+                rows[nonzero_rows[0]], rows[pivot_row]
+            determinant = -determinant
+
+        determinant *= rows[pivot_row][j]
+
+        for i in range(pivot_row + 1, len(rows)):
+            multiple = rows[i][j] / rows[pivot_row][j]
+
+            rows[i] = [entry - multiple * pivot_entry
+                       for entry, pivot_entry in zip(rows[i], rows[pivot_row])]
+
+        pivot_row += 1
+
+    if pivot_row < len(rows):
+        determinant = Fraction(0)
+
+    return rows, determinant
+
+def test_echelon_rows_match_gaussian_elimination():
+    generator = random.Random(1)
+
+    for trial in range(200):
+        rows = random_rows(generator, generator.randint(1, 6),
+                           generator.randint(1, 6))
+
+        integer_rows, row_scales = elimination.fractions_to_integer_rows(rows)
+
+        eliminated = elimination.fraction_free_eliminate(
+            integer_rows,
+            row_scales,
+            pivot_rule = elimination.FIRST_NONZERO_PIVOT
+        )
+
+        assert elimination.echelon_rows_to_fractions(eliminated) == \
+            gaussian_row_echelon_form(rows)[0]
+
+def test_determinant_matches_gaussian_elimination():
+    generator = random.Random(2)
+
+    for trial in range(200):
+        dimension = generator.randint(1, 7)
+
+        rows = random_rows(generator, dimension, dimension)
+
+        integer_rows, row_scales = elimination.fractions_to_integer_rows(rows)
+
+        for pivot_rule in [None, elimination.FIRST_NONZERO_PIVOT]:
+            assert elimination.fraction_free_determinant(
+                [list(row) for row in integer_rows],
+                row_scales,
+                pivot_rule = pivot_rule
+            ) == gaussian_row_echelon_form(rows)[1]
+
+def test_divisions_are_exact_for_large_entries():
+    # Bareiss elimination only ever divides by a previous pivot, and the
+    # division must be exact. Entries this large would lose digits if any
+    # float were involved.
+    rows = [[Fraction(10 ** 30 + i * j + (i == j)) for j in range(6)]
+            for i in range(6)]
+
+    integer_rows, row_scales = elimination.fractions_to_integer_rows(rows)
+
+    assert elimination.fraction_free_determinant(integer_rows, row_scales) == \
+        gaussian_row_echelon_form(rows)[1]
+
+def test_row_echelon_form_and_determinant_outputs():
+    matrix = pd.DataFrame([["1/2", "3"], ["4", "-1"]], columns = ["a", "b"])
+
+    assert calculations.determinant(matrix.copy(), False) == \
+        Fraction(-25, 2)
+    assert calculations.row_echelon_form(matrix.copy(), False).values \
+        .tolist() == [[Fraction(1, 2), 3], [0, -25]]
+
+    singular = pd.DataFrame([["1", "2"], ["2", "4"]], columns = ["a", "b"])
+
+    assert calculations.determinant(singular, False) == 0
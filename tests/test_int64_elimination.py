@@ -0,0 +1,133 @@
+'''
+This file contains tests of fraction-free elimination in int64 numpy
+arrays. Its results must match elimination with Python ints exactly, and
+matrices whose entries grow too large for int64 must be promoted to Python
+ints rather than overflow.
+'''
+
+import random
+import elimination
+import numpy as np
+
+PIVOT_RULES = [
+    elimination.LARGEST_PIVOT,
+    elimination.SMALLEST_BITS_PIVOT,
+    elimination.MARKOWITZ_PIVOT,
+    elimination.FIRST_NONZERO_PIVOT
+]
+
+def random_integer_rows(generator, row_count, column_count, largest_entry):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+        largest_entry: an int that is the largest absolute value an entry can
+        have.
+    Returns:
+        a list of rows that are lists of ints, about a quarter of which are 0.
+    '''
+
+    return [[0 if generator.random() < 0.25 else
+             generator.randint(-largest_entry, largest_entry)
+             for j in range(column_count)] for i in range(row_count)]
+
+def both_eliminations(integer_rows, **options):
+    '''
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+        options: the keyword arguments both eliminations are called with.
+    Returns:
+        a tuple holding the dictionaries int64_fraction_free_eliminate and
+        fraction_free_eliminate return for the matrix.
+    '''
+
+    return (
+        elimination.int64_fraction_free_eliminate(
+            np.array(integer_rows, dtype = np.int64),
+            **options
+        ),
+        elimination.fraction_free_eliminate(
+            [list(row) for row in integer_rows],
+            [1] * len(integer_rows),
+            **options
+        )
+    )
+
+def test_int64_elimination_matches_python_ints():
+    generator = random.Random(17)
+
+    for trial in range(100):
+        integer_rows = random_integer_rows(generator, generator.randint(1, 6),
+                                           generator.randint(1, 6), 9)
+
+        for pivot_rule in PIVOT_RULES:
+            for keep_multipliers in [False, True]:
+                int64_result, python_result = both_eliminations(
+                    integer_rows,
+                    pivot_rule = pivot_rule,
+                    keep_multipliers = keep_multipliers
+                )
+
+                assert int64_result == python_result
+
+def test_growing_entries_are_promoted():
+    generator = random.Random(18)
+
+    # The entries fit in int64, but the minors elimination creates grow past
+    # 2 ** 63 within a few steps.
+    integer_rows = random_integer_rows(generator, 10, 10, 10 ** 5)
+
+    int64_result, python_result = both_eliminations(integer_rows)
+
+    assert int64_result == python_result
+    assert max(abs(entry) for row in int64_result["rows"]
+               for entry in row) >= 2 ** 63
+
+    assert elimination.int64_determinant(
+        np.array(integer_rows, dtype = np.int64)
+    ) == elimination.fraction_free_determinant(
+        [list(row) for row in integer_rows],
+        [1] * 10
+    )
+
+def test_entries_near_the_limit_are_promoted_before_the_first_step():
+    largest_entry = elimination.INT64_ENTRY_LIMIT
+
+    integer_rows = [[largest_entry, largest_entry - 1],
+                    [-largest_entry + 1, largest_entry]]
+
+    int64_result, python_result = both_eliminations(integer_rows)
+
+    assert int64_result == python_result
+
+    assert elimination.int64_determinant(
+        np.array(integer_rows, dtype = np.int64)
+    ) == largest_entry ** 2 + (largest_entry - 1) ** 2
+
+def test_int64_PLU_matches_python_ints():
+    generator = random.Random(19)
+
+    for trial in range(60):
+        dimension = generator.randint(1, 6)
+
+        integer_rows = random_integer_rows(generator, dimension, dimension,
+                                           10 ** 4)
+
+        int64_factorization = elimination.int64_PLU(
+            np.array(integer_rows, dtype = np.int64)
+        )
+
+        python_factorization = elimination.fraction_free_PLU(
+            [list(row) for row in integer_rows],
+            [1] * dimension
+        )
+
+        assert int64_factorization.packed_array.tolist() == \
+            python_factorization.packed_array.tolist()
+        assert int64_factorization.row_permutation == \
+            python_factorization.row_permutation
+
+        assert int64_factorization.P_array().dot(
+            int64_factorization.L_array()
+        ).dot(int64_factorization.U_array()).tolist() == integer_rows
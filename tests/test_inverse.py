@@ -0,0 +1,106 @@
+'''
+This file contains tests of finding inverses with triangular solves rather
+than by row reducing the matrix next to the identity matrix. The inverses
+must be the same as the right half of the reduced row echelon form of
+[A | I].
+'''
+
+import random
+import backends
+import calculations
+import elimination
+import pandas as pd
+
+from fractions import Fraction
+
+def random_scaled_matrix(generator, dimension, largest_entry):
+    '''
+    Args:
+        generator: a random.Random.
+        dimension: an int that is the number of rows and columns.
+        largest_entry: an int that is the largest absolute value of a
+        numerator.
+    Returns:
+        an elimination.ScaledMatrix holding random Fractions, some of them 0.
+    '''
+
+    return elimination.ScaledMatrix(*elimination.fractions_to_integer_rows([
+        [Fraction(0) if generator.random() < 0.25 else
+         Fraction(generator.randint(-largest_entry, largest_entry),
+                  generator.choice([1, 2, 5]))
+         for j in range(dimension)] for i in range(dimension)
+    ]))
+
+def identity_inverse(scaled_matrix):
+    '''
+    Args:
+        scaled_matrix: an elimination.ScaledMatrix holding a square matrix.
+    Returns:
+        the right half of the reduced row echelon form of the matrix next to
+        the identity matrix as a list of rows, or None if the left half is
+        not the identity matrix.
+    '''
+
+    dimension = scaled_matrix.shape[0]
+
+    reduced_result = backends.FractionBackend().reduced_row_echelon_form(
+        scaled_matrix.with_identity()
+    )
+
+    if reduced_result.pivot_columns[:dimension] != list(range(dimension)):
+        return None
+
+    return reduced_result.matrix[:, dimension:].tolist()
+
+def test_triangular_solves_match_the_identity_method():
+    generator = random.Random(27)
+
+    for trial in range(100):
+        dimension = generator.randint(1, 6)
+
+        # Entries this large are too large for int64 elimination, so both
+        # the int64 and the Python int paths are checked.
+        largest_entry = generator.choice([9, 10 ** 20])
+
+        scaled_matrix = random_scaled_matrix(generator, dimension,
+                                             largest_entry)
+
+        expected = identity_inverse(scaled_matrix)
+
+        for backend in [backends.FractionBackend(),
+                        backends.ScaledIntegerBackend()]:
+            inverse_array = backend.inverse(scaled_matrix, hybrid = False)
+
+            if expected is None:
+                assert inverse_array is None
+
+            else:
+                assert inverse_array.tolist() == expected
+
+        factorization = backends.ScaledIntegerBackend().LU_factorize(
+            scaled_matrix
+        )
+
+        if expected is None:
+            assert factorization.inverse() is None
+
+        else:
+            assert factorization.inverse().tolist() == expected
+
+def test_non_square_factorizations_have_no_inverse():
+    factorization = backends.ScaledIntegerBackend().LU_factorize(
+        elimination.ScaledMatrix([[1, 2, 3], [4, 5, 6]], [1, 1])
+    )
+
+    assert factorization.inverse() is None
+
+def test_inverse_output():
+    matrix = pd.DataFrame([["2", "1/2"], ["1", "3"]])
+
+    assert calculations.inverse(matrix, False, hybrid = False).values \
+        .tolist() == [[Fraction(6, 11), Fraction(-1, 11)],
+                      [Fraction(-2, 11), Fraction(4, 11)]]
+
+    assert calculations.inverse(pd.DataFrame([["1", "2"], ["2", "4"]]),
+                                False).columns[0] == \
+        "The matrix you entered is not invertible."
@@ -0,0 +1,134 @@
+'''
+This file contains tests of the multi-modular determinant, which finds the
+determinant modulo several primes and rebuilds it with the Chinese Remainder
+Theorem. Its results are compared to fraction-free elimination.
+'''
+
+import random
+import backends
+import calculations
+import elimination
+import modular
+import pandas as pd
+
+from fractions import Fraction
+
+def random_integer_rows(generator, dimension, digits):
+    '''
+    Args:
+        generator: a random.Random.
+        dimension: an int that is the number of rows and columns.
+        digits: an int that is the most digits an entry can have.
+    Returns:
+        a list of rows that are lists of ints of both signs.
+    '''
+
+    return [[generator.randint(-10 ** digits, 10 ** digits)
+             for j in range(dimension)]
+            for i in range(dimension)]
+
+def exact_determinant(integer_rows, row_scales):
+    '''
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+        row_scales: a list holding the int each row was multiplied by.
+    Returns:
+        the determinant found by fraction-free elimination.
+    '''
+
+    return elimination.fraction_free_determinant(
+        [list(row) for row in integer_rows],
+        list(row_scales)
+    )
+
+def test_primes_are_prime_and_decreasing():
+    primes = [modular.prime(index, limit = 1000) for index in range(20)]
+
+    assert primes == sorted(primes, reverse = True)
+    assert primes[0] == 997
+
+    for number in primes:
+        assert all(number % divisor != 0
+                   for divisor in range(2, int(number ** 0.5) + 1))
+
+    assert modular.prime(0) < modular.PRIME_LIMIT
+    assert modular.is_prime(modular.prime(0))
+
+def test_chinese_remainder_matches_both_residues():
+    generator = random.Random(3)
+
+    first_modulus = modular.prime(0)
+    second_modulus = modular.prime(1)
+
+    for trial in range(100):
+        number = generator.randint(0, first_modulus * second_modulus - 1)
+
+        assert modular.chinese_remainder(
+            number % first_modulus,
+            first_modulus,
+            number % second_modulus,
+            second_modulus
+        ) == (number, first_modulus * second_modulus)
+
+def test_small_determinants_match_elimination():
+    generator = random.Random(4)
+
+    for trial in range(100):
+        dimension = generator.randint(1, 6)
+
+        integer_rows = random_integer_rows(generator, dimension, 2)
+        row_scales = [generator.choice([1, 2, 3, 10]) for i in
+                      range(dimension)]
+
+        assert modular.multi_modular_determinant(integer_rows, row_scales) \
+            == exact_determinant(integer_rows, row_scales)
+
+def test_large_determinants_need_several_batches_of_primes():
+    generator = random.Random(5)
+
+    integer_rows = random_integer_rows(generator, 8, 80)
+
+    # The determinant is about 640 digits long, which needs more primes than
+    # fit in one batch.
+    bound_squared = modular.hadamard_bound_squared(integer_rows)
+
+    assert bound_squared.bit_length() // 2 > \
+        31 * modular.PRIME_BATCH_SIZE
+
+    determinant = modular.multi_modular_determinant(integer_rows,
+                                                    [1] * 8)
+
+    assert determinant == exact_determinant(integer_rows, [1] * 8)
+    assert determinant ** 2 <= bound_squared
+
+def test_negative_and_singular_determinants():
+    assert modular.multi_modular_determinant([[0, 1], [1, 0]], [1, 1]) == -1
+    assert modular.multi_modular_determinant([[2, 4], [3, 6]], [1, 1]) == 0
+    assert modular.multi_modular_determinant([[0, 0], [3, 6]], [1, 1]) == 0
+
+    # A row that is a multiple of another is 0 modulo every prime, even
+    # though it is not a zero row.
+    assert modular.multi_modular_determinant(
+        [[10 ** 40, 3, 1], [2 * 10 ** 40, 6, 2], [5, 7, 9]],
+        [1, 1, 1]
+    ) == 0
+
+    assert modular.multi_modular_determinant([[1, 2], [3, 4]], [2, 3]) == \
+        Fraction(-2, 6)
+
+def test_large_matrices_use_the_multi_modular_backend():
+    generator = random.Random(6)
+
+    dimension = backends.MULTI_MODULAR_MIN_DIMENSION
+
+    integer_rows = random_integer_rows(generator, dimension, 3)
+
+    matrix = pd.DataFrame([[str(entry) for entry in row]
+                           for row in integer_rows])
+
+    scaled_matrix = calculations.parse_matrix(matrix)
+
+    assert isinstance(backends.select_backend(scaled_matrix, False),
+                      backends.ModularBackend)
+    assert calculations.determinant(matrix, False) == \
+        exact_determinant(integer_rows, [1] * dimension)
@@ -0,0 +1,125 @@
+'''
+This file contains tests of the multi-modular reduced row echelon form,
+which rebuilds each fraction from its residues with rational reconstruction
+and checks the result exactly. Results are compared to fraction-free
+Gauss-Jordan elimination.
+'''
+
+import random
+import elimination
+import modular
+import numpy as np
+
+from fractions import Fraction
+
+def exact_reduced_row_echelon_form(integer_rows):
+    '''
+    Args:
+        integer_rows: a list of rows that are lists of ints.
+    Returns:
+        a tuple whose first item is the reduced row echelon form found by
+        fraction-free elimination, as a list of rows that are lists of
+        Fractions, and whose second item is the list of pivot columns.
+    '''
+
+    eliminated = elimination.fraction_free_eliminate(
+        [list(row) for row in integer_rows],
+        [1] * len(integer_rows),
+        reduce_above = True
+    )
+
+    return elimination.reduced_rows_to_fractions(eliminated), \
+        eliminated["pivot_columns"]
+
+def test_rational_reconstruction_recovers_small_fractions():
+    generator = random.Random(7)
+
+    modulus = modular.prime(0)
+
+    bound = int((modulus // 2) ** 0.5)
+
+    for trial in range(200):
+        numerator = generator.randint(-bound, bound)
+        denominator = generator.randint(1, bound)
+
+        residue = numerator * pow(denominator, -1, modulus) % modulus
+
+        assert modular.rational_reconstruction(residue, modulus, bound) == \
+            Fraction(numerator, denominator)
+
+def test_reconstruct_fractions_keeps_a_common_denominator():
+    modulus = modular.prime(0)
+
+    fractions = [[Fraction(1, 3), Fraction(-2, 3), Fraction(5)],
+                 [Fraction(7, 6), Fraction(0), Fraction(-1, 2)]]
+
+    residue_array = np.array(
+        [[entry.numerator * pow(entry.denominator, -1, modulus) % modulus
+          for entry in row] for row in fractions],
+        dtype = object
+    )
+
+    assert modular.reconstruct_fractions(residue_array, modulus) == fractions
+
+def test_random_matrices_match_elimination():
+    generator = random.Random(8)
+
+    for trial in range(100):
+        row_count = generator.randint(1, 6)
+        column_count = generator.randint(1, 7)
+
+        integer_rows = [[generator.randint(-9, 9) if generator.random() < 0.7
+                         else 0 for j in range(column_count)]
+                        for i in range(row_count)]
+
+        # About a third of the matrices get a dependent row so that they
+        # have free columns.
+        if row_count > 2 and generator.random() < 0.3:
+            integer_rows[-1] = [first + 2 * second for first, second in
+                                zip(integer_rows[0], integer_rows[1])]
+
+        assert modular.multi_modular_reduced_row_echelon_form(
+            integer_rows
+        ) == exact_reduced_row_echelon_form(integer_rows)
+
+def test_large_entries_need_several_batches_of_primes():
+    generator = random.Random(9)
+
+    integer_rows = [[generator.randint(-10 ** 50, 10 ** 50)
+                     for j in range(6)] for i in range(4)]
+
+    assert modular.multi_modular_reduced_row_echelon_form(integer_rows) == \
+        exact_reduced_row_echelon_form(integer_rows)
+
+def test_pivots_missed_modulo_a_prime_are_found():
+    # The first column is 0 modulo the first prime used, so that prime finds
+    # the wrong pivot columns. Its results must be thrown away.
+    first_prime = modular.prime(0)
+
+    integer_rows = [[first_prime, 1, 2], [0, 1, 3]]
+
+    result = modular.multi_modular_reduced_row_echelon_form(integer_rows)
+
+    assert result[1] == [0, 1]
+    assert result == exact_reduced_row_echelon_form(integer_rows)
+
+    # Here the matrix only has rank 1 modulo the first prime.
+    integer_rows = [[first_prime, 0], [0, 1]]
+
+    assert modular.multi_modular_reduced_row_echelon_form(integer_rows) == \
+        ([[1, 0], [0, 1]], [0, 1])
+
+def test_wrong_results_are_not_verified():
+    integer_array = np.array([[1, 2, 3], [2, 4, 7]], dtype = object)
+
+    correct_rows = [[Fraction(1), Fraction(2), Fraction(0)],
+                    [Fraction(0), Fraction(0), Fraction(1)]]
+
+    assert modular.reduced_rows_verified(integer_array, correct_rows,
+                                         [0, 2], [1])
+
+    wrong_rows = [[Fraction(1), Fraction(3), Fraction(0)],
+                  [Fraction(0), Fraction(0), Fraction(1)]]
+
+    assert not modular.reduced_rows_verified(integer_array, wrong_rows,
+                                             [0, 2], [1])
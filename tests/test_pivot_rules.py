@@ -0,0 +1,138 @@
+'''
+This file contains tests of the pivot rules exact elimination can choose
+pivots with. Reduced row echelon form and the determinant do not depend on
+the pivots chosen, so every rule must give the same ones.
+'''
+
+import random
+import backends
+import calculations
+import elimination
+import pandas as pd
+
+from fractions import Fraction
+
+PIVOT_RULES = [
+    elimination.LARGEST_PIVOT,
+    elimination.SMALLEST_BITS_PIVOT,
+    elimination.MARKOWITZ_PIVOT,
+    elimination.FIRST_NONZERO_PIVOT
+]
+
+def random_matrix(generator, row_count, column_count):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+    Returns:
+        an elimination.ScaledMatrix holding a random matrix with many zeros,
+        some fractions and, in about a third of the matrices, a row that is
+        the sum of two others, so that it is singular.
+    '''
+
+    rows = [
+        [0 if generator.random() < 0.3 else
+         Fraction(generator.randint(-20, 20), generator.choice([1, 1, 2, 7]))
+         for j in range(column_count)]
+        for i in range(row_count)
+    ]
+
+    if row_count >= 3 and generator.random() < 0.3:
+        rows[-1] = [first + second for first, second in
+                    zip(rows[0], rows[1])]
+
+    return calculations.parse_matrix(pd.DataFrame(
+        [[str(entry) for entry in row] for row in rows]
+    ))
+
+def exact_backends(pivot_rule):
+    '''
+    Args:
+        pivot_rule: one of PIVOT_RULES.
+    Returns:
+        a list of the exact backends that take a pivot rule.
+    '''
+
+    return [backends.FractionBackend(pivot_rule),
+            backends.ScaledIntegerBackend(pivot_rule)]
+
+def test_every_rule_gives_the_same_reduced_row_echelon_form():
+    generator = random.Random(10)
+
+    for trial in range(60):
+        scaled_matrix = random_matrix(generator, generator.randint(1, 6),
+                                      generator.randint(1, 6))
+
+        expected = backends.FractionBackend().reduced_row_echelon_form(
+            scaled_matrix
+        )
+
+        for pivot_rule in PIVOT_RULES:
+            for backend in exact_backends(pivot_rule):
+                reduced_result = backend.reduced_row_echelon_form(
+                    scaled_matrix
+                )
+
+                assert reduced_result.matrix.tolist() == \
+                    expected.matrix.tolist()
+                assert reduced_result.pivot_columns == expected.pivot_columns
+
+def test_every_rule_gives_the_same_determinant():
+    generator = random.Random(20)
+
+    for trial in range(60):
+        dimension = generator.randint(1, 6)
+
+        scaled_matrix = random_matrix(generator, dimension, dimension)
+
+        expected = backends.FractionBackend().determinant(scaled_matrix)
+
+        for pivot_rule in PIVOT_RULES:
+            for backend in exact_backends(pivot_rule):
+                assert backend.determinant(scaled_matrix) == expected
+
+def test_each_rule_chooses_its_pivot():
+    # The entries stand for 0, 6, 1/4, -1/2 and 3.
+    column_entries = [0, 6, 1, -4, 3]
+    row_scales = [1, 1, 4, 8, 1]
+    nonzero_counts = [1, 3, 2, 2, 1]
+
+    assert elimination.pivot_offset(column_entries, row_scales,
+                                    elimination.LARGEST_PIVOT) == 1
+    assert elimination.pivot_offset(column_entries, row_scales,
+                                    elimination.SMALLEST_BITS_PIVOT) == 4
+    assert elimination.pivot_offset(column_entries, row_scales,
+                                    elimination.MARKOWITZ_PIVOT,
+                                    nonzero_counts) == 4
+    assert elimination.pivot_offset(column_entries, row_scales,
+                                    elimination.FIRST_NONZERO_PIVOT) == 1
+
+    # Ties go to the highest row.
+    assert elimination.pivot_offset([2, -2], [1, 1],
+                                    elimination.LARGEST_PIVOT) == 0
+    assert elimination.pivot_offset([2, -2], [1, 1],
+                                    elimination.SMALLEST_BITS_PIVOT) == 0
+
+    assert elimination.pivot_offset([0, 0], [1, 1],
+                                    elimination.SMALLEST_BITS_PIVOT) is None
+
+def test_smallest_bits_keeps_entries_smaller_than_largest():
+    # A row of large ints next to a row of small ones: choosing the small
+    # pivot keeps the minors elimination creates small.
+    integer_rows = [[10 ** 30 + 1, 10 ** 30 - 1, 7], [1, 2, 3], [4, 5, 7]]
+
+    largest_bits = []
+
+    for pivot_rule in [elimination.LARGEST_PIVOT,
+                       elimination.SMALLEST_BITS_PIVOT]:
+        eliminated = elimination.fraction_free_eliminate(
+            [list(row) for row in integer_rows],
+            [1, 1, 1],
+            pivot_rule = pivot_rule
+        )
+
+        largest_bits.append(max(abs(entry).bit_length() for row in
+                                eliminated["rows"][:2] for entry in row))
+
+    assert largest_bits[1] < largest_bits[0]
@@ -0,0 +1,219 @@
+'''
+This file contains tests of the result caches, in particular that a
+calculation whose result is None is held like any other and not done again,
+and that results that can be changed are copied in and out of the cache.
+Solving a system again with new constants must reuse the inverses found
+for its coefficients, and saved results must outlast the database being
+opened again unless the calculations have changed.
+'''
+
+import pickle
+import functools
+import calculations
+import elimination
+import float_engine
+import linear_systems
+import modular
+import result_cache
+import numpy as np
+import pandas as pd
+
+from fractions import Fraction
+
+def counted(function, calls):
+    '''
+    Args:
+        function: the function to count calls of.
+        calls: a list that the name of the function is added to for each
+        call.
+    Returns:
+        a function that calls function and keeps its name, so that the cache
+        keys made from it are the same.
+    '''
+
+    @functools.wraps(function)
+    def counted_function(*arguments, **keyword_arguments):
+        calls.append(function.__name__)
+
+        return function(*arguments, **keyword_arguments)
+
+    return counted_function
+
+def test_result_of_none_is_calculated_once():
+    cache = result_cache.ResultCache()
+
+    calls = []
+
+    for attempt in range(3):
+        assert cache.result(("hash", "function", "fraction"),
+                            lambda: calls.append(attempt)) is None
+
+    assert calls == [0]
+
+def test_held_arrays_are_copied():
+    cache = result_cache.ResultCache()
+
+    key = ("hash", "calculations.Factorization.exact inverse", "fraction")
+
+    inverse_array = np.array([[Fraction(1, 2), Fraction(0)],
+                              [Fraction(0), Fraction(1, 3)]], dtype = object)
+
+    cache.put(key, inverse_array)
+
+    inverse_array[0, 0] = Fraction(5)
+
+    held_array = cache.get(key)
+
+    assert held_array[0, 0] == Fraction(1, 2)
+
+    held_array[1, 1] = Fraction(7)
+
+    assert cache.get(key)[1, 1] == Fraction(1, 3)
+
+def test_held_factorizations_are_copied():
+    cache = result_cache.ResultCache()
+
+    key = ("hash", "calculations.Factorization.exact LU", "fraction")
+
+    scaled_matrix = calculations.parse_matrix(
+        pd.DataFrame([["0", "2"], ["3", "1"]])
+    )
+
+    cache.result(key, lambda: elimination.fraction_free_PLU(
+        *scaled_matrix.integer_rows()
+    ))
+
+    held_factorization = cache.get(key)
+
+    held_factorization.packed_array[0, 0] = Fraction(9)
+    held_factorization.row_permutation.reverse()
+
+    factorization = cache.get(key)
+
+    assert factorization.packed_array[0, 0] == Fraction(3)
+    assert factorization.row_permutation == [1, 0]
+
+def test_persistent_result_of_none_is_kept(tmp_path):
+    key = ("hash", "function", "fraction")
+
+    persistent_cache = result_cache.PersistentResultCache(str(tmp_path))
+
+    result_cache.ResultCache(persistent_cache = persistent_cache).result(
+        key,
+        lambda: None
+    )
+
+    assert persistent_cache.get(key, result_cache.NOT_HELD) is None
+    assert persistent_cache.get(("other",) + key[1:],
+                                result_cache.NOT_HELD) is \
+        result_cache.NOT_HELD
+
+    # A new memory cache, as after a restart, finds it on disk.
+    assert result_cache.ResultCache(
+        persistent_cache = persistent_cache
+    ).result(key, lambda: 1 / 0) is None
+
+def test_singular_coefficients_are_inverted_once(monkeypatch):
+    calls = []
+
+    monkeypatch.setattr(float_engine, "float_inverse",
+                        counted(float_engine.float_inverse, calls))
+    monkeypatch.setattr(modular, "inverse_modulo_prime",
+                        counted(modular.inverse_modulo_prime, calls))
+
+    linear_systems.coefficient_cache.clear()
+
+    coefficient_matrix = calculations.parse_matrix(
+        pd.DataFrame([["1", "2", "3"], ["2", "4", "6"], ["1", "0", "1"]])
+    )
+
+    for constant in range(3):
+        assert linear_systems.square_system_solutions(
+            coefficient_matrix,
+            [[Fraction(constant)], [Fraction(2 * constant)], [Fraction(1)]]
+        ) is None
+
+    assert sorted(calls) == ["float_inverse", "inverse_modulo_prime"]
+
+def test_new_constants_reuse_the_coefficient_inverses(monkeypatch):
+    calls = []
+
+    monkeypatch.setattr(float_engine, "float_inverse",
+                        counted(float_engine.float_inverse, calls))
+    monkeypatch.setattr(modular, "inverse_modulo_prime",
+                        counted(modular.inverse_modulo_prime, calls))
+
+    coefficient_rows = [[Fraction(2), Fraction(1, 2), Fraction(0)],
+                        [Fraction(1), Fraction(3), Fraction(-1)],
+                        [Fraction(0), Fraction(4), Fraction(5, 3)]]
+
+    coefficient_matrix = calculations.parse_matrix(
+        pd.DataFrame([[str(entry) for entry in row]
+                      for row in coefficient_rows])
+    )
+
+    for hybrid, expected_calls in [
+        (True, ["float_inverse"]),
+        (False, ["inverse_modulo_prime"])
+    ]:
+        linear_systems.coefficient_cache.clear()
+
+        calls.clear()
+
+        for constant in range(4):
+            constant_rows = [[Fraction(constant, 2)], [Fraction(1)],
+                             [Fraction(-constant)]]
+
+            solution_rows = linear_systems.square_system_solutions(
+                coefficient_matrix,
+                constant_rows,
+                hybrid = hybrid
+            )
+
+            # The solution must satisfy every equation exactly.
+            for row, constant_row in zip(coefficient_rows, constant_rows):
+                assert sum(entry * solution_row[0] for entry, solution_row
+                           in zip(row, solution_rows)) == constant_row[0]
+
+        assert calls == expected_calls
+
+def test_persistent_results_survive_reopening(tmp_path, monkeypatch):
+    key = ("hash", "calculations.determinant", "fraction")
+
+    result_cache.PersistentResultCache(str(tmp_path)).put(key, Fraction(7, 3))
+
+    # Opening the database again, as after a restart, finds the result.
+    assert result_cache.PersistentResultCache(str(tmp_path)).get(key) == \
+        Fraction(7, 3)
+
+    # Results saved by another version of the calculations are deleted.
+    monkeypatch.setattr(result_cache, "CACHE_VERSION",
+                        result_cache.CACHE_VERSION + 1)
+
+    assert result_cache.PersistentResultCache(str(tmp_path)).get(
+        key,
+        result_cache.NOT_HELD
+    ) is result_cache.NOT_HELD
+
+def test_persistent_results_used_least_recently_are_deleted(tmp_path):
+    result_size = len(pickle.dumps(list(range(100))))
+
+    persistent_cache = result_cache.PersistentResultCache(
+        str(tmp_path),
+        max_bytes = 2 * result_size
+    )
+
+    keys = [("hash " + str(i), "function", "fraction") for i in range(3)]
+
+    persistent_cache.put(keys[0], list(range(100)))
+    persistent_cache.put(keys[1], list(range(100)))
+
+    # Reading the first result makes the second the least recently used.
+    persistent_cache.get(keys[0])
+
+    persistent_cache.put(keys[2], list(range(100)))
+
+    assert persistent_cache.get(keys[0]) == list(range(100))
+    assert persistent_cache.get(keys[1], result_cache.NOT_HELD) is \
+        result_cache.NOT_HELD
+    assert persistent_cache.get(keys[2]) == list(range(100))
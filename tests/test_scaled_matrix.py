@@ -0,0 +1,129 @@
+'''
+This file contains tests of the ScaledMatrix that input matrices are held
+as, and of how parse_matrix reads user-entered matrices into it.
+'''
+
+import calculations
+import elimination
+import numpy as np
+import pandas as pd
+
+from fractions import Fraction
+
+def matrix_frame(rows):
+    '''
+    Args:
+        rows: a list of rows of numbers.
+    Returns:
+        a pandas DataFrame holding the entries as strings, the way the app
+        passes them in.
+    '''
+
+    return pd.DataFrame(
+        [[str(entry) for entry in row] for row in rows],
+        columns = ["x" + str(j + 1) for j in range(len(rows[0]))]
+    )
+
+def test_parse_matrix_scales_each_row_by_its_denominators():
+    scaled_matrix = calculations.parse_matrix(
+        matrix_frame([["1/2", "0.25", "3"], ["2", "-4", "0"],
+                      ["1/6", "0", "-1/4"]])
+    )
+
+    assert isinstance(scaled_matrix.rows, np.ndarray)
+    assert scaled_matrix.rows.tolist() == [[2, 1, 12], [2, -4, 0], [2, 0, -3]]
+    assert scaled_matrix.row_scales == [4, 1, 12]
+
+    assert scaled_matrix.fraction_array().tolist() == [
+        [Fraction(1, 2), Fraction(1, 4), 3],
+        [2, -4, 0],
+        [Fraction(1, 6), 0, Fraction(-1, 4)]
+    ]
+
+def test_parse_matrix_keeps_large_ints_as_python_ints():
+    scaled_matrix = calculations.parse_matrix(
+        matrix_frame([[2 ** 53, 1], [0, 1]])
+    )
+
+    assert isinstance(scaled_matrix.rows, list)
+    assert scaled_matrix.rows == [[2 ** 53, 1], [0, 1]]
+    assert scaled_matrix.int64_array().tolist() == [[2 ** 53, 1], [0, 1]]
+
+    scaled_matrix = calculations.parse_matrix(
+        matrix_frame([[2 ** 70, 1], [0, 1]])
+    )
+
+    assert scaled_matrix.rows == [[2 ** 70, 1], [0, 1]]
+    assert scaled_matrix.int64_array() is None
+    assert scaled_matrix.entry_bits() == 71
+
+def test_parse_matrix_int_frames_and_invalid_entries():
+    scaled_matrix = calculations.parse_matrix(
+        pd.DataFrame([[1, -2], [3, 4]], columns = ["x", "y"])
+    )
+
+    assert scaled_matrix.rows.dtype == np.int64
+    assert scaled_matrix.rows.tolist() == [[1, -2], [3, 4]]
+    assert scaled_matrix.row_scales == [1, 1]
+
+    assert calculations.parse_matrix(matrix_frame([["a", "1"]])) is None
+    assert calculations.parse_matrix(pd.DataFrame()) is None
+
+def test_integer_rows_are_copies():
+    for rows in [[[1, 2], [3, 4]], np.array([[1, 2], [3, 4]])]:
+        scaled_matrix = elimination.ScaledMatrix(rows, [1, 2])
+
+        integer_rows, row_scales = scaled_matrix.integer_rows()
+
+        integer_rows[0][0] = 9
+        row_scales[0] = 9
+
+        assert scaled_matrix.fraction_array().tolist() == \
+            [[1, 2], [Fraction(3, 2), 2]]
+
+def test_int64_array_needs_unit_scales():
+    assert elimination.ScaledMatrix([[1, 2]], [2]).int64_array() is None
+    assert elimination.ScaledMatrix([[2 ** 63, 0]], [1]).int64_array() is None
+    assert elimination.ScaledMatrix([[1, 2]], [1]).int64_array().dtype == \
+        np.int64
+
+def test_with_identity():
+    scaled_matrix = elimination.ScaledMatrix([[1, 2], [3, 4]], [1, 2])
+
+    assert scaled_matrix.with_identity().fraction_array().tolist() == \
+        [[1, 2, 1, 0], [Fraction(3, 2), 2, 0, 1]]
+
+def test_column_range_matches_reading_the_columns_alone():
+    rows = [["1/2", "3", "1/4"], ["2/3", "4/3", "5"], ["0", "1", "1"]]
+
+    # Adding zeros to every entry makes the ints too large for int64, so
+    # both the array and the list forms are checked.
+    for frame in [matrix_frame(rows),
+                  matrix_frame([[entry + "0" * 20 if entry != "0" else entry
+                                 for entry in row] for row in rows])]:
+
+        scaled_matrix = calculations.parse_matrix(frame)
+
+        for start, stop in [(0, 2), (2, 3), (0, 3)]:
+            column_matrix = scaled_matrix.column_range(start, stop)
+
+            expected_matrix = calculations.parse_matrix(
+                frame.iloc[:, start:stop]
+            )
+
+            assert np.array(column_matrix.rows).tolist() == \
+                np.array(expected_matrix.rows).tolist()
+            assert column_matrix.row_scales == expected_matrix.row_scales
+
+def test_float_array_and_entry_bits():
+    scaled_matrix = elimination.ScaledMatrix([[1, -7], [2, 3]], [3, 1])
+
+    assert scaled_matrix.float_array().tolist() == [[1 / 3, -7 / 3],
+                                                    [2.0, 3.0]]
+    assert scaled_matrix.entry_bits() == 3
+
+    scaled_matrix = elimination.ScaledMatrix(np.array([[1, -7], [2, 3]]),
+                                             [3, 1])
+
+    assert scaled_matrix.float_array().tolist() == [[1 / 3, -7 / 3],
+                                                    [2.0, 3.0]]
@@ -0,0 +1,154 @@
+'''
+This file contains tests of the Factorization the outputs of one click
+share. Every output must be the same with it as without it, and the
+elimination the outputs share must only be done once.
+'''
+
+import random
+import calculations
+import linear_systems
+import subspaces
+import pandas as pd
+
+from fractions import Fraction
+
+MATRIX_FUNCTIONS = [
+    calculations.row_echelon_form,
+    calculations.reduced_row_echelon_form,
+    calculations.LU_factorize,
+    subspaces.null_space_basis,
+    subspaces.column_space_basis,
+    subspaces.left_null_space_basis,
+    subspaces.row_space_basis
+]
+
+SQUARE_FUNCTIONS = [
+    calculations.determinant,
+    calculations.inverse
+]
+
+SYSTEM_FUNCTIONS = [
+    linear_systems.solution_set,
+    linear_systems.parametric_vector_solution_set
+]
+
+def random_frame(generator, row_count, column_count):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+    Returns:
+        a pandas DataFrame of strings holding random ints, fractions and
+        decimals, with a dependent last row in about a third of the frames.
+    '''
+
+    rows = [[generator.choice(["0", "0", "1", "-2", "1/2", "3/4", "0.5", "3"])
+             for j in range(column_count)] for i in range(row_count)]
+
+    if row_count > 1 and generator.random() < 0.3:
+        rows[-1] = list(rows[0])
+
+    return pd.DataFrame(rows, columns = ["x" + str(j + 1) for j in
+                                         range(column_count)])
+
+def displayed(output):
+    '''
+    Args:
+        output: a DataFrame or a number returned by an output function.
+    Returns:
+        the output as the strings the user sees, so outputs can be compared.
+    '''
+
+    if isinstance(output, pd.DataFrame):
+        return list(map(str, output.columns)), \
+            [[str(entry) for entry in row] for row in output.values.tolist()]
+
+    return str(output)
+
+def test_outputs_match_without_a_factorization():
+    generator = random.Random(21)
+
+    for trial in range(40):
+        row_count = generator.randint(2, 5)
+        column_count = generator.randint(2, 5)
+
+        if trial % 2 == 0:
+            column_count = row_count
+
+        matrix = random_frame(generator, row_count, column_count)
+
+        functions = MATRIX_FUNCTIONS + SYSTEM_FUNCTIONS
+
+        if row_count == column_count:
+            functions = functions + SQUARE_FUNCTIONS
+
+        for output_decimal in [False, True]:
+            factorization = calculations.Factorization(matrix,
+                                                       output_decimal)
+
+            for function in functions:
+                assert displayed(function(
+                    matrix.copy(),
+                    output_decimal,
+                    factorization = factorization
+                )) == displayed(function(matrix.copy(), output_decimal))
+
+def test_subspaces_share_one_elimination(monkeypatch):
+    matrix = pd.DataFrame([["1", "2", "3"], ["2", "4", "1/2"]])
+
+    expected_outputs = [displayed(function(matrix, False)) for function in
+                        MATRIX_FUNCTIONS[3:]]
+
+    calls = []
+
+    fundamental_subspaces = subspaces.fundamental_subspaces
+
+    def counted_fundamental_subspaces(*arguments):
+        calls.append(arguments)
+
+        return fundamental_subspaces(*arguments)
+
+    monkeypatch.setattr(subspaces, "fundamental_subspaces",
+                        counted_fundamental_subspaces)
+
+    factorization = calculations.Factorization(matrix, False)
+
+    outputs = []
+
+    for function in MATRIX_FUNCTIONS[3:]:
+        output = function(matrix, False, factorization = factorization)
+
+        outputs.append(displayed(output))
+
+        # Changing one output's frame must not change the frame the next
+        # output is given.
+        output.iloc[0, 0] = Fraction(99)
+
+    assert outputs == expected_outputs
+    assert len(calls) == 1
+
+def test_linear_system_outputs_share_one_elimination(monkeypatch):
+    calls = []
+
+    reduced_augmented_elimination = \
+        linear_systems.reduced_augmented_elimination
+
+    def counted_elimination(*arguments, **keywords):
+        if keywords.get("factorization") is None:
+            calls.append(arguments)
+
+        return reduced_augmented_elimination(*arguments, **keywords)
+
+    monkeypatch.setattr(linear_systems, "reduced_augmented_elimination",
+                        counted_elimination)
+
+    system = pd.DataFrame([["1", "2", "1", "3"], ["2", "1", "0", "1/2"]],
+                          columns = ["x", "y", "z", "C"])
+
+    factorization = calculations.Factorization(system, False)
+
+    for function in SYSTEM_FUNCTIONS:
+        function(system, False, factorization = factorization)
+
+    assert len(calls) == 1
@@ -0,0 +1,139 @@
+'''
+This file contains tests of the sparse exact elimination engine. Its
+reduced row echelon forms must be the same as the dense backends give.
+'''
+
+import random
+import backends
+import calculations
+import elimination
+import sparse_engine
+import pandas as pd
+
+from fractions import Fraction
+
+def random_sparse_rows(generator, row_count, column_count):
+    '''
+    Args:
+        generator: a random.Random.
+        row_count: an int that is the number of rows.
+        column_count: an int that is the number of columns.
+    Returns:
+        a list of rows that are lists of Fractions with at most three
+        nonzero entries each. Some rows are the sum of two others and some
+        columns are left empty.
+    '''
+
+    empty_columns = set(generator.sample(range(column_count),
+                                         column_count // 10))
+
+    rows = []
+
+    for i in range(row_count):
+        row = [Fraction(0)] * column_count
+
+        for k in range(generator.randint(0, 3)):
+            column = generator.randrange(column_count)
+
+            if column not in empty_columns:
+                row[column] = Fraction(generator.randint(-9, 9),
+                                       generator.choice([1, 1, 2, 3]))
+
+        rows.append(row)
+
+    for k in range(row_count // 10):
+        first, second, target = generator.sample(range(row_count), 3)
+
+        rows[target] = [first_entry + second_entry for first_entry,
+                        second_entry in zip(rows[first], rows[second])]
+
+    return rows
+
+def test_sparse_matches_dense_elimination():
+    generator = random.Random(29)
+
+    for trial in range(20):
+        row_count = generator.randint(20, 40)
+        column_count = generator.randint(20, 40)
+
+        scaled_matrix = elimination.ScaledMatrix(
+            *elimination.fractions_to_integer_rows(
+                random_sparse_rows(generator, row_count, column_count)
+            )
+        )
+
+        rows = sparse_engine.sparse_rows(scaled_matrix)
+
+        reduced_rows, pivot_columns, row_permutation, row_swaps = \
+            sparse_engine.reduced_row_echelon_form(rows, column_count)
+
+        # Entries that cancel are removed rather than kept as zeros.
+        assert all(entry != 0 for row in reduced_rows
+                   for entry in row.values())
+
+        dense_result = backends.ScaledIntegerBackend() \
+            .reduced_row_echelon_form(scaled_matrix)
+
+        assert sparse_engine.dense_array(reduced_rows, column_count) \
+            .tolist() == dense_result.matrix.tolist()
+        assert pivot_columns == dense_result.pivot_columns
+        assert sorted(row_permutation) == list(range(row_count))
+
+def test_sparse_rows_from_both_forms():
+    for rows in [[[0, 3, 0], [2, 0, 0]],
+                 pd.DataFrame([[0, 3, 0], [2, 0, 0]]).to_numpy()]:
+        assert sparse_engine.sparse_rows(
+            elimination.ScaledMatrix(rows, [2, 1])
+        ) == [{1: Fraction(3, 2)}, {0: Fraction(2)}]
+
+def test_markowitz_row_and_subtract_multiple():
+    rows = [
+        {0: Fraction(1), 1: Fraction(1), 2: Fraction(1)},
+        {0: Fraction(7, 3), 2: Fraction(1)},
+        {0: Fraction(2), 3: Fraction(1)},
+        {0: Fraction(5)}
+    ]
+
+    # The last row has the fewest entries.
+    assert sparse_engine.markowitz_row(rows, [0, 1, 2, 3], 0) == 3
+
+    # Between rows of equal length, the smaller pivot wins, and then the
+    # highest row.
+    assert sparse_engine.markowitz_row(rows, [1, 2], 0) == 2
+    assert sparse_engine.markowitz_row(rows, [0], 0) == 0
+
+    row = {0: Fraction(2), 3: Fraction(1)}
+
+    sparse_engine.subtract_multiple(row, {0: Fraction(1), 1: Fraction(1)},
+                                    Fraction(2))
+
+    assert row == {1: Fraction(-2), 3: Fraction(1)}
+
+def test_is_sparse_and_the_backend_chosen():
+    generator = random.Random(30)
+
+    rows = random_sparse_rows(generator, 40, 40)
+
+    matrix = pd.DataFrame([[str(entry) for entry in row] for row in rows])
+
+    scaled_matrix = calculations.parse_matrix(matrix)
+
+    assert sparse_engine.is_sparse(scaled_matrix)
+
+    # Small matrices and dense matrices are not handled sparsely.
+    assert not sparse_engine.is_sparse(
+        elimination.ScaledMatrix([[1, 0], [0, 1]], [1, 1])
+    )
+    assert not sparse_engine.is_sparse(
+        elimination.ScaledMatrix([[1] * 40 for i in range(40)], [1] * 40)
+    )
+
+    backend = backends.select_backend(scaled_matrix, False,
+                                      find_blocks = False)
+
+    assert isinstance(backend, backends.SparseBackend)
+
+    assert calculations.reduced_row_echelon_form(matrix, False).values \
+        .tolist() == backends.FractionBackend().reduced_row_echelon_form(
+            scaled_matrix
+        ).matrix.tolist()
@@ -0,0 +1,145 @@
+'''
+This file contains tests of the fast paths for diagonal, triangular and
+permutation matrices. Their determinants, inverses and LU factorizations
+must be the same as elimination gives.
+'''
+
+import random
+import backends
+import calculations
+import elimination
+import structure
+import pandas as pd
+
+from fractions import Fraction
+
+def random_structured_rows(generator, dimension, matrix_structure):
+    '''
+    Args:
+        generator: a random.Random.
+        dimension: an int that is the number of rows and columns.
+        matrix_structure: one of the structures in structure.py other than
+        GENERAL.
+    Returns:
+        a list of rows that are lists of Fractions holding a random matrix
+        with that structure. About one in five triangular and diagonal
+        matrices has a zero on its diagonal.
+    '''
+
+    if matrix_structure == structure.PERMUTATION:
+        columns = generator.sample(range(dimension), dimension)
+
+        return [[Fraction(int(j == columns[i])) for j in range(dimension)]
+                for i in range(dimension)]
+
+    rows = [[Fraction(0)] * dimension for i in range(dimension)]
+
+    for i in range(dimension):
+        for j in range(dimension):
+            if i == j or \
+                (matrix_structure == structure.UPPER_TRIANGULAR and j > i) \
+                or (matrix_structure == structure.LOWER_TRIANGULAR and j < i):
+                rows[i][j] = Fraction(generator.randint(-6, 6),
+                                      generator.choice([1, 2, 3]))
+
+    # The diagonal is made nonzero unless the matrix should be singular.
+    singular = generator.random() < 0.2
+
+    for i in range(dimension):
+        if rows[i][i] == 0 and not singular:
+            rows[i][i] = Fraction(1, 2)
+
+    return rows
+
+def test_classify():
+    def classified(rows, row_scales = None):
+        if row_scales is None:
+            row_scales = [1] * len(rows)
+
+        return structure.classify(elimination.ScaledMatrix(rows, row_scales))
+
+    assert classified([[5]]) == structure.DIAGONAL
+    assert classified([[1, 0], [0, 0]]) == structure.DIAGONAL
+    assert classified([[1, 2], [0, 3]]) == structure.UPPER_TRIANGULAR
+    assert classified([[1, 0], [2, 3]]) == structure.LOWER_TRIANGULAR
+    assert classified([[0, 1, 0], [0, 0, 1], [1, 0, 0]]) == \
+        structure.PERMUTATION
+
+    # Each 1 of a permutation matrix is held as its row scale.
+    assert classified([[0, 3], [2, 0]], [3, 2]) == structure.PERMUTATION
+    assert classified([[0, 2], [1, 0]]) == structure.GENERAL
+    assert classified([[0, 1], [1, 1]]) == structure.GENERAL
+    assert classified([[1, 2], [3, 4]]) == structure.GENERAL
+    assert classified([[1, 0, 0], [0, 1, 0]]) == structure.GENERAL
+
+def test_fast_paths_match_elimination():
+    generator = random.Random(35)
+
+    for matrix_structure in [structure.DIAGONAL, structure.UPPER_TRIANGULAR,
+                             structure.LOWER_TRIANGULAR,
+                             structure.PERMUTATION]:
+        for trial in range(40):
+            dimension = generator.randint(1, 6)
+
+            scaled_matrix = elimination.ScaledMatrix(
+                *elimination.fractions_to_integer_rows(
+                    random_structured_rows(generator, dimension,
+                                           matrix_structure)
+                )
+            )
+
+            # A diagonal matrix is also triangular, and a small matrix can
+            # be diagonal by chance, so the structure is classified.
+            found_structure = structure.classify(scaled_matrix)
+
+            elimination_backend = backends.ScaledIntegerBackend()
+
+            assert structure.determinant(scaled_matrix, found_structure) == \
+                elimination_backend.determinant(scaled_matrix)
+
+            expected_inverse = elimination_backend.inverse(scaled_matrix,
+                                                           hybrid = False)
+
+            inverse_array = structure.inverse(scaled_matrix, found_structure)
+
+            if expected_inverse is None:
+                assert inverse_array is None
+
+            else:
+                assert inverse_array.tolist() == expected_inverse.tolist()
+
+            factorization = structure.LU_factorize(scaled_matrix,
+                                                   found_structure)
+
+            if factorization is None:
+                continue
+
+            expected_factorization = elimination_backend.LU_factorize(
+                scaled_matrix
+            )
+
+            assert factorization.packed_array.tolist() == \
+                expected_factorization.packed_array.tolist()
+            assert factorization.row_permutation == \
+                expected_factorization.row_permutation
+            assert factorization.pivot_columns == \
+                expected_factorization.pivot_columns
+            assert factorization.row_swaps == \
+                expected_factorization.row_swaps
+
+def test_structured_matrices_use_the_fast_paths():
+    matrix = pd.DataFrame([["2", "1/2", "3"], ["0", "-1", "4"],
+                           ["0", "0", "1/3"]])
+
+    backend = backends.select_backend(calculations.parse_matrix(matrix),
+                                      False)
+
+    assert isinstance(backend, backends.StructuredBackend)
+    assert backend.matrix_structure == structure.UPPER_TRIANGULAR
+
+    assert calculations.determinant(matrix, False) == Fraction(-2, 3)
+    assert calculations.inverse(matrix, False).values.tolist() == [
+        [Fraction(1, 2), Fraction(1, 4), Fraction(-15, 2)],
+        [0, -1, 12],
+        [0, 0, 3]
+    ]
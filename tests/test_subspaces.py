@@ -0,0 +1,217 @@
+'''
+This file contains tests of the bases the subspaces module finds. The first
+tests pin the four bases for a few fixed matrices in both modes, including the
+order of the vectors, so that changes to elimination do not change what the
+user sees. The rest are in decimal mode for matrices whose entries are all far
+from 1, where entries must be treated as 0 relative to the numbers they were
+calculated from rather than to a fixed threshold.
+'''
+
+import subspaces
+import pandas as pd
+
+from decimal import Decimal
+
+def matrix_frame(rows):
+    '''
+    Args:
+        rows: a list of rows of numbers.
+    Returns:
+        a pandas DataFrame holding the entries as strings, the way the app
+        passes them in.
+    '''
+
+    return pd.DataFrame(
+        [[str(entry) for entry in row] for row in rows],
+        columns = ["x" + str(j + 1) for j in range(len(rows[0]))]
+    )
+
+def basis(rows, subspace_name):
+    '''
+    Args:
+        rows: a list of rows of numbers.
+        subspace_name: one of the subspace names defined in subspaces.
+    Returns:
+        a list of the basis vectors of the subspace found in decimal mode,
+        each a list of Decimals.
+    '''
+
+    frame = subspaces.fundamental_subspaces(matrix_frame(rows),
+                                            True)[subspace_name]
+
+    return [list(frame[column]) for column in frame.columns]
+
+def displayed_basis(rows, basis_function, output_decimal):
+    '''
+    Args:
+        rows: a list of rows of numbers.
+        basis_function: one of the basis functions in subspaces.
+        output_decimal: A boolean that is True if the basis should be found in
+        decimal mode.
+    Returns:
+        a tuple of the column names and the rows of the basis frame, with
+        every entry as the string the user sees.
+    '''
+
+    frame = basis_function(matrix_frame(rows), output_decimal)
+
+    return (list(frame.columns),
+            [[str(entry) for entry in row] for row in frame.values.tolist()])
+
+def test_single_row_bases():
+    # The free variables are listed in the order they are met reading the
+    # reduced row echelon form, so x3, which the first row depends on, comes
+    # before x2.
+    rows = [[1, 0, 4, 0, 0]]
+
+    for output_decimal in [False, True]:
+        assert displayed_basis(rows, subspaces.null_space_basis,
+                               output_decimal) == (
+            ["Vector 1", "Vector 2", "Vector 3", "Vector 4"],
+            [["-4", "0", "0", "0"], ["0", "1", "0", "0"], ["1", "0", "0", "0"],
+             ["0", "0", "1", "0"], ["0", "0", "0", "1"]]
+        )
+        assert displayed_basis(rows, subspaces.column_space_basis,
+                               output_decimal) == (["Vector 1"], [["1"]])
+        assert displayed_basis(rows, subspaces.left_null_space_basis,
+                               output_decimal) == (["Vector 1"], [["0"]])
+        assert displayed_basis(rows, subspaces.row_space_basis,
+                               output_decimal) == \
+            ([0], [["1"], ["0"], ["4"], ["0"], ["0"]])
+
+def test_rank_two_bases():
+    rows = [[1, 2, 0, 3], [2, 4, 1, 7], [0, 0, 1, 1]]
+
+    for output_decimal in [False, True]:
+        assert displayed_basis(rows, subspaces.null_space_basis,
+                               output_decimal) == (
+            ["Vector 1", "Vector 2"],
+            [["-2", "-3"], ["1", "0"], ["0", "-1"], ["0", "1"]]
+        )
+        assert displayed_basis(rows, subspaces.column_space_basis,
+                               output_decimal) == (
+            ["Vector 1", "Vector 2"], [["1", "0"], ["2", "1"], ["0", "1"]]
+        )
+        assert displayed_basis(rows, subspaces.left_null_space_basis,
+                               output_decimal) == \
+            (["Vector 1"], [["2"], ["-1"], ["1"]])
+        assert displayed_basis(rows, subspaces.row_space_basis,
+                               output_decimal) == \
+            ([0, 1], [["1", "0"], ["2", "0"], ["0", "1"], ["3", "1"]])
+
+def test_dependent_rows_bases():
+    rows = [[2, -1, 3], [4, -2, 6], [1, 0, 1]]
+
+    for output_decimal in [False, True]:
+        assert displayed_basis(rows, subspaces.null_space_basis,
+                               output_decimal) == \
+            (["Vector 1"], [["-1"], ["1"], ["1"]])
+        assert displayed_basis(rows, subspaces.column_space_basis,
+                               output_decimal) == (
+            ["Vector 1", "Vector 2"], [["2", "-1"], ["4", "-2"], ["1", "0"]]
+        )
+        assert displayed_basis(rows, subspaces.left_null_space_basis,
+                               output_decimal) == \
+            (["Vector 1"], [["-2"], ["1"], ["0"]])
+        assert displayed_basis(rows, subspaces.row_space_basis,
+                               output_decimal) == \
+            ([0, 1], [["1", "0"], ["0", "1"], ["1", "-1"]])
+
+def test_zero_column_bases():
+    rows = [[0, 1], [0, 2], [0, 0]]
+
+    for output_decimal in [False, True]:
+        assert displayed_basis(rows, subspaces.null_space_basis,
+                               output_decimal) == (["Vector 1"], [["1"], ["0"]])
+        assert displayed_basis(rows, subspaces.column_space_basis,
+                               output_decimal) == \
+            (["Vector 1"], [["1"], ["2"], ["0"]])
+        assert displayed_basis(rows, subspaces.left_null_space_basis,
+                               output_decimal) == (
+            ["Vector 1", "Vector 2"], [["-2", "0"], ["1", "0"], ["0", "1"]]
+        )
+        assert displayed_basis(rows, subspaces.row_space_basis,
+                               output_decimal) == ([0], [["0"], ["1"]])
+
+def test_fraction_entry_bases():
+    rows = [["1/2", "0.25", 1], [1, "0.5", 2]]
+
+    assert displayed_basis(rows, subspaces.null_space_basis, False) == (
+        ["Vector 1", "Vector 2"], [["-1/2", "-2"], ["1", "0"], ["0", "1"]]
+    )
+    assert displayed_basis(rows, subspaces.null_space_basis, True) == (
+        ["Vector 1", "Vector 2"], [["-0.5", "-2"], ["1", "0"], ["0", "1"]]
+    )
+    assert displayed_basis(rows, subspaces.row_space_basis, False) == \
+        ([0], [["1"], ["1/2"], ["2"]])
+    assert displayed_basis(rows, subspaces.row_space_basis, True) == \
+        ([0], [["1"], ["0.5"], ["2"]])
+
+    # The column space holds columns of the input, so it is shown as the user
+    # entered it in both modes.
+    for output_decimal in [False, True]:
+        assert displayed_basis(rows, subspaces.column_space_basis,
+                               output_decimal) == \
+            (["Vector 1"], [["1/2"], ["1"]])
+        assert displayed_basis(rows, subspaces.left_null_space_basis,
+                               output_decimal) == \
+            (["Vector 1"], [["-2"], ["1"]])
+
+def test_free_variables_before_and_after_pivots():
+    # The reduced row echelon form is [[1, 0, 0, 2, 1], [0, 1, 0, -16/3,
+    # -4/3]], so x4 and x5, which the rows depend on, come before x3.
+    rows = [["0.5", 0, 0, 1, "0.5"], [2, "3/4", 0, 0, 1]]
+
+    assert displayed_basis(rows, subspaces.null_space_basis, False) == (
+        ["Vector 1", "Vector 2", "Vector 3"],
+        [["-2", "-1", "0"], ["16/3", "4/3", "0"], ["0", "0", "1"],
+         ["1", "0", "0"], ["0", "1", "0"]]
+    )
+
+def test_large_entries_keep_full_rank():
+    rows = [[2e10, 1], [3, 4]]
+
+    assert basis(rows, subspaces.ROW_SPACE) == \
+        [[Decimal(1), Decimal(0)], [Decimal(0), Decimal(1)]]
+    assert len(basis(rows, subspaces.COLUMN_SPACE)) == 2
+    assert basis(rows, subspaces.NULL_SPACE) == [[Decimal(0), Decimal(0)]]
+    assert basis(rows, subspaces.LEFT_NULL_SPACE) == \
+        [[Decimal(0), Decimal(0)]]
+
+def test_large_entries_rank_deficient():
+    rows = [[1e10, 2e10, 1], [3e10, 6e10, 3]]
+
+    assert basis(rows, subspaces.ROW_SPACE) == \
+        [[Decimal(1), Decimal(2), Decimal("1E-10")]]
+    assert basis(rows, subspaces.NULL_SPACE) == [
+        [Decimal(-2), Decimal(1), Decimal(0)],
+        [Decimal("-1E-10"), Decimal(0), Decimal(1)]
+    ]
+    assert basis(rows, subspaces.LEFT_NULL_SPACE) == \
+        [[Decimal(-3), Decimal(1)]]
+
+def test_small_entries_are_not_zero():
+    rows = [[1e-11, 0], [0, 2e-11]]
+
+    assert basis(rows, subspaces.ROW_SPACE) == \
+        [[Decimal(1), Decimal(0)], [Decimal(0), Decimal(1)]]
+    assert basis(rows, subspaces.NULL_SPACE) == [[Decimal(0), Decimal(0)]]
+
+def test_small_entries_rank_deficient():
+    rows = [[1e-11, 2e-11], [3e-11, 6e-11]]
+
+    assert basis(rows, subspaces.NULL_SPACE) == [[Decimal(-2), Decimal(1)]]
+    assert basis(rows, subspaces.LEFT_NULL_SPACE) == \
+        [[Decimal(-3), Decimal(1)]]
+    assert len(basis(rows, subspaces.COLUMN_SPACE)) == 1
+
+def test_huge_and_small_entries_keep_column_space_rank():
+    rows = [[2 ** 62, 1, 0], [3, 4, 0], [0, 5, 6]]
+
+    assert basis(rows, subspaces.COLUMN_SPACE) == [
+        [str(2 ** 62), "3", "0"],
+        ["1", "4", "5"],
+        ["0", "0", "6"]
+    ]
+    assert basis(rows, subspaces.NULL_SPACE) == \
+        [[Decimal(0), Decimal(0), Decimal(0)]]